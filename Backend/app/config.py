@@ -1,6 +1,6 @@
 # backend/app/config.py
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Optional
 
 class Settings(BaseSettings):
     # Groq API
@@ -13,8 +13,95 @@ class Settings(BaseSettings):
     MONGODB_URL: str
     DATABASE_NAME: str
     
+    # Groq client
+    GROQ_MAX_CONCURRENCY: int = 16
+    GROQ_MAX_CONNECTIONS: int = 32
+    GROQ_MAX_KEEPALIVE_CONNECTIONS: int = 16
+    
+    GROQ_STREAM_TO_WEBSOCKET: bool = True  # push feedback/summary tokens to the session socket
+    
+    # Latency budgets per operation (question, evaluation, summary, batch_grading)
+    GROQ_FALLBACK_MODEL: str = "llama-3.1-8b-instant"  # cheaper model raced against a slow primary, "" to only wait
+    GROQ_HEDGE_AFTER: Dict[str, float] = {"question": 4.0, "evaluation": 3.0, "summary": 5.0, "batch_grading": 15.0}  # seconds, lowered to the observed p95
+    GROQ_DEADLINE: Dict[str, float] = {"question": 10.0, "evaluation": 8.0, "summary": 15.0, "batch_grading": 45.0}  # seconds before the local fallback
+    
+    # Groq rate limits per model; tokens follow the x-ratelimit headers once calls are made
+    GROQ_REQUESTS_PER_MINUTE: int = 0  # the key's limit, split between WEB_CONCURRENCY workers; 0 leaves requests to 429s (no header counts them per minute)
+    GROQ_TOKENS_PER_MINUTE: int = 12000  # the free tier's, until the first response's headers
+    GROQ_BACKGROUND_RESERVE: float = 0.2  # share of each limit summaries leave for live calls, background fills leave twice this
+    GROQ_COMPLETION_TOKEN_ESTIMATE: int = 400  # completion tokens assumed for calls without max_tokens
+    
+    # Circuit breakers around Groq (one per model) and Cloudinary
+    BREAKER_WINDOW_SECONDS: int = 60
+    BREAKER_MIN_CALLS: int = 10  # calls in the window before it can trip
+    BREAKER_ERROR_RATE: float = 0.5
+    BREAKER_SLOW_CALL_RATE: float = 0.8
+    BREAKER_OPEN_SECONDS: int = 30  # before probe calls are let through
+    BREAKER_HALF_OPEN_PROBES: int = 3  # successful probes needed to close again
+    GROQ_SLOW_CALL_SECONDS: float = 10.0
+    CLOUDINARY_SLOW_CALL_SECONDS: float = 30.0
+    
+    # Evaluation cache
+    EVAL_CACHE_SIZE: int = 10000
+    EVAL_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    EVAL_CACHE_MAX_ANSWER_LENGTH: int = 200
+    EVAL_RUBRIC_VERSION: str = "1"  # bump whenever the scoring prompt or criteria change
+    EVAL_RUBRIC_REFRESH_SECONDS: int = 30  # how often workers re-read a rubric version set through the invalidate endpoint
+    LOCAL_SCORER_CONFIDENCE: float = 0.8  # local scores at or above this skip the LLM; 1.0 keeps only the fixed rules
+    
+    # Question pool
+    QUESTION_POOL_LOW_WATERMARK: int = 5
+    QUESTION_POOL_HIGH_WATERMARK: int = 15
+    QUESTION_POOL_REFILL_INTERVAL: int = 30  # seconds between background top-ups
+    
+    # Resume parsing
+    RESUME_PARSER_WORKERS: int = 2
+    RESUME_MAX_PAGES: int = 10
+    RESUME_PARSE_TIMEOUT: float = 15.0
+    RESUME_MAX_BYTES: int = 10 * 1024 * 1024
+    RESUME_SPOOL_THRESHOLD: int = 1024 * 1024  # larger uploads are spooled to a temp file
+    RESUME_UPLOAD_CHUNK_SIZE: int = 64 * 1024
+    
+    # Background resume uploads
+    CLOUDINARY_CHUNK_SIZE: int = 6 * 1024 * 1024  # Cloudinary requires at least 5 MB per chunk
+    RESUME_UPLOAD_WORKERS: int = 4
+    RESUME_UPLOAD_MAX_ATTEMPTS: int = 4
+    RESUME_UPLOAD_RETRY_BACKOFF: float = 2.0
+    RESUME_UPLOAD_STALE_AFTER: int = 15 * 60  # seconds without progress before a pending upload is presumed lost
+    RESUME_UPLOAD_SWEEP_INTERVAL: int = 60  # seconds between sweeps for abandoned uploads and orphaned spool files
+    
+    # Bulk resume ingestion (Cloudinary uploads go through the background upload workers above)
+    BULK_INGEST_MAX_FILES: int = 500  # resumes per request, counting ZIP members
+    BULK_INGEST_PARSER_WORKERS: int = 2  # parser processes for bulk ingest, separate from the interactive upload pool
+    BULK_INGEST_CONCURRENCY: int = 4  # resumes parsed at once, near BULK_INGEST_PARSER_WORKERS so queued parses don't time out
+    BULK_INGEST_BATCH_SIZE: int = 50  # candidates per bulk write
+    BULK_INGEST_FLUSH_SECONDS: float = 1.0  # longest a parsed resume waits for its batch to fill
+    
+    # WebSockets
+    WS_SEND_QUEUE_SIZE: int = 256  # frames buffered per connection before the oldest are dropped
+    
     # Redis
-    # REDIS_URL: str = "redis://localhost:6379"
+    REDIS_URL: Optional[str] = None  # e.g. "redis://localhost:6379"
+    WS_BROKER: str = "memory"  # "memory" for a single worker, "redis" to fan out across workers
+    WS_BROKER_CHANNEL: str = "ws-fanout"
+    WS_BROKER_BATCH_INTERVAL: float = 0.005  # seconds publishes wait to share one Redis PUBLISH
+    
+    # Session state cache
+    SESSION_CACHE_BACKEND: str = "memory"  # "memory" (one worker, nothing is cached when WEB_CONCURRENCY > 1), "redis" (shared by every worker, needs REDIS_URL) or "none"
+    SESSION_CACHE_SIZE: int = 5000
+    SESSION_CACHE_TTL_SECONDS: int = 2 * 60 * 60
+    
+    # Answer submissions
+    GRADING_MODE: str = "per_question"  # default for new sessions: "per_question" or "deferred" (one batch grading call at the end)
+    ANSWER_CLAIM_TTL: int = 120  # seconds a worker's claim on evaluating an answer lasts before others may take over
+    ANSWER_CLAIM_POLL_INTERVAL: float = 0.25  # seconds between checks while another worker holds the claim
+    
+    # Final summaries
+    SUMMARY_WORKERS: int = 2
+    SUMMARY_MAX_ATTEMPTS: int = 3
+    SUMMARY_RETRY_BACKOFF: float = 2.0
+    SUMMARY_STALE_AFTER: int = 5 * 60  # seconds without progress before an unfinished summary job is picked up again
+    SUMMARY_SWEEP_INTERVAL: int = 60  # seconds between sweeps for abandoned summary jobs, well under SUMMARY_STALE_AFTER
     
     # App Settings
     SECRET_KEY: str = "SHYAM234"
@@ -24,11 +24,23 @@ async def close_mongo_connection():
 async def create_indexes():
     await db.database.candidates.create_index("email", unique=True)
     await db.database.candidates.create_index("status")
-    await db.database.candidates.create_index([("final_score", -1)])
-    await db.database.candidates.create_index("created_at")
+    # _id breaks ties for keyset pagination of the candidate list
+    await db.database.candidates.create_index([("final_score", -1), ("_id", -1)])
+    await db.database.candidates.create_index([("created_at", -1), ("_id", -1)])
+    await db.database.candidates.create_index("resume_upload_id", sparse=True)
     
     await db.database.sessions.create_index("candidate_id")
     await db.database.sessions.create_index("is_completed")
+    
+    await db.database.resume_uploads.create_index("sha256")
+    await db.database.resume_uploads.create_index([("status", 1), ("updated_at", 1)])
+    
+    await db.database.summary_jobs.create_index([("status", 1), ("updated_at", 1)])
+    
+    await db.database.question_pool.create_index([("difficulty", 1), ("created_at", 1)])
+    
+    await db.database.evaluation_cache.create_index("created_at", expireAfterSeconds=settings.EVAL_CACHE_TTL_SECONDS)
+    await db.database.evaluation_cache.create_index("rubric_version")
 
 def get_database():
     if db.database is None:
@@ -1,30 +1,59 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
+from prometheus_client import CONTENT_TYPE_LATEST
+import asyncio
 
 from app.config import settings
 from app.routers import interview, candidates, websocket
 from app.database.connection import connect_to_mongo, close_mongo_connection
+from app.services import metrics
+from app.middleware import BodySizeLimitMiddleware, RequestLatencyMiddleware
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await connect_to_mongo()
+    await websocket.manager.start()
+    await interview.question_pool.start()
+    await interview.upload_queue.start()
+    await interview.summary_queue.start()
+    summary_sweep = asyncio.create_task(interview.sweep_summary_jobs())
+    upload_sweep = asyncio.create_task(interview.sweep_resume_uploads())
     yield
-    await close_mongo_connection
+    summary_sweep.cancel()
+    upload_sweep.cancel()
+    await interview.upload_queue.stop()
+    await interview.summary_queue.stop()
+    await interview.question_pool.stop()
+    await websocket.manager.stop()
+    await interview.groq_service.aclose()
+    interview.resume_parser.shutdown()
+    interview.bulk_resume_parser.shutdown()
+    await close_mongo_connection()
+    metrics.mark_process_dead()
 app = FastAPI(
     title="AI Interview Assistant",
     lifespan=lifespan 
 )
 
+# Oversized resumes are refused while they arrive, with room for the multipart framing around the file
+app.add_middleware(BodySizeLimitMiddleware, limits={
+    "/api/interview/upload-resume": settings.RESUME_MAX_BYTES + 64 * 1024
+})
+# Added after the body limit so it wraps it and its 413s still carry CORS headers
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.BACKEND_CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+# Outermost, so refused and CORS-answered requests are timed too
+app.add_middleware(RequestLatencyMiddleware)
+
 app.include_router(interview.router, prefix="/api/interview", tags=["interview"])
 app.include_router(candidates.router, prefix="/api/candidates", tags=["candidates"])
 app.include_router(websocket.router, tags=["websocket"])
@@ -33,6 +62,43 @@ app.include_router(websocket.router, tags=["websocket"])
 async def root():
     return {"message": "AI Interview Assistant API"}
 
+@app.get("/metrics")
+async def prometheus_metrics():
+    return Response(metrics.latest(), media_type=CONTENT_TYPE_LATEST)
+
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {
+        "status": "healthy",
+        "groq": interview.groq_service.stats(),
+        "circuit_breakers": {
+            breaker.name: breaker.snapshot()
+            for breaker in [*interview.groq_service.breakers.values(), interview.cloudinary_service.breaker]
+        },
+        "resume_parser": interview.resume_parser.stats(),
+        "bulk_resume_parser": interview.bulk_resume_parser.stats(),
+        "resume_uploads": interview.upload_queue.snapshot(),
+        "summaries": interview.summary_queue.snapshot(),
+        "websockets": websocket.manager.snapshot(),
+        "resume_dedup": {
+            **interview.resume_blobs.stats,
+            "hit_rate": interview.resume_blobs.hit_rate()
+        },
+        "evaluation_cache": {
+            **interview.groq_service.evaluation_cache.stats,
+            "hit_ratio": interview.groq_service.evaluation_cache.hit_ratio()
+        },
+        "local_scorer": {
+            **interview.groq_service.local_stats,
+            "stages": interview.groq_service.local_scorer.stats
+        },
+        "session_cache": {
+            **interview.session_cache.stats,
+            "hit_ratios": interview.session_cache.hit_ratios(),
+            "round_trips_per_answer": interview.session_cache.round_trips_per_answer()
+        },
+        "answer_coalescing": {
+            **interview.answer_flights.stats,
+            "in_flight": interview.answer_flights.in_flight()
+        }
+    }
\ No newline at end of file
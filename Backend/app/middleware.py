@@ -0,0 +1,127 @@
+# backend/app/middleware.py
+import time
+from typing import Dict
+
+from starlette.responses import JSONResponse
+
+from app.services import metrics
+
+
+class RequestBodyTooLarge(Exception):
+    pass
+
+
+class BodySizeLimitMiddleware:
+    """Refuse request bodies past a per-path byte limit while they are still arriving
+
+    A declared Content-Length over the limit is refused before anything is
+    read; a chunked body is counted as it comes in and cut off as soon as it
+    passes, rather than after the whole of it has been spooled.
+    """
+
+    def __init__(self, app, limits: Dict[str, int]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > limit:
+            await self._refuse(scope, receive, send)
+            return
+
+        received = 0
+        exceeded = False
+        started = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    exceeded = True
+                    raise RequestBodyTooLarge()
+            return message
+
+        async def guarded_send(message):
+            nonlocal started
+            # Whatever the app makes of the cut-off body (FastAPI answers 400), the client gets a 413
+            if exceeded:
+                return
+            started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not exceeded:
+                raise
+        if exceeded and not started:
+            await self._refuse(scope, receive, send)
+
+    @staticmethod
+    async def _refuse(scope, receive, send):
+        response = JSONResponse({"detail": "Request body is too large"}, status_code=413)
+        await response(scope, receive, send)
+
+
+def route_template(scope) -> str:
+    """The path with its parameters named, so /session/{session_id} is one series rather than one per session"""
+    if scope.get("route") is None:
+        return "unmatched"
+    segments = scope["path"].split("/")
+    for name, value in scope.get("path_params", {}).items():
+        for i in range(len(segments) - 1, -1, -1):
+            if segments[i] == str(value):
+                segments[i] = "{%s}" % name
+                break
+    return "/".join(segments)
+
+
+class RequestLatencyMiddleware:
+    """Time each HTTP request until the last of its response body is sent
+
+    Timing stops at the final http.response.body message rather than when
+    the headers go out, so a streamed response like the NDJSON bulk ingest
+    counts for as long as it streams.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        observed = False
+
+        def observe():
+            nonlocal observed
+            if observed:
+                return
+            observed = True
+            metrics.http_request_seconds.labels(
+                scope["method"], route_template(scope), str(status)
+            ).observe(time.perf_counter() - started)
+
+        async def timed_send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                observe()
+
+        try:
+            await self.app(scope, receive, timed_send)
+        finally:
+            # A response cut short by an error or a client that went away
+            observe()
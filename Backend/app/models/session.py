@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field, ConfigDict, field_validator
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 from bson import ObjectId
 
 
@@ -11,9 +11,12 @@ class Question(BaseModel):
     time_limit: int
     expected_topics: List[str]
     hints: List[str]
+    accepted_answers: List[str] = []  # answer key for easy questions, never sent to the candidate
     answer: Optional[str] = None
     score: Optional[float] = None
     feedback: Optional[str] = None
+    generation_tier: Optional[Dict] = None  # {"used": tier, "tried": [tiers]}, tier is primary, fallback_model or local
+    evaluation_tier: Optional[Dict] = None
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
 
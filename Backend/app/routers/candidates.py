@@ -1,35 +1,105 @@
-from fastapi import APIRouter, Query, HTTPException
-from typing import List, Optional
+from fastapi import APIRouter, Query, HTTPException, Response
+from typing import List, Optional, Dict, Any
 from app.database.connection import get_db
-from bson import ObjectId
+from bson import ObjectId, json_util
+import base64
 
 router = APIRouter()
 
+# Sort keys backed by a (field, _id) compound index
+SORTABLE_FIELDS = {"final_score", "created_at"}
+
+# What the dashboard list needs; anything else has to be asked for with `fields`
+LIST_FIELDS = ["name", "email", "phone", "status", "final_score", "created_at", "updated_at"]
+SELECTABLE_FIELDS = set(LIST_FIELDS) | {"resume_text", "resume_url", "summary"}
+
+
+def _encode_cursor(candidate: Dict[str, Any], sort_by: str) -> str:
+    raw = json_util.dumps({"v": candidate.get(sort_by), "id": candidate["_id"]})
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        return json_util.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _after_cursor(sort_by: str, direction: int, value: Any, last_id: ObjectId) -> Dict[str, Any]:
+    """Filter for rows strictly after (value, last_id) in (sort_by, _id) order
+
+    MongoDB sorts null/missing values before everything else, so they come
+    last in descending order and first in ascending order.
+    """
+    op = "$lt" if direction == -1 else "$gt"
+    if value is None:
+        if direction == -1:
+            return {sort_by: None, "_id": {op: last_id}}
+        return {"$or": [{sort_by: None, "_id": {op: last_id}}, {sort_by: {"$ne": None}}]}
+    
+    clauses = [{sort_by: {op: value}}, {sort_by: value, "_id": {op: last_id}}]
+    if direction == -1:
+        clauses.append({sort_by: None})
+    return {"$or": clauses}
+
+
 @router.get("/")
 async def get_candidates(
+    response: Response,
     status: Optional[str] = Query(None),
     sort_by: str = Query("final_score", description="Sort by field"),
-    order: str = Query("desc", description="asc or desc")
+    order: str = Query("desc", description="asc or desc"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated extra fields, e.g. summary,resume_url")
 ):
-    """Get all candidates with optional filtering and sorting"""
+    """Get a page of candidates with optional filtering and sorting
+
+    The cursor for the next page is returned in the X-Next-Cursor header.
+    """
     database = get_db()
     
     if database is None:
         raise HTTPException(status_code=503, detail="Database connection not available")
     
+    if sort_by not in SORTABLE_FIELDS:
+        raise HTTPException(status_code=400, detail=f"sort_by must be one of {sorted(SORTABLE_FIELDS)}")
+    
+    projection = {field: 1 for field in LIST_FIELDS}
+    if fields:
+        requested = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = set(requested) - SELECTABLE_FIELDS
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+        projection.update({field: 1 for field in requested})
+    
     query = {}
     if status:
         query["status"] = status
     
     sort_direction = -1 if order == "desc" else 1
     
+    if cursor:
+        position = _decode_cursor(cursor)
+        query = {"$and": [query, _after_cursor(sort_by, sort_direction, position["v"], position["id"])]}
+    
     candidates = []
-    cursor = database.candidates.find(query).sort(sort_by, sort_direction)
+    # Fetch one extra row to know whether another page exists
+    db_cursor = database.candidates.find(query, projection).sort(
+        [(sort_by, sort_direction), ("_id", sort_direction)]
+    ).limit(limit + 1)
     
-    async for candidate in cursor:
-        candidate["id"] = str(candidate.pop("_id"))
+    async for candidate in db_cursor:
         candidates.append(candidate)
     
+    if len(candidates) > limit:
+        candidates = candidates[:limit]
+        response.headers["X-Next-Cursor"] = _encode_cursor(candidates[-1], sort_by)
+    
+    for candidate in candidates:
+        candidate["id"] = str(candidate.pop("_id"))
+    
     return candidates
 
 @router.get("/{candidate_id}")
@@ -1,15 +1,33 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Depends
-from typing import Dict, Optional
+from fastapi import APIRouter, HTTPException, UploadFile, File, Depends, Response, Request
+from fastapi.responses import StreamingResponse
+from typing import Dict, List, Optional, Tuple
 from app.models.candidate import Candidate
 from app.models.session import InterviewSession, Question
 from app.services.groq_service import GroqService
 from app.services.resume_parser import ResumeParser
+from app.services.question_pool import QuestionPool
+from app.services.upload_spool import ResumeUpload, UploadTooLargeError, stale_spool_files
+from app.services.job_queue import JobQueue
+from app.services.rate_limit_scheduler import llm_priority
+from app.services.resume_blobs import ResumeBlobStore
+from app.services.session_cache import SessionCache, count_round_trips
+from app.services.single_flight import SingleFlight
 import uuid
 from bson import ObjectId
-from datetime import datetime
+from datetime import datetime, timedelta
 from app.database.connection import get_db
 import time
+import asyncio
+import json
+import os
+import socket
+import zipfile
+from functools import partial
 from app.services.cloudinary_service import CloudinaryService
+from app.routers.websocket import manager, session_topic, DASHBOARD_TOPIC
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+from app.config import settings
 
 cloudinary_service = CloudinaryService()
 
@@ -17,46 +35,575 @@ cloudinary_service = CloudinaryService()
 router = APIRouter()
 groq_service = GroqService()
 resume_parser = ResumeParser()
+# Bulk ingest gets its own processes so a drive's backlog never delays, or times out, a candidate's upload
+bulk_resume_parser = ResumeParser(settings.BULK_INGEST_PARSER_WORKERS)
+question_pool = QuestionPool(groq_service)
+resume_blobs = ResumeBlobStore()
+session_cache = SessionCache()
+answer_flights = SingleFlight()
+upload_queue = JobQueue(
+    "resume-upload",
+    workers=settings.RESUME_UPLOAD_WORKERS,
+    max_attempts=settings.RESUME_UPLOAD_MAX_ATTEMPTS,
+    backoff=settings.RESUME_UPLOAD_RETRY_BACKOFF
+)
+summary_queue = JobQueue(
+    "summary",
+    workers=settings.SUMMARY_WORKERS,
+    max_attempts=settings.SUMMARY_MAX_ATTEMPTS,
+    backoff=settings.SUMMARY_RETRY_BACKOFF
+)
+
+RESUME_TYPES = {
+    ".pdf": "application/pdf",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+}
+
+# per_question: evaluate every answer on submit; deferred: record answers, grade them all at the end
+GRADING_MODES = ("per_question", "deferred")
+
+
+async def _cancel_on_disconnect(request: Request, awaitable):
+    """Await the work, cancelling it if the client goes away first"""
+    task = asyncio.ensure_future(awaitable)
+    while True:
+        done, _ = await asyncio.wait({task}, timeout=0.5)
+        if done:
+            return task.result()
+        if await request.is_disconnected():
+            task.cancel()
+            raise HTTPException(status_code=499, detail="Client disconnected")
+
+
+async def _upload_resume_job(upload_id: str, upload: ResumeUpload):
+    """Push the spooled resume to Cloudinary and resolve the pending resume_url"""
+    with upload.open() as stream:
+        cloudinary_result = await cloudinary_service.upload_resume(stream, upload.filename, upload_id)
+    
+    database = get_db()
+    await database.resume_uploads.update_one(
+        {"_id": ObjectId(upload_id)},
+        {
+            "$set": {
+                "status": "done",
+                "url": cloudinary_result["url"],
+                "public_id": cloudinary_result["public_id"],
+                "completed_at": datetime.utcnow(),
+                "updated_at": datetime.utcnow()
+            }
+        }
+    )
+    # Candidates created before the upload finished point at it by id
+    await database.candidates.update_many(
+        {"resume_upload_id": upload_id},
+        {"$set": {"resume_url": cloudinary_result["url"]}}
+    )
+    await resume_blobs.attach_url(upload.sha256, cloudinary_result["url"])
+    upload.release()
+
+
+async def _resume_upload_failed(upload: ResumeUpload, upload_id: str, error: Exception):
+    upload.release()
+    database = get_db()
+    await database.resume_uploads.update_one(
+        {"_id": ObjectId(upload_id)},
+        {"$set": {"status": "failed", "error": str(error), "completed_at": datetime.utcnow(), "updated_at": datetime.utcnow()}}
+    )
+
+
+async def _queue_resume_upload(database, upload: ResumeUpload, upload_id: Optional[str] = None) -> str:
+    """Record a pending upload and hand it to the background queue, returning its id
+
+    upload_id is one _ingest_resume handed out for a deferred upload.
+    """
+    now = datetime.utcnow()
+    record = {
+        "filename": upload.filename,
+        "content_type": upload.content_type,
+        "sha256": upload.sha256,
+        "status": "pending",
+        "url": None,
+        # Where a sweep can find the bytes again if this worker goes away before uploading them
+        "spool_path": upload.path,
+        "host": socket.gethostname(),
+        "created_at": now,
+        "updated_at": now
+    }
+    if upload_id:
+        record["_id"] = ObjectId(upload_id)
+    result = await database.resume_uploads.insert_one(record)
+    upload_id = str(result.inserted_id)
+    _submit_resume_upload(upload_id, upload.retain())
+    return upload_id
+
+
+def _submit_resume_upload(upload_id: str, upload: ResumeUpload):
+    upload_queue.submit(
+        _upload_resume_job, upload_id, upload,
+        job_id=upload_id,
+        on_failure=partial(_resume_upload_failed, upload)
+    )
+
+
+async def recover_resume_uploads():
+    """Requeue uploads a lost worker left pending, fail those whose bytes are gone and delete orphaned spool files"""
+    database = get_db()
+    if database is None:
+        return
+    now = datetime.utcnow()
+    stale_before = now - timedelta(seconds=settings.RESUME_UPLOAD_STALE_AFTER)
+    host = socket.gethostname()
+    try:
+        # Uploads still queued on this worker are not abandoned, keep them from looking stale
+        active = [ObjectId(upload_id) for upload_id in upload_queue.active_ids()]
+        if active:
+            await database.resume_uploads.update_many(
+                {"_id": {"$in": active}, "status": "pending"},
+                {"$set": {"updated_at": now}}
+            )
+        
+        while True:
+            # Bumping updated_at as each upload is taken keeps other workers' sweeps off it
+            upload = await database.resume_uploads.find_one_and_update(
+                {"status": "pending", "updated_at": {"$lt": stale_before}},
+                {"$set": {"updated_at": now}}
+            )
+            if upload is None:
+                break
+            upload_id = str(upload["_id"])
+            path = upload.get("spool_path")
+            if path and upload.get("host") == host and os.path.exists(path):
+                spool = ResumeUpload.from_spool(path, upload["filename"], upload.get("content_type", ""), upload["sha256"])
+                _submit_resume_upload(upload_id, spool)
+            elif path and upload.get("host") != host and upload["created_at"] > stale_before - timedelta(seconds=settings.RESUME_UPLOAD_STALE_AFTER):
+                # The spool file is on another host, give its own sweep a chance to retry it first
+                continue
+            else:
+                await database.resume_uploads.update_one(
+                    {"_id": upload["_id"], "status": "pending"},
+                    {"$set": {"status": "failed", "error": "Lost with the worker that held it", "completed_at": now, "updated_at": now}}
+                )
+        
+        referenced = set()
+        async for upload in database.resume_uploads.find({"status": "pending", "spool_path": {"$ne": None}}, {"spool_path": 1}):
+            referenced.add(upload["spool_path"])
+        for path in stale_spool_files(settings.RESUME_UPLOAD_STALE_AFTER):
+            if path not in referenced:
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    # Another worker on this host got to it first
+                    pass
+    except Exception as e:
+        print(f"Error recovering resume uploads: {e}")
+
+
+async def sweep_resume_uploads():
+    """Look for abandoned resume uploads every RESUME_UPLOAD_SWEEP_INTERVAL for as long as the worker runs"""
+    while True:
+        await recover_resume_uploads()
+        await asyncio.sleep(settings.RESUME_UPLOAD_SWEEP_INTERVAL)
+
+
+async def _reusable_upload_id(database, blob: Optional[Dict]) -> Optional[str]:
+    """The upload id of a previous copy of this file, unless that upload failed or went stale"""
+    if not blob or not blob.get("upload_id"):
+        return None
+    if blob.get("resume_url"):
+        return blob["upload_id"]
+    
+    upload = await database.resume_uploads.find_one({"_id": ObjectId(blob["upload_id"])}, {"status": 1, "created_at": 1, "updated_at": 1})
+    if not upload or upload["status"] == "failed":
+        return None
+    # A pending upload this old was lost with the worker that owned it
+    last_seen = upload.get("updated_at") or upload["created_at"]
+    if upload["status"] == "pending" and (datetime.utcnow() - last_seen).total_seconds() > settings.RESUME_UPLOAD_STALE_AFTER:
+        return None
+    return blob["upload_id"]
+
+
+async def _resolved_resume_url(database, upload_id: str) -> str:
+    if not ObjectId.is_valid(upload_id):
+        return ""
+    upload = await database.resume_uploads.find_one({"_id": ObjectId(upload_id)}, {"url": 1})
+    return (upload or {}).get("url") or ""
+
+
+async def _ingest_resume(
+    database,
+    upload: ResumeUpload,
+    request: Optional[Request] = None,
+    parser: Optional[ResumeParser] = None,
+    deferred_id: Optional[str] = None
+) -> Tuple[Dict, str, str]:
+    """Queue the Cloudinary upload and parse the resume, returning (parsed data, upload id, resume url)
+
+    The url stays empty while the upload is pending. Given the request, the
+    parse is cancelled if its client goes away. parser defaults to the
+    interactive pool. Given deferred_id, a new upload isn't queued: that id
+    is returned for the caller to queue under once it knows the resume is kept.
+    """
+    # Same bytes seen before (e.g. a re-upload after refresh) reuse the earlier upload and parse
+    blob = await resume_blobs.lookup(upload.sha256)
+    resume_url = (blob or {}).get("resume_url") or ""
+    
+    # Cloudinary runs in the background while we parse, both reading the same spooled bytes
+    upload_id = await _reusable_upload_id(database, blob)
+    if upload_id is None:
+        upload_id = deferred_id or await _queue_resume_upload(database, upload)
+        resume_url = ""
+    
+    if resume_blobs.is_current(blob):
+        return blob["parsed"], upload_id, resume_url
+    
+    parse = (parser or resume_parser).parse_resume(upload.source(), upload.content_type)
+    parsed_data = await (_cancel_on_disconnect(request, parse) if request else parse)
+    await resume_blobs.record(upload.sha256, upload.size, upload.content_type, parsed_data, upload_id)
+    return parsed_data, upload_id, resume_url
+
+
+def _missing_fields(parsed_data: Dict) -> List[str]:
+    return [field for field in ("name", "email", "phone") if not parsed_data.get(field, "")]
+
 
 @router.post("/upload-resume")
-async def upload_resume(file: UploadFile = File(...)):
+async def upload_resume(request: Request, file: UploadFile = File(...)):
     database = get_db()
     
     if database is None:
         raise HTTPException(status_code=503, detail="Database connection not available")
     
-    if file.content_type not in ["application/pdf", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"]:
+    if file.content_type not in RESUME_TYPES.values():
         raise HTTPException(status_code=400, detail="Only PDF and DOCX files are supported")
     
-    content = await file.read()
-    
     try:
-        cloudinary_result = await cloudinary_service.upload_resume(content, file.filename)
-        resume_url = cloudinary_result["url"]
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        upload = await ResumeUpload.from_upload(file)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     
-    parsed_data = await resume_parser.parse_resume(content, file.content_type)
-    
-    missing_fields = []
-    if not parsed_data.get("name", ""):
-        missing_fields.append("name")
-    if not parsed_data.get("email", ""):
-        missing_fields.append("email")
-    if not parsed_data.get("phone", ""):
-        missing_fields.append("phone")
+    try:
+        parsed_data, upload_id, resume_url = await _ingest_resume(database, upload, request)
+    except TimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    finally:
+        upload.release()
     
+    missing_fields = _missing_fields(parsed_data)
     return {
         "parsedData": {
             "name": parsed_data.get("name", ""),
             "email": parsed_data.get("email", ""),
             "phone": parsed_data.get("phone", ""),
             "resumeText": parsed_data.get("full_text", ""),
-            "resumeUrl": resume_url
+            # Empty until the background upload finishes, then set on the candidate
+            "resumeUrl": resume_url,
+            "resumeUploadId": upload_id
         },
         "missingFields": missing_fields
     }
 
+@router.get("/resume-upload/{upload_id}")
+async def get_resume_upload(upload_id: str):
+    """Check on a background resume upload"""
+    database = get_db()
+    
+    if database is None:
+        raise HTTPException(status_code=503, detail="Database connection not available")
+    
+    upload = await database.resume_uploads.find_one({"_id": ObjectId(upload_id)}) if ObjectId.is_valid(upload_id) else None
+    if not upload:
+        raise HTTPException(status_code=404, detail="Resume upload not found")
+    
+    return {
+        "status": upload["status"],
+        "resumeUrl": upload.get("url") or ""
+    }
+
+def _spool_zip_member(archive: zipfile.ZipFile, info: zipfile.ZipInfo, content_type: str) -> ResumeUpload:
+    """Copy one archive member into a ResumeUpload on disk, enforcing the size limit on the inflated bytes"""
+    spool = ResumeUpload(os.path.basename(info.filename), content_type, spool_threshold=0)
+    try:
+        with archive.open(info) as member:
+            while chunk := member.read(settings.RESUME_UPLOAD_CHUNK_SIZE):
+                spool.write(chunk)
+        spool.finish()
+    except BaseException:
+        spool.close()
+        raise
+    return spool
+
+
+async def _bulk_sources(files: List[UploadFile]):
+    """Yield (filename, ResumeUpload or error message) for each resume in the batch, expanding ZIP archives
+
+    Every resume is spooled to disk, since the batch can queue hundreds of
+    Cloudinary uploads behind the upload workers.
+    """
+    count = 0
+    for file in files:
+        filename = file.filename or "upload"
+        if filename.lower().endswith(".zip") or file.content_type in ("application/zip", "application/x-zip-compressed"):
+            try:
+                archive = zipfile.ZipFile(file.file)
+            except zipfile.BadZipFile:
+                yield filename, "Not a valid ZIP archive"
+                continue
+            with archive:
+                for info in archive.infolist():
+                    name = os.path.basename(info.filename)
+                    # Folders, and the metadata macOS adds to archives
+                    if info.is_dir() or info.filename.startswith("__MACOSX/") or name.startswith("."):
+                        continue
+                    member = f"{filename}/{info.filename}"
+                    content_type = RESUME_TYPES.get(os.path.splitext(name)[1].lower())
+                    count += 1
+                    if count > settings.BULK_INGEST_MAX_FILES:
+                        yield member, f"Batch is limited to {settings.BULK_INGEST_MAX_FILES} resumes"
+                    elif content_type is None:
+                        yield member, "Only PDF and DOCX files are supported"
+                    elif info.file_size > settings.RESUME_MAX_BYTES:
+                        yield member, "Resume file is too large"
+                    else:
+                        try:
+                            # zipfile reads block, keep them off the event loop
+                            yield member, await asyncio.to_thread(_spool_zip_member, archive, info, content_type)
+                        except (UploadTooLargeError, zipfile.BadZipFile) as e:
+                            yield member, str(e)
+            continue
+        
+        # Browsers send octet-stream for some files, go by the extension then
+        content_type = file.content_type if file.content_type in RESUME_TYPES.values() else RESUME_TYPES.get(os.path.splitext(filename)[1].lower())
+        count += 1
+        if count > settings.BULK_INGEST_MAX_FILES:
+            yield filename, f"Batch is limited to {settings.BULK_INGEST_MAX_FILES} resumes"
+        elif content_type is None:
+            yield filename, "Only PDF and DOCX files are supported"
+        else:
+            try:
+                upload = await ResumeUpload.from_upload(file, spool_threshold=0)
+            except UploadTooLargeError as e:
+                yield filename, str(e)
+                continue
+            upload.content_type = content_type
+            yield filename, upload
+
+
+async def _bulk_parse(database, filename: str, upload: ResumeUpload) -> Dict:
+    """Parse one resume, returning its result line and, given an email, the candidate to create
+
+    A new Cloudinary upload is deferred, the line holds the resume as upload
+    until _finish_bulk_upload knows whether it is kept.
+    """
+    deferred_id = str(ObjectId())
+    upload_id = None
+    try:
+        parsed_data, upload_id, resume_url = await _ingest_resume(
+            database, upload, parser=bulk_resume_parser, deferred_id=deferred_id
+        )
+    except Exception as e:
+        print(f"Error ingesting resume {filename}: {e}")
+        return {"file": filename, "status": "error", "error": str(e)}
+    finally:
+        if upload_id != deferred_id:
+            upload.release()
+    
+    result = {
+        "file": filename,
+        "name": parsed_data.get("name") or "",
+        "email": parsed_data.get("email") or "",
+        "phone": parsed_data.get("phone") or "",
+        "missingFields": _missing_fields(parsed_data),
+        "resumeUploadId": upload_id
+    }
+    if upload_id == deferred_id:
+        result["upload"] = upload
+    if not result["email"]:
+        # Candidates are keyed on email, create-or-check-candidate takes it from here with the upload id
+        result["status"] = "missing_email"
+        return result
+    
+    result["candidate"] = {
+        "name": result["name"],
+        "email": result["email"],
+        "phone": result["phone"],
+        "resume_text": parsed_data.get("full_text", ""),
+        "resume_url": resume_url,
+        "resume_upload_id": upload_id,
+        "status": "ready",
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow()
+    }
+    return result
+
+
+async def _bulk_create_candidates(database, results: List[Dict]):
+    """Create a batch's candidates in one unordered bulk write of upserts keyed on email
+
+    $setOnInsert leaves candidates who already exist, e.g. from an earlier
+    drive or the single upload flow, untouched; they're reported as existing.
+    """
+    candidates = [result.pop("candidate") for result in results]
+    operations = [UpdateOne({"email": candidate["email"]}, {"$setOnInsert": candidate}, upsert=True) for candidate in candidates]
+    failed = {}
+    try:
+        upserted = (await database.candidates.bulk_write(operations, ordered=False)).upserted_ids
+    except BulkWriteError as e:
+        upserted = {item["index"]: item["_id"] for item in e.details.get("upserted", [])}
+        for error in e.details.get("writeErrors", []):
+            # A duplicate key means a concurrent request inserted that email first, it's found below
+            if error.get("code") != 11000:
+                failed[error["index"]] = error.get("errmsg", "Write failed")
+    except Exception as e:
+        print(f"Error creating candidates: {e}")
+        for result in results:
+            result.update(status="error", error=str(e))
+        return
+    
+    created = set(upserted.values())
+    candidate_ids = {}
+    emails = [candidate["email"] for index, candidate in enumerate(candidates) if index not in failed]
+    async for candidate in database.candidates.find({"email": {"$in": emails}}, {"email": 1}):
+        candidate_ids[candidate["email"]] = candidate["_id"]
+    
+    for index, result in enumerate(results):
+        if index in failed:
+            result.update(status="error", error=failed[index])
+            continue
+        candidate_id = candidate_ids.get(result["email"])
+        result.update(status="created" if candidate_id in created else "exists", candidateId=str(candidate_id) if candidate_id else None)
+    
+    # Uploads that finished before their candidate existed missed it, as in create-or-check-candidate
+    pending = [
+        ObjectId(candidate["resume_upload_id"]) for candidate in candidates
+        if not candidate["resume_url"] and ObjectId.is_valid(candidate["resume_upload_id"]) and candidate_ids.get(candidate["email"]) in created
+    ]
+    if pending:
+        async for upload in database.resume_uploads.find({"_id": {"$in": pending}, "status": "done"}, {"url": 1}):
+            await database.candidates.update_many(
+                {"resume_upload_id": str(upload["_id"]), "resume_url": ""},
+                {"$set": {"resume_url": upload["url"]}}
+            )
+
+
+async def _finish_bulk_upload(database, result: Dict):
+    """Queue the upload a result line deferred if its resume is kept, otherwise drop it unsent"""
+    upload = result.pop("upload", None)
+    if upload is None:
+        return
+    try:
+        if result["status"] in ("created", "missing_email"):
+            await _queue_resume_upload(database, upload, result["resumeUploadId"])
+        else:
+            # The candidate existed already or came earlier in the batch, nothing would point at this upload
+            result["resumeUploadId"] = None
+    finally:
+        upload.release()
+
+
+async def _bulk_ingest(database, files: List[UploadFile]):
+    """Run the batch through parse workers and batched candidate writes, yielding an NDJSON line per resume as it finishes"""
+    sources: asyncio.Queue = asyncio.Queue(maxsize=settings.BULK_INGEST_CONCURRENCY)
+    finished: asyncio.Queue = asyncio.Queue()
+    
+    async def produce():
+        async for item in _bulk_sources(files):
+            try:
+                await sources.put(item)
+            except asyncio.CancelledError:
+                # Cancelled waiting for room, the item never reached the queue the cleanup drains
+                if not isinstance(item[1], str):
+                    item[1].release()
+                raise
+        for _ in range(settings.BULK_INGEST_CONCURRENCY):
+            await sources.put(None)
+    
+    async def work():
+        while (item := await sources.get()) is not None:
+            filename, upload = item
+            if isinstance(upload, str):
+                await finished.put({"file": filename, "status": "error", "error": upload})
+            else:
+                await finished.put(await _bulk_parse(database, filename, upload))
+    
+    tasks = [asyncio.create_task(produce())] + [asyncio.create_task(work()) for _ in range(settings.BULK_INGEST_CONCURRENCY)]
+    pipeline = asyncio.gather(*tasks)
+    pipeline.add_done_callback(lambda _: finished.put_nowait(None))
+    
+    counts: Dict[str, int] = {}
+    first_seen: Dict[str, str] = {}
+    batch: List[Dict] = []
+    ready: List[Dict] = []
+    try:
+        result = True
+        while result is not None:
+            ready = []
+            try:
+                # Don't hold parsed resumes back for long waiting on a full batch
+                result = await asyncio.wait_for(finished.get(), timeout=settings.BULK_INGEST_FLUSH_SECONDS if batch else None)
+            except asyncio.TimeoutError:
+                result = {}
+            
+            if result and "candidate" in result:
+                if result["email"] in first_seen:
+                    del result["candidate"]
+                    result.update(status="duplicate", duplicateOf=first_seen[result["email"]])
+                    ready.append(result)
+                else:
+                    first_seen[result["email"]] = result["file"]
+                    batch.append(result)
+            elif result:
+                ready.append(result)
+            
+            if batch and (not result or len(batch) >= settings.BULK_INGEST_BATCH_SIZE):
+                await _bulk_create_candidates(database, batch)
+                ready.extend(batch)
+                batch = []
+            
+            while ready:
+                line = ready.pop(0)
+                await _finish_bulk_upload(database, line)
+                counts[line["status"]] = counts.get(line["status"], 0) + 1
+                yield json.dumps(line) + "\n"
+        
+        summary = {"done": True, "files": sum(counts.values()), "statuses": counts}
+        if pipeline.exception():
+            print(f"Error in bulk resume ingest: {pipeline.exception()}")
+            summary["error"] = str(pipeline.exception())
+        yield json.dumps(summary) + "\n"
+    finally:
+        # The client went away, or a step failed
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        while not sources.empty():
+            item = sources.get_nowait()
+            if item is not None and not isinstance(item[1], str):
+                item[1].release()
+        unfinished = batch + ready
+        while not finished.empty():
+            unfinished.append(finished.get_nowait())
+        for result in unfinished:
+            if result and "upload" in result:
+                result.pop("upload").release()
+
+
+@router.post("/bulk-ingest-resumes")
+async def bulk_ingest_resumes(files: List[UploadFile] = File(...)):
+    """Ingest a campus drive's resumes, sent as PDF/DOCX files and ZIP archives of them
+
+    Streams an NDJSON line per resume as it is processed: its parsed details,
+    resume upload id (null for resumes of existing or duplicate candidates,
+    which aren't uploaded) and status (created, exists, duplicate, missing_email or
+    error), then a final line with the counts.
+    """
+    database = get_db()
+    
+    if database is None:
+        raise HTTPException(status_code=503, detail="Database connection not available")
+    
+    return StreamingResponse(_bulk_ingest(database, files), media_type="application/x-ndjson")
+
+
 @router.post("/create-or-check-candidate")
 async def create_or_check_candidate(data: Dict[str, str]):
     """Create new candidate or check if exists"""
@@ -93,20 +640,38 @@ async def create_or_check_candidate(data: Dict[str, str]):
         }
     
    
+    resume_url = data.get("resumeUrl", "")
+    resume_upload_id = data.get("resumeUploadId", "")
+    if resume_upload_id and not ObjectId.is_valid(resume_upload_id):
+        raise HTTPException(status_code=400, detail="Invalid resumeUploadId")
+    if resume_upload_id and not resume_url:
+        resume_url = await _resolved_resume_url(database, resume_upload_id)
+    
     candidate_data = {
         "name": data.get("name", ""),
         "email": data.get("email", ""),
         "phone": data.get("phone", ""),
         "resume_text": data.get("resumeText", ""),
-        "resume_url": data.get("resumeUrl", ""), 
+        "resume_url": resume_url, 
         "status": "ready",
         "created_at": datetime.utcnow(),
         "updated_at": datetime.utcnow()
     }
+    if resume_upload_id:
+        candidate_data["resume_upload_id"] = resume_upload_id
     
     result = await database.candidates.insert_one(candidate_data)
     candidate_id = str(result.inserted_id)
     
+    if resume_upload_id and not resume_url:
+        # The upload may have finished between the lookup and the insert
+        resume_url = await _resolved_resume_url(database, resume_upload_id)
+        if resume_url:
+            await database.candidates.update_one(
+                {"_id": result.inserted_id},
+                {"$set": {"resume_url": resume_url}}
+            )
+    
     return {
         "exists": False,
         "candidateId": candidate_id,
@@ -160,6 +725,7 @@ async def update_candidate_info(candidate_id: str, data: Dict[str, str]):
                 {"_id": ObjectId(candidate_id)},
                 {"$set": update_data}
             )
+            await session_cache.evict_candidate(candidate_id)
             
             if update_result.modified_count == 0:
                 # No error, just nothing to update
@@ -175,15 +741,19 @@ async def update_candidate_info(candidate_id: str, data: Dict[str, str]):
     
     return {"message": "Information updated successfully"}
 @router.post("/start-interview/{candidate_id}")
-async def start_interview(candidate_id: str):
-    """Start or resume interview session"""
+async def start_interview(candidate_id: str, grading_mode: Optional[str] = None):
+    """Start or resume interview session, grading each answer as it comes or all of them at the end"""
     database = get_db()
     
     if database is None:
         raise HTTPException(status_code=503, detail="Database connection not available")
     
+    grading_mode = grading_mode or settings.GRADING_MODE
+    if grading_mode not in GRADING_MODES:
+        raise HTTPException(status_code=400, detail=f"grading_mode must be one of: {', '.join(GRADING_MODES)}")
+    
     # Check if candidate exists and has all required info
-    candidate = await database.candidates.find_one({"_id": ObjectId(candidate_id)})
+    candidate = await session_cache.get_candidate(database, candidate_id)
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
     
@@ -195,10 +765,12 @@ async def start_interview(candidate_id: str):
         "candidate_id": candidate_id
     })
     
-    # If candidate is completed and session exists, return the completed interview data
-    if candidate.get("status") == "completed" and existing_session and existing_session.get("is_completed"):
+    # If the session is finished, return the completed interview data, the summary may still be on its way
+    if existing_session and existing_session.get("is_completed"):
+        # Score and summary are written by the summary job, possibly on another worker, so skip the cache
+        candidate = await database.candidates.find_one({"_id": ObjectId(candidate_id)}) or candidate
         # Convert datetime objects to strings for JSON serialization
-        questions = existing_session.get("questions", [])
+        questions = [_public_question(q) for q in existing_session.get("questions", [])]
         for q in questions:
             if q.get("start_time") and hasattr(q["start_time"], "isoformat"):
                 q["start_time"] = q["start_time"].isoformat()
@@ -210,6 +782,7 @@ async def start_interview(candidate_id: str):
             "session_id": str(existing_session["_id"]),
             "final_score": candidate.get("final_score", 0),
             "summary": candidate.get("summary", ""),
+            "summary_pending": candidate.get("status") == "scoring",
             "questions": questions,
             "completed_at": existing_session.get("end_time").isoformat() if existing_session.get("end_time") else None,
             "message": "Interview already completed. Showing your results."
@@ -220,6 +793,9 @@ async def start_interview(candidate_id: str):
         
         # If session exists but not completed, resume
         if not existing_session.get("is_completed"):
+            # Warm the cache before the answers start coming in
+            await session_cache.put_session(existing_session)
+            
             # Find the current unanswered question
             current_index = existing_session["current_question_index"]
             questions = existing_session["questions"]
@@ -248,206 +824,584 @@ async def start_interview(candidate_id: str):
                 
                 return {
                     "session_id": session_id,
-                    "question": current_question,
+                    "question": _public_question(current_question),
                     "resuming": True,
+                    "grading_mode": existing_session.get("grading_mode", "per_question"),
                     "question_number": current_index + 1,
                     "elapsed_time": elapsed_time,
                     "current_question_index": current_index
                 }
     
-    # Create new interview session only if no session exists
+    # Generate first question
+    first_question = await question_pool.get_question("easy")
+    question = Question(
+        id=str(uuid.uuid4()),
+        text=first_question["question"],
+        difficulty="easy",
+        time_limit=first_question["time_limit"],
+        expected_topics=first_question["expected_topics"],
+        hints=first_question["hints"],
+        accepted_answers=first_question.get("accepted_answers", []),
+        generation_tier=first_question.get("tier"),
+        start_time=datetime.utcnow()
+    )
+    
+    # Create new interview session only if no session exists, starting on its first question
     session_data = {
         "candidate_id": candidate_id,
-        "questions": [],
+        "questions": [question.dict()],
         "current_question_index": 0,
         "is_paused": False,
         "is_completed": False,
+        "grading_mode": grading_mode,
         "start_time": datetime.utcnow(),
         "end_time": None
     }
     
     result = await database.sessions.insert_one(session_data)
     session_id = str(result.inserted_id)
+    await session_cache.put_session(session_data)
     
     # Update candidate status
-    await database.candidates.update_one(
-        {"_id": ObjectId(candidate_id)},
-        {"$set": {"status": "in-progress"}}
+    await session_cache.update_candidate(database, candidate_id, {"$set": {"status": "in-progress"}})
+    
+    return {
+        "session_id": session_id,
+        "question": _public_question(question.dict()),
+        "resuming": False,
+        "grading_mode": grading_mode,
+        "question_number": 1,
+        "elapsed_time": 0
+    }
+
+
+@router.post("/evaluation-cache/invalidate")
+async def invalidate_evaluation_cache(data: Dict[str, str] = {}):
+    """Drop cached evaluations after a rubric change, optionally switching rubric version"""
+    cache = groq_service.evaluation_cache
+    try:
+        deleted = await cache.invalidate(data.get("rubric_version"))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return {
+        "rubric_version": cache.rubric_version,
+        "deleted": deleted
+    }
+
+
+# backend/app/routers/interview.py - Update the submit-answer endpoint
+
+DIFFICULTY_MAP = {0: "easy", 1: "easy", 2: "medium", 3: "medium", 4: "hard", 5: "hard"}
+
+
+async def _timed(stage: str, timings: Dict[str, float], awaitable):
+    """Await and record how long the stage took in milliseconds"""
+    started = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        timings[stage] = (time.perf_counter() - started) * 1000
+
+
+def _server_timing(timings: Dict[str, float]) -> str:
+    return ", ".join(f"{stage};dur={duration:.1f}" for stage, duration in timings.items())
+
+
+def _delta_sender(session_id: str, frame_type: str, **fields):
+    """Callback pushing streamed LLM text to the session's socket, or None when nobody is listening"""
+    if not settings.GROQ_STREAM_TO_WEBSOCKET or not manager.is_connected(session_id):
+        return None
+    
+    async def send(delta: str, replace: bool = False):
+        frame = {"type": frame_type, "session_id": session_id, **fields, "delta": delta}
+        if replace:
+            # Discard the text streamed so far, this is all of it
+            frame["replace"] = True
+        try:
+            await manager.send_message(frame, session_id)
+        except Exception as e:
+            # A dropped socket must not fail the evaluation itself
+            print(f"Error sending {frame_type}: {e}")
+    
+    return send
+
+
+async def _evaluate(session_id: str, index: int, question: Dict, answer: str) -> Dict:
+    return await groq_service.evaluate_answer(
+        question["text"],
+        answer,
+        question["expected_topics"],
+        question["difficulty"],  # Pass difficulty for proper scoring
+        accepted_answers=question.get("accepted_answers"),
+        on_delta=_delta_sender(session_id, "evaluation_delta", question_index=index)
     )
+
+
+def _answer_fields(index: int, answer: str, evaluation: Optional[Dict] = None) -> Dict:
+    """The answer, plus its grade unless grading is deferred to the end"""
+    update_key = f"questions.{index}"
+    fields = {
+        f"{update_key}.answer": answer,
+        f"{update_key}.end_time": datetime.utcnow().isoformat()
+    }
+    if evaluation is not None:
+        fields.update(_grade_fields(index, evaluation))
+    return fields
+
+
+def _grade_fields(index: int, evaluation: Dict) -> Dict:
+    update_key = f"questions.{index}"
+    return {
+        f"{update_key}.score": evaluation["score"],
+        f"{update_key}.feedback": evaluation["feedback"],
+        # "llm", or "local"/"rule" when the local scorer settled it
+        f"{update_key}.graded_by": evaluation.get("source", "llm"),
+        # Which model tier produced the grade, for auditing fallbacks
+        f"{update_key}.evaluation_tier": evaluation.get("tier")
+    }
+
+
+def _public_question(question: Dict) -> Dict:
+    """The question as the candidate may see it, without its answer key, claim or audit fields"""
+    return {key: value for key, value in question.items() if key not in ("accepted_answers", "claim", "generation_tier", "evaluation_tier")}
+
+
+def _unanswered(index: int) -> Dict:
+    """Matches the session only while the question at index is current and has no answer"""
+    return {"current_question_index": index, f"questions.{index}.answer": None}
+
+
+async def _prepare_next_question(database, session_id: str, session: Dict, next_index: int) -> Dict:
+    """Fetch the next question and push it onto the session, reusing one left by an earlier attempt"""
+    if len(session["questions"]) > next_index:
+        return session["questions"][next_index]
     
-    # Generate first question
-    first_question = await groq_service.generate_interview_question("easy", "fullstack")
-    question = Question(
+    next_difficulty = DIFFICULTY_MAP[next_index]
+    
+    # Get previously asked questions to avoid repetition
+    previous_questions = [q["text"] for q in session["questions"]]
+    
+    try:
+        next_question_data = await question_pool.get_question(next_difficulty, previous_questions)
+    except Exception as e:
+        print(f"Error fetching pooled question: {e}")
+        next_question_data = await groq_service.generate_interview_question(next_difficulty, "fullstack", previous_questions)
+    
+    next_question = Question(
         id=str(uuid.uuid4()),
-        text=first_question["question"],
-        difficulty="easy",
-        time_limit=first_question["time_limit"],
-        expected_topics=first_question["expected_topics"],
-        hints=first_question["hints"],
+        text=next_question_data["question"],
+        difficulty=next_difficulty,
+        time_limit=next_question_data["time_limit"],
+        expected_topics=next_question_data["expected_topics"],
+        hints=next_question_data["hints"],
+        accepted_answers=next_question_data.get("accepted_answers", []),
+        generation_tier=next_question_data.get("tier"),
         start_time=datetime.utcnow()
-    )
+    ).dict()
     
-    # Add question to session
-    await database.sessions.update_one(
-        {"_id": ObjectId(session_id)},
-        {"$push": {"questions": question.dict()}}
+    # Only push if no other attempt got there first, otherwise use theirs
+    pushed = await session_cache.transition_session(
+        database, session_id,
+        {"questions": {"$size": next_index}},
+        {"$push": {"questions": next_question}}
+    )
+    if pushed is None:
+        session = await session_cache.get_session(database, session_id)
+        return session["questions"][next_index]
+    return next_question
+
+
+def _advance_fields(next_question: Dict, next_index: int) -> Dict:
+    """Make the next question current, starting its timer now that the candidate sees it"""
+    next_question["start_time"] = datetime.utcnow()
+    return {
+        "current_question_index": next_index,
+        f"questions.{next_index}.start_time": next_question["start_time"]
+    }
+
+
+def _finish_timing(response: Response, timings: Dict[str, float], started: float, round_trips: List[int]):
+    timings["total"] = (time.perf_counter() - started) * 1000
+    response.headers["Server-Timing"] = _server_timing(timings)
+    response.headers["X-Session-Round-Trips"] = str(round_trips[0])
+    session_cache.record_answer(round_trips[0])
+
+
+async def _claim_answer(database, session_id: str, index: int) -> Optional[str]:
+    """Claim the unanswered question at index for evaluation, across workers; None while someone else holds it"""
+    token = str(uuid.uuid4())
+    now = datetime.utcnow()
+    claim_key = f"questions.{index}.claim"
+    claimed = await session_cache.transition_session(
+        database, session_id,
+        {**_unanswered(index), "$or": [{claim_key: None}, {f"{claim_key}.expires_at": {"$lt": now}}]},
+        {"$set": {claim_key: {"token": token, "expires_at": now + timedelta(seconds=settings.ANSWER_CLAIM_TTL)}}}
     )
+    return token if claimed else None
+
+
+def _claimed(index: int, token: str) -> Dict:
+    """Matches the session only while our claim on the unanswered question at index still stands"""
+    return {**_unanswered(index), f"questions.{index}.claim.token": token}
+
+
+async def _release_claim(database, session_id: str, index: int, token: str):
+    try:
+        await session_cache.transition_session(
+            database, session_id,
+            {f"questions.{index}.claim.token": token},
+            {"$unset": {f"questions.{index}.claim": ""}}
+        )
+    except Exception as e:
+        # The claim lapses on its own
+        print(f"Error releasing answer claim: {e}")
+
+
+async def _resume_answered(database, session_id: str, session: Dict, index: int) -> Dict:
+    """Response for an answer that is already recorded, finishing the move to the next question if that never happened"""
+    next_index = index + 1
+    if next_index >= 6:
+        # Already completed
+        return {
+            "completed": True,
+            "message": "Interview already completed"
+        }
     
+    next_question = await _prepare_next_question(database, session_id, session, next_index)
+    if session["current_question_index"] == index:
+        # An earlier attempt recorded the answer but failed before advancing
+        await session_cache.transition_session(
+            database, session_id,
+            {"current_question_index": index},
+            {"$set": _advance_fields(next_question, next_index)}
+        )
     return {
+        "already_answered": True,
+        "next_question": _public_question(next_question),
+        "question_number": next_index + 1,
+        "message": "Moving to next question"
+    }
+
+
+async def _await_answer(database, session_id: str, index: int) -> Dict:
+    """Poll while another worker holds the claim, then answer from what it recorded"""
+    deadline = time.monotonic() + settings.ANSWER_CLAIM_TTL
+    while time.monotonic() < deadline:
+        await asyncio.sleep(settings.ANSWER_CLAIM_POLL_INTERVAL)
+        session = await session_cache.reload_session(database, session_id)
+        question = session["questions"][index]
+        if question.get("answer") is not None:
+            return await _resume_answered(database, session_id, session, index)
+        if not question.get("claim"):
+            # Released after a failure, the client decides whether to try again
+            break
+    raise HTTPException(status_code=409, detail="This answer is still being processed, please resubmit")
+
+
+async def _queue_summary(database, session_id: str, candidate_id: str) -> str:
+    """Record a pending summary job for a finished session and hand it to the background queue, returning its id"""
+    now = datetime.utcnow()
+    result = await database.summary_jobs.insert_one({
         "session_id": session_id,
-        "question": question.dict(),
-        "resuming": False,
-        "question_number": 1,
-        "elapsed_time": 0
+        "candidate_id": candidate_id,
+        "status": "pending",
+        "attempts": 0,
+        "created_at": now,
+        "updated_at": now
+    })
+    job_id = str(result.inserted_id)
+    summary_queue.submit(_summary_job, job_id, job_id=job_id, on_failure=_summary_failed)
+    return job_id
+
+
+async def _summary_job(job_id: str):
+    """Write the summary, grading every answer first for deferred sessions, then notify the candidate and dashboards"""
+    database = get_db()
+    job = await database.summary_jobs.find_one_and_update(
+        {"_id": ObjectId(job_id), "status": {"$in": ["pending", "running"]}},
+        {"$set": {"status": "running", "updated_at": datetime.utcnow()}, "$inc": {"attempts": 1}},
+        return_document=ReturnDocument.AFTER
+    )
+    if job is None:
+        # Already finished, e.g. by a worker that recovered it
+        return
+    
+    session_id = job["session_id"]
+    session = await database.sessions.find_one({"_id": ObjectId(session_id)})
+    candidate = await session_cache.get_candidate(database, job["candidate_id"])
+    on_delta = _delta_sender(session_id, "summary_delta")
+    
+    # Behind live questions and grading for rate-limit quota, ahead of pool refills
+    with llm_priority("summary"):
+        if session.get("grading_mode") == "deferred":
+            grading = await groq_service.grade_interview(candidate["name"], session["questions"], on_delta=on_delta)
+            scores = {}
+            for index, evaluation in enumerate(grading["evaluations"]):
+                scores.update(_grade_fields(index, evaluation))
+            await database.sessions.update_one({"_id": ObjectId(session_id)}, {"$set": scores})
+            total_score, summary = grading["total_score"], grading["summary"]
+        else:
+            total_score = sum(q.get("score") or 0 for q in session["questions"] if q.get("score") is not None)
+            summary = await groq_service.generate_candidate_summary(candidate["name"], session["questions"], total_score, on_delta=on_delta)
+    
+    await _finish_summary(database, job, total_score, summary, "done")
+
+
+async def _finish_summary(database, job: Dict, total_score: float, summary: str, status: str):
+    """Complete the candidate with its score and summary, close the job, then notify the candidate and dashboards"""
+    await session_cache.update_candidate(database, job["candidate_id"], {
+        "$set": {
+            "status": "completed",
+            "final_score": total_score,
+            "summary": summary
+        }
+    })
+    await database.summary_jobs.update_one(
+        {"_id": job["_id"]},
+        {"$set": {"status": status, "updated_at": datetime.utcnow()}}
+    )
+    
+    message = {
+        "type": "summary_ready",
+        "session_id": job["session_id"],
+        "candidate_id": job["candidate_id"],
+        "final_score": total_score,
+        "summary": summary
     }
+    manager.publish(session_topic(job["session_id"]), message)
+    manager.publish(DASHBOARD_TOPIC, message)
 
 
-# backend/app/routers/interview.py - Update the submit-answer endpoint
+async def _summary_failed(job_id: str, error: Exception):
+    """Every attempt failed, so finish with local scores and the template summary rather than leave the candidate scoring"""
+    database = get_db()
+    job = await database.summary_jobs.find_one({"_id": ObjectId(job_id)})
+    if job is None or job["status"] not in ("pending", "running"):
+        return
+    await database.summary_jobs.update_one({"_id": job["_id"]}, {"$set": {"error": str(error)}})
+    
+    session = await database.sessions.find_one({"_id": ObjectId(job["session_id"])})
+    candidate = await session_cache.get_candidate(database, job["candidate_id"])
+    scores = {}
+    for index, q in enumerate(session["questions"]):
+        if q.get("score") is None:
+            # Deferred sessions are only graded by the job, so their answers have no score yet
+            evaluation = groq_service.local_evaluation(
+                q["text"], q.get("answer"), q.get("expected_topics", []), q["difficulty"], q.get("accepted_answers")
+            )
+            scores.update(_grade_fields(index, evaluation))
+            q["score"] = evaluation["score"]
+    if scores:
+        await database.sessions.update_one({"_id": session["_id"]}, {"$set": scores})
+    
+    total_score = sum(q["score"] for q in session["questions"])
+    summary = groq_service.template_summary(candidate["name"], total_score)
+    # If this fails too the job stays open and the sweep tries it again later
+    await _finish_summary(database, job, total_score, summary, "failed")
+
+
+async def recover_summary_jobs():
+    """Requeue summary jobs left unfinished by a worker that went away"""
+    database = get_db()
+    if database is None:
+        return
+    now = datetime.utcnow()
+    stale_before = now - timedelta(seconds=settings.SUMMARY_STALE_AFTER)
+    try:
+        # Jobs still waiting in this worker's queue are not abandoned, keep them from looking stale
+        active = [ObjectId(job_id) for job_id in summary_queue.active_ids()]
+        if active:
+            await database.summary_jobs.update_many(
+                {"_id": {"$in": active}, "status": {"$in": ["pending", "running"]}},
+                {"$set": {"updated_at": now}}
+            )
+        
+        while True:
+            # Bumping updated_at as each job is taken keeps other workers' sweeps off it
+            job = await database.summary_jobs.find_one_and_update(
+                {"status": {"$in": ["pending", "running"]}, "updated_at": {"$lt": stale_before}},
+                {"$set": {"updated_at": now}},
+                projection={"_id": 1}
+            )
+            if job is None:
+                break
+            job_id = str(job["_id"])
+            summary_queue.submit(_summary_job, job_id, job_id=job_id, on_failure=_summary_failed)
+    except Exception as e:
+        print(f"Error recovering summary jobs: {e}")
+
+
+async def sweep_summary_jobs():
+    """Look for abandoned summary jobs every SUMMARY_SWEEP_INTERVAL for as long as the worker runs"""
+    while True:
+        await recover_summary_jobs()
+        await asyncio.sleep(settings.SUMMARY_SWEEP_INTERVAL)
+
 
 @router.post("/submit-answer/{session_id}")
-async def submit_answer(session_id: str, data: Dict[str, str]):
+async def submit_answer(session_id: str, data: Dict[str, str], response: Response):
     """Submit answer and get next question"""
     database = get_db()
     
     if database is None:
         raise HTTPException(status_code=503, detail="Database connection not available")
     
-    answer = data.get("answer", "")
-    
-    # Get session
-    session = await database.sessions.find_one({"_id": ObjectId(session_id)})
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
+    with count_round_trips() as round_trips:
+        # Get session, from memory while the interview is in progress
+        session = await session_cache.get_session(database, session_id)
+        if not session:
+            raise HTTPException(status_code=404, detail="Session not found")
+        
+        question_id = data.get("question_id")
+        if question_id and not any(q.get("id") == question_id for q in session["questions"]):
+            # Cached before another worker moved the interview on to this question
+            session = await session_cache.reload_session(database, session_id)
+        
+        return await _route_answer(database, session_id, session, data.get("answer", ""), question_id, response, round_trips)
+
+
+async def _route_answer(database, session_id: str, session: Dict, answer: str, question_id: Optional[str], response: Response, round_trips: List[int]):
+    """Send the answer to the question it is for, or answer from the record if that question is already done"""
     current_index = session["current_question_index"]
     
     # Check if current_index is valid
     if current_index >= len(session["questions"]):
         raise HTTPException(status_code=400, detail="No more questions available")
     
-    current_question = session["questions"][current_index]
+    # A question the client names that is behind the interview was answered by an earlier submission
+    answered_index = next((i for i, q in enumerate(session["questions"]) if question_id and q.get("id") == question_id), current_index)
+    if answered_index < current_index:
+        return await _resume_answered(database, session_id, session, answered_index)
     
     # Check if question was already answered
-    if current_question.get("answer") is not None:
-        # Question already answered, just return the next question or completion
-        next_index = current_index + 1
-        
-        if next_index >= 6:
-            # Already completed
-            return {
-                "completed": True,
-                "message": "Interview already completed"
-            }
-        else:
-            # Return next question info
-            return {
-                "already_answered": True,
-                "question_number": next_index + 1,
-                "message": "Moving to next question"
-            }
+    if session["questions"][current_index].get("answer") is not None:
+        return await _resume_answered(database, session_id, session, current_index)
     
-    # Evaluate answer using Groq with difficulty
-    evaluation = await groq_service.evaluate_answer(
-        current_question["text"],
-        answer,
-        current_question["expected_topics"],
-        current_question["difficulty"]  # Pass difficulty for proper scoring
+    # Double clicks and client retries share the first submission's outcome instead of paying for it again
+    return await answer_flights.run(
+        (session_id, current_index),
+        partial(_answer_question, database, session_id, session, answer, question_id, response, round_trips)
     )
+
+
+async def _answer_question(database, session_id: str, session: Dict, answer: str, question_id: Optional[str], response: Response, round_trips: List[int]):
+    current_index = session["current_question_index"]
+    token = await _claim_answer(database, session_id, current_index)
+    if token is None:
+        fresh = await session_cache.reload_session(database, session_id)
+        if fresh is not None and fresh["current_question_index"] > current_index and not question_id:
+            # Our copy of the session was stale (e.g. cached by this worker before another one advanced it),
+            # so this is an answer to the question the interview has moved on to, not a repeat
+            return await _route_answer(database, session_id, fresh, answer, question_id, response, round_trips)
+        # A submission on another worker is already evaluating this answer
+        return await _await_answer(database, session_id, current_index)
     
-    # Update the specific question in the array
-    update_key = f"questions.{current_index}"
-    await database.sessions.update_one(
-        {"_id": ObjectId(session_id)},
-        {
-            "$set": {
-                f"{update_key}.answer": answer,
-                f"{update_key}.score": evaluation["score"],
-                f"{update_key}.feedback": evaluation["feedback"],
-                f"{update_key}.end_time": datetime.utcnow().isoformat()
-            }
-        }
-    )
+    try:
+        return await _evaluate_and_advance(database, session_id, session, answer, token, response, round_trips)
+    except Exception:
+        await _release_claim(database, session_id, current_index, token)
+        raise
+
+
+async def _evaluate_and_advance(database, session_id: str, session: Dict, answer: str, token: str, response: Response, round_trips: List[int]):
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
     
+    current_index = session["current_question_index"]
+    current_question = session["questions"][current_index]
     next_index = current_index + 1
+    answered = {"$unset": {f"questions.{current_index}.claim": ""}}
+    
+    deferred = session.get("grading_mode") == "deferred"
     
     if next_index >= 6:  # All questions completed
-        # Calculate final score with new scoring system (out of 20)
-        session = await database.sessions.find_one({"_id": ObjectId(session_id)})
-        total_score = sum(q.get("score") or 0 for q in session["questions"] if q.get("score") is not None)
-        
-        # Get candidate info
-        candidate = await database.candidates.find_one({"_id": ObjectId(session["candidate_id"])})
-        
-        summary = await groq_service.generate_candidate_summary(
-            candidate["name"],
-            session["questions"],
-            total_score
-        )
+        # Deferred sessions are graded along with the summary, in the background
+        evaluation = None
+        if not deferred:
+            evaluation = await _timed("evaluate", timings, _evaluate(session_id, current_index, current_question, answer))
         
-        # Update session completion
-        await database.sessions.update_one(
-            {"_id": ObjectId(session_id)},
+        # Record the last answer and close the session in one write, getting every score back
+        session = await session_cache.transition_session(
+            database, session_id,
+            _claimed(current_index, token),
             {
                 "$set": {
+                    **_answer_fields(current_index, answer, evaluation),
                     "is_completed": True,
                     "end_time": datetime.utcnow()
-                }
+                },
+                **answered
             }
         )
+        if session is None:
+            # Our claim lapsed and another submission took over
+            return await _await_answer(database, session_id, current_index)
         
-        # Update candidate
-        await database.candidates.update_one(
-            {"_id": ObjectId(session["candidate_id"])},
-            {
-                "$set": {
-                    "status": "completed",
-                    "final_score": total_score,
-                    "summary": summary
-                }
-            }
-        )
+        # Calculate final score with new scoring system (out of 20)
+        total_score = None
+        candidate_update = {"status": "scoring"}
+        if not deferred:
+            total_score = sum(q.get("score") or 0 for q in session["questions"] if q.get("score") is not None)
+            candidate_update["final_score"] = total_score
+        
+        # The summary arrives over the session and dashboard sockets once the job is done
+        await session_cache.update_candidate(database, session["candidate_id"], {"$set": candidate_update})
+        await _queue_summary(database, session_id, session["candidate_id"])
+        
+        _finish_timing(response, timings, started, round_trips)
         
         return {
             "completed": True,
             "final_score": total_score,
-            "summary": summary,
+            "summary": None,
+            "summary_pending": True,
             "evaluation": evaluation
         }
     
-    # Generate next question
-    difficulty_map = {0: "easy", 1: "easy", 2: "medium", 3: "medium", 4: "hard", 5: "hard"}
-    next_difficulty = difficulty_map[next_index]
-    
-    # Get previously asked questions to avoid repetition
-    previous_questions = [q["text"] for q in session["questions"]]
+    if deferred:
+        # Nothing to evaluate until the end, just line up the next question
+        evaluation = None
+        try:
+            next_question = await _timed("next_question", timings, _prepare_next_question(database, session_id, session, next_index))
+        except Exception as e:
+            next_question = e
+    else:
+        # The next question doesn't depend on the score, so fetch and push it while the answer is being evaluated
+        evaluation, next_question = await asyncio.gather(
+            _timed("evaluate", timings, _evaluate(session_id, current_index, current_question, answer)),
+            _timed("next_question", timings, _prepare_next_question(database, session_id, session, next_index)),
+            return_exceptions=True
+        )
+        
+        if isinstance(evaluation, Exception):
+            # Nothing was recorded for this answer, and a next question already pushed is reused on resubmit
+            print(f"Error evaluating answer: {evaluation}")
+            raise HTTPException(status_code=502, detail="Failed to evaluate answer, please resubmit")
     
-    next_question_data = await groq_service.generate_interview_question(
-        next_difficulty, 
-        "fullstack",
-        previous_questions
-    )
+    update = _answer_fields(current_index, answer, evaluation)
+    if isinstance(next_question, Exception):
+        # Keep the answer, resubmitting completes the transition through the already-answered path
+        print(f"Error preparing next question: {next_question}")
+        await session_cache.transition_session(
+            database, session_id, _claimed(current_index, token), {"$set": update, **answered}
+        )
+        raise HTTPException(status_code=503, detail="Failed to prepare next question, please resubmit")
     
-    next_question = Question(
-        id=str(uuid.uuid4()),
-        text=next_question_data["question"],
-        difficulty=next_difficulty,
-        time_limit=next_question_data["time_limit"],
-        expected_topics=next_question_data["expected_topics"],
-        hints=next_question_data["hints"],
-        start_time=datetime.utcnow()
+    # Record the answer and advance in one write, as long as our claim still stands
+    advanced = await session_cache.transition_session(
+        database, session_id,
+        _claimed(current_index, token),
+        {"$set": {**update, **_advance_fields(next_question, next_index)}, **answered}
     )
+    if advanced is None:
+        # Our claim lapsed and another submission took over
+        return await _await_answer(database, session_id, current_index)
     
-    # Add next question and update index
-    await database.sessions.update_one(
-        {"_id": ObjectId(session_id)},
-        {
-            "$push": {"questions": next_question.dict()},
-            "$set": {"current_question_index": next_index}
-        }
-    )
+    _finish_timing(response, timings, started, round_trips)
     
     return {
         "evaluation": evaluation,
-        "next_question": next_question.dict(),
+        "next_question": _public_question(next_question),
         "question_number": next_index + 1
-    }
\ No newline at end of file
+    }
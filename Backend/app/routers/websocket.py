@@ -1,47 +1,193 @@
 # backend/app/routers/websocket.py
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from typing import Dict
+from collections import OrderedDict, defaultdict
+from itertools import count
+from typing import Dict, Optional, Set
+import asyncio
 import json
 
+from app.config import settings
+from app.services.broker import InProcessBroker, create_broker
+
 router = APIRouter()
 
+DASHBOARD_TOPIC = "dashboard"
+
+
+def session_topic(session_id: str) -> str:
+    return f"session:{session_id}"
+
+
+class Connection:
+    """A socket with a bounded outbound queue drained by its own writer task"""
+
+    _ids = count()
+
+    def __init__(self, websocket: WebSocket, max_queue: int):
+        self.websocket = websocket
+        self.max_queue = max_queue
+        self.topics: Set[str] = set()
+        self.dropped = 0
+
+        # Pending frames by key; frames sharing a coalesce key replace each other in place
+        self._pending: "OrderedDict[str, str]" = OrderedDict()
+        self._wakeup = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._writer = asyncio.create_task(self._write_loop())
+
+    def stop(self):
+        if self._writer:
+            self._writer.cancel()
+
+    def enqueue(self, text: str, coalesce_key: Optional[str] = None) -> bool:
+        """Queue an already serialized frame without waiting; returns False if an older frame was dropped"""
+        if coalesce_key and coalesce_key in self._pending:
+            self._pending[coalesce_key] = text
+            return True
+
+        dropped = False
+        if len(self._pending) >= self.max_queue:
+            # Slow client: shed the oldest frame rather than stall the publisher
+            self._pending.popitem(last=False)
+            self.dropped += 1
+            dropped = True
+
+        self._pending[coalesce_key or f"#{next(self._ids)}"] = text
+        self._wakeup.set()
+        return not dropped
+
+    async def _write_loop(self):
+        try:
+            while True:
+                while not self._pending:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                _, text = self._pending.popitem(last=False)
+                await self.websocket.send_text(text)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Socket is gone, the endpoint's receive loop cleans up
+            self._pending.clear()
+
+
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: Dict[str, WebSocket] = {}
-    
-    async def connect(self, websocket: WebSocket, session_id: str):
+    def __init__(self, broker=None):
+        self.topics: Dict[str, Set[Connection]] = defaultdict(set)
+        self.stats = {"published": 0, "delivered": 0, "dropped": 0}
+        self.use_broker(broker or InProcessBroker())
+
+    def use_broker(self, broker):
+        self.broker = broker
+        self.broker.bind(self._deliver)
+
+    async def start(self):
+        """Swap in the broker selected by settings; the in-process default needs no startup"""
+        if settings.WS_BROKER != "memory":
+            self.use_broker(create_broker())
+        await self.broker.start()
+
+    async def stop(self):
+        await self.broker.stop()
+
+    async def connect(self, websocket: WebSocket, *topics: str) -> Connection:
         await websocket.accept()
-        self.active_connections[session_id] = websocket
-    
-    def disconnect(self, session_id: str):
-        if session_id in self.active_connections:
-            del self.active_connections[session_id]
-    
+        connection = Connection(websocket, settings.WS_SEND_QUEUE_SIZE)
+        for topic in topics:
+            self.subscribe(connection, topic)
+        connection.start()
+        return connection
+
+    def disconnect(self, connection: Connection):
+        for topic in list(connection.topics):
+            self.unsubscribe(connection, topic)
+        connection.stop()
+
+    def subscribe(self, connection: Connection, topic: str):
+        self.topics[topic].add(connection)
+        connection.topics.add(topic)
+
+    def unsubscribe(self, connection: Connection, topic: str):
+        subscribers = self.topics.get(topic)
+        if subscribers is not None:
+            subscribers.discard(connection)
+            if not subscribers:
+                del self.topics[topic]
+        connection.topics.discard(topic)
+
+    def publish(self, topic: str, message: dict, coalesce_key: Optional[str] = None):
+        """Serialize once and hand to the broker, which delivers to subscribers on every worker"""
+        self.stats["published"] += 1
+        # Skip serializing when nobody anywhere can be listening
+        if self.broker.local and not self.topics.get(topic):
+            return
+        self.broker.publish(topic, json.dumps(message, default=str), coalesce_key)
+
+    def _deliver(self, topic: str, text: str, coalesce_key: Optional[str] = None):
+        """Queue a serialized frame for this process's subscribers of the topic"""
+        subscribers = self.topics.get(topic)
+        if not subscribers:
+            return
+        for connection in subscribers:
+            if not connection.enqueue(text, coalesce_key):
+                self.stats["dropped"] += 1
+        self.stats["delivered"] += len(subscribers)
+
+    def is_connected(self, session_id: str) -> bool:
+        # With a shared broker the candidate's socket may live on another worker
+        return not self.broker.local or bool(self.topics.get(session_topic(session_id)))
+
     async def send_message(self, message: dict, session_id: str):
-        if session_id in self.active_connections:
-            await self.active_connections[session_id].send_json(message)
-    
-    async def broadcast(self, message: dict):
-        for connection in self.active_connections.values():
-            await connection.send_json(message)
+        self.publish(session_topic(session_id), message)
+
+    def snapshot(self) -> Dict[str, int]:
+        connections = {c for subscribers in self.topics.values() for c in subscribers}
+        return {
+            **self.stats,
+            "connections": len(connections),
+            "topics": len(self.topics),
+            "broker": self.broker.stats()
+        }
 
 manager = ConnectionManager()
 
+@router.websocket("/ws/dashboard")
+async def dashboard_websocket(websocket: WebSocket):
+    """Recruiter dashboards: every candidate update, plus live frames of sessions they subscribe to"""
+    connection = await manager.connect(websocket, DASHBOARD_TOPIC)
+    try:
+        while True:
+            data = await websocket.receive_json()
+
+            if data.get("type") == "subscribe" and data.get("session_id"):
+                manager.subscribe(connection, session_topic(data["session_id"]))
+            elif data.get("type") == "unsubscribe" and data.get("session_id"):
+                manager.unsubscribe(connection, session_topic(data["session_id"]))
+
+    except WebSocketDisconnect:
+        pass
+    finally:
+        manager.disconnect(connection)
+
 @router.websocket("/ws/{session_id}")
 async def websocket_endpoint(websocket: WebSocket, session_id: str):
-    await manager.connect(websocket, session_id)
+    connection = await manager.connect(websocket, session_topic(session_id))
     try:
         while True:
             data = await websocket.receive_json()
-            
+
             # Handle different message types
             if data["type"] == "answer_update":
-                # Broadcast to dashboard
-                await manager.broadcast({
+                # Only the latest draft per session matters to the dashboard
+                manager.publish(DASHBOARD_TOPIC, {
                     "type": "candidate_update",
                     "session_id": session_id,
                     "data": data["data"]
-                })
-            
+                }, coalesce_key=f"candidate_update:{session_id}")
+
     except WebSocketDisconnect:
-        manager.disconnect(session_id)
\ No newline at end of file
+        pass
+    finally:
+        manager.disconnect(connection)
@@ -0,0 +1,146 @@
+# backend/app/services/broker.py
+import asyncio
+import json
+from typing import Callable, List, Optional
+
+from app.config import settings
+
+# Called with (topic, serialized message, coalesce key) for every message to deliver locally
+DeliverCallback = Callable[[str, str, Optional[str]], None]
+
+
+class InProcessBroker:
+    """Delivers messages only to sockets connected to this process"""
+
+    local = True
+
+    def __init__(self):
+        self._deliver: Optional[DeliverCallback] = None
+
+    def bind(self, deliver: DeliverCallback):
+        self._deliver = deliver
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    def publish(self, topic: str, text: str, coalesce_key: Optional[str] = None):
+        self._deliver(topic, text, coalesce_key)
+
+    def stats(self) -> dict:
+        return {"backend": "memory"}
+
+
+class RedisBroker:
+    """Fans messages out to every worker through one Redis pub/sub channel, batching publishes
+
+    Messages published within batch_interval of each other go out as a single
+    PUBLISH. Every worker, including the publisher, receives the batch and
+    delivers each message to its own subscribers. If the subscription drops,
+    the reader resubscribes with backoff until Redis is back.
+    """
+
+    local = False
+
+    def __init__(self, client, channel: str = "ws-fanout", batch_interval: float = 0.005, max_batch: int = 200, max_reconnect_delay: float = 30.0):
+        self.client = client
+        self.channel = channel
+        self.batch_interval = batch_interval
+        self.max_batch = max_batch
+        self.max_reconnect_delay = max_reconnect_delay
+
+        self._deliver: Optional[DeliverCallback] = None
+        self._buffer: List[list] = []
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self.counters = {"batches": 0, "published": 0, "received": 0, "errors": 0, "resubscribes": 0}
+
+    def bind(self, deliver: DeliverCallback):
+        self._deliver = deliver
+
+    async def start(self):
+        self._pubsub = self.client.pubsub()
+        await self._pubsub.subscribe(self.channel)
+        self._tasks = [asyncio.create_task(self._flush_loop()), asyncio.create_task(self._read_loop())]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self._flush()
+        await self._pubsub.unsubscribe(self.channel)
+        await self._pubsub.aclose()
+        await self.client.aclose()
+
+    def publish(self, topic: str, text: str, coalesce_key: Optional[str] = None):
+        self._buffer.append([topic, coalesce_key, text])
+        self._wakeup.set()
+
+    def stats(self) -> dict:
+        return {"backend": "redis", "buffered": len(self._buffer), **self.counters}
+
+    async def _flush_loop(self):
+        while True:
+            await self._wakeup.wait()
+            # Give concurrent publishers a moment to join the batch
+            await asyncio.sleep(self.batch_interval)
+            self._wakeup.clear()
+            while self._buffer:
+                await self._flush()
+
+    async def _flush(self):
+        batch, self._buffer = self._buffer[:self.max_batch], self._buffer[self.max_batch:]
+        if not batch:
+            return
+        try:
+            await self.client.publish(self.channel, json.dumps(batch))
+            self.counters["batches"] += 1
+            self.counters["published"] += len(batch)
+        except Exception as e:
+            # Pub/sub is at-most-once anyway, don't let a Redis blip back up the buffer
+            self.counters["errors"] += 1
+            print(f"Error publishing websocket batch to Redis: {e}")
+
+    async def _read_loop(self):
+        delay = 0.0
+        while True:
+            try:
+                if delay:
+                    await asyncio.sleep(delay)
+                    # Failing again here backs off further instead of ending the reader
+                    await self._pubsub.subscribe(self.channel)
+                    self.counters["resubscribes"] += 1
+                while self._pubsub.subscribed:
+                    # Polling rather than listen() so a silently dropped connection is noticed on the next read
+                    message = await self._pubsub.get_message(timeout=1.0)
+                    delay = 0.0
+                    if message is None or message["type"] != "message":
+                        continue
+                    for topic, coalesce_key, text in json.loads(message["data"]):
+                        self.counters["received"] += 1
+                        self._deliver(topic, text, coalesce_key)
+                raise ConnectionError("Redis pub/sub subscription ended")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.counters["errors"] += 1
+                delay = min(self.max_reconnect_delay, delay * 2 or 0.5)
+                print(f"Error reading websocket batches from Redis, resubscribing in {delay}s: {e}")
+
+
+def create_broker():
+    """Broker selected by WS_BROKER, "memory" (default) or "redis\""""
+    if settings.WS_BROKER == "redis":
+        import redis.asyncio as redis
+
+        if not settings.REDIS_URL:
+            raise RuntimeError("WS_BROKER=redis requires REDIS_URL")
+        return RedisBroker(
+            redis.from_url(settings.REDIS_URL),
+            channel=settings.WS_BROKER_CHANNEL,
+            batch_interval=settings.WS_BROKER_BATCH_INTERVAL
+        )
+    return InProcessBroker()
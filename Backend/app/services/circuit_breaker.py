@@ -0,0 +1,173 @@
+# backend/app/services/circuit_breaker.py
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, Optional
+
+from app.config import settings
+from app.services import metrics
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a service whose circuit is open"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} circuit is open, retry in {retry_after:.1f}s")
+        self.name = name
+        # Picked up by JobQueue to defer the job rather than spend an attempt on it
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Stops calling a service once too many recent calls failed or ran slow, probing it again after a pause
+
+    Calls are judged over a sliding time window. Once it holds at least
+    min_calls and the failure or slow-call rate reaches its threshold, the
+    circuit opens and calls fail fast with CircuitOpenError. After
+    open_seconds a few probe calls are let through (half-open): enough
+    successes close the circuit, any failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        slow_call_seconds: float,
+        is_failure: Callable[[Exception], bool] = lambda e: True,
+        window_seconds: Optional[float] = None,
+        min_calls: Optional[int] = None,
+        error_rate: Optional[float] = None,
+        slow_call_rate: Optional[float] = None,
+        open_seconds: Optional[float] = None,
+        half_open_probes: Optional[int] = None
+    ):
+        self.name = name
+        self.slow_call_seconds = slow_call_seconds
+        self.is_failure = is_failure
+        self.window_seconds = window_seconds or settings.BREAKER_WINDOW_SECONDS
+        self.min_calls = min_calls or settings.BREAKER_MIN_CALLS
+        self.error_rate = error_rate or settings.BREAKER_ERROR_RATE
+        self.slow_call_rate = slow_call_rate or settings.BREAKER_SLOW_CALL_RATE
+        self.open_seconds = open_seconds or settings.BREAKER_OPEN_SECONDS
+        self.half_open_probes = half_open_probes or settings.BREAKER_HALF_OPEN_PROBES
+
+        self.state = CLOSED
+        self._opened_at = 0.0
+        # (finished at, failed, slow) per call
+        self._calls: "deque[tuple]" = deque()
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self.stats = {"calls": 0, "failures": 0, "slow": 0, "rejected": 0, "opened": 0}
+        metrics.circuit_state.labels(name).set(_STATE_VALUES[CLOSED])
+
+    @asynccontextmanager
+    async def call(self):
+        """Guard one call to the service, raising CircuitOpenError instead of making it while open"""
+        probe = self._admit()
+        started = time.monotonic()
+        try:
+            yield
+        except asyncio.CancelledError:
+            # Abandoned by the caller; only its slowness says anything about the service
+            duration = time.monotonic() - started
+            self._finish(probe, None if duration < self.slow_call_seconds else True, duration)
+            raise
+        except Exception as e:
+            self._finish(probe, not self.is_failure(e), time.monotonic() - started)
+            raise
+        else:
+            self._finish(probe, True, time.monotonic() - started)
+
+    def check(self):
+        """Raise CircuitOpenError now if a call would be refused, e.g. before queueing to make it"""
+        if self.retry_after() > 0:
+            self.stats["rejected"] += 1
+            raise CircuitOpenError(self.name, self.retry_after())
+
+    def retry_after(self) -> float:
+        """Seconds until an open circuit lets probes through, 0 if calls may go ahead"""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.open_seconds - time.monotonic())
+
+    def snapshot(self) -> Dict:
+        self._prune(time.monotonic())
+        calls = len(self._calls)
+        return {
+            "state": self.state,
+            "retry_after": round(self.retry_after(), 1),
+            "window_calls": calls,
+            "window_error_rate": sum(1 for _, failed, _ in self._calls if failed) / calls if calls else 0.0,
+            "window_slow_rate": sum(1 for _, _, slow in self._calls if slow) / calls if calls else 0.0,
+            **self.stats
+        }
+
+    def _admit(self) -> bool:
+        """Let a call through or raise; True if it goes through as a half-open probe"""
+        if self.state == OPEN:
+            if self.retry_after() > 0:
+                self.stats["rejected"] += 1
+                raise CircuitOpenError(self.name, self.retry_after())
+            self._transition(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            if self._probes_in_flight >= self.half_open_probes:
+                self.stats["rejected"] += 1
+                # Probes are still out, check back shortly
+                raise CircuitOpenError(self.name, 1.0)
+            self._probes_in_flight += 1
+            return True
+        return False
+
+    def _finish(self, probe: bool, ok: Optional[bool], duration: float):
+        """Record a call's outcome; ok is None when the call was abandoned before it said anything"""
+        if probe:
+            self._probes_in_flight -= 1
+        if ok is None:
+            return
+
+        now = time.monotonic()
+        slow = duration >= self.slow_call_seconds
+        self.stats["calls"] += 1
+        self.stats["failures"] += not ok
+        self.stats["slow"] += slow
+
+        if self.state == HALF_OPEN:
+            if not ok or slow:
+                self._open(now)
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_probes:
+                self._calls.clear()
+                self._transition(CLOSED)
+            return
+        if self.state == OPEN:
+            # Finished after the circuit opened under it
+            return
+
+        self._calls.append((now, not ok, slow))
+        self._prune(now)
+        calls = len(self._calls)
+        if calls < self.min_calls:
+            return
+        failures = sum(1 for _, failed, _ in self._calls if failed)
+        slow_calls = sum(1 for _, _, was_slow in self._calls if was_slow)
+        if failures / calls >= self.error_rate or slow_calls / calls >= self.slow_call_rate:
+            self._open(now)
+
+    def _open(self, now: float):
+        self._opened_at = now
+        self.stats["opened"] += 1
+        self._transition(OPEN)
+        print(f"{self.name} circuit opened for {self.open_seconds}s")
+
+    def _transition(self, state: str):
+        self.state = state
+        self._probe_successes = 0
+        metrics.circuit_state.labels(self.name).set(_STATE_VALUES[state])
+
+    def _prune(self, now: float):
+        while self._calls and self._calls[0][0] < now - self.window_seconds:
+            self._calls.popleft()
@@ -2,9 +2,11 @@
 import cloudinary
 import cloudinary.uploader
 from app.config import settings
-from typing import Dict
+from typing import Dict, BinaryIO, Optional, Union
 import io
 import time
+import asyncio
+from app.services.circuit_breaker import CircuitBreaker
 
 # Configure Cloudinary
 cloudinary.config(
@@ -14,26 +16,40 @@ cloudinary.config(
 )
 
 class CloudinaryService:
-    @staticmethod
-    async def upload_resume(file_content: bytes, filename: str) -> Dict[str, str]:
-        """Upload resume to Cloudinary and return URL"""
-        try:
-            # Convert bytes to file-like object
-            file_stream = io.BytesIO(file_content)
-            
-            # Upload to Cloudinary
-            result = cloudinary.uploader.upload(
-                file_stream,
-                resource_type="raw",
-                folder="resumes",
-                public_id=f"{filename.split('.')[0]}_{int(time.time())}",
-                allowed_formats=["pdf", "docx"]
-            )
-            
-            return {
-                "url": result["secure_url"],
-                "public_id": result["public_id"]
-            }
-        except Exception as e:
-            print(f"Cloudinary upload error: {e}")
-            raise Exception(f"Failed to upload resume: {str(e)}")
\ No newline at end of file
+    def __init__(self):
+        self.breaker = CircuitBreaker("cloudinary", slow_call_seconds=settings.CLOUDINARY_SLOW_CALL_SECONDS)
+    
+    async def upload_resume(self, file_content: Union[bytes, str, BinaryIO], filename: str, upload_id: Optional[str] = None) -> Dict[str, str]:
+        """Upload resume to Cloudinary and return URL
+
+        Accepts raw bytes, a path on disk or an open binary file. Files larger
+        than CLOUDINARY_CHUNK_SIZE are sent in chunks. Given an upload id, the
+        public id is derived from it so a retry replaces the same asset.
+        Raises CircuitOpenError without trying while Cloudinary is failing.
+        """
+        suffix = upload_id or int(time.time())
+        # Checked before taking a thread, so an outage can't tie up the pool
+        async with self.breaker.call():
+            try:
+                # Convert bytes to file-like object
+                file_stream = io.BytesIO(file_content) if isinstance(file_content, bytes) else file_content
+                
+                # Upload to Cloudinary, the SDK is blocking so keep it off the event loop
+                result = await asyncio.to_thread(
+                    cloudinary.uploader.upload_large,
+                    file_stream,
+                    resource_type="raw",
+                    folder="resumes",
+                    public_id=f"{filename.split('.')[0]}_{suffix}",
+                    overwrite=True,
+                    allowed_formats=["pdf", "docx"],
+                    chunk_size=settings.CLOUDINARY_CHUNK_SIZE
+                )
+                
+                return {
+                    "url": result["secure_url"],
+                    "public_id": result["public_id"]
+                }
+            except Exception as e:
+                print(f"Cloudinary upload error: {e}")
+                raise Exception(f"Failed to upload resume: {str(e)}")
\ No newline at end of file
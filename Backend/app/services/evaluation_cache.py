@@ -0,0 +1,157 @@
+# backend/app/services/evaluation_cache.py
+import copy
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional
+
+from app.config import settings
+from app.database.connection import get_db
+
+
+# Settings document holding a rubric version set through the invalidate endpoint, shared by every worker
+RUBRIC_SETTING = "evaluation_rubric"
+
+
+class EvaluationCache:
+    """Graded answers cached in an in-process LRU in front of a MongoDB collection with a TTL index
+
+    The rubric version is part of every key. It comes from EVAL_RUBRIC_VERSION
+    unless invalidate() stored another one in MongoDB, which every worker
+    re-reads every EVAL_RUBRIC_REFRESH_SECONDS. A stored version only holds
+    until EVAL_RUBRIC_VERSION itself changes.
+    """
+
+    def __init__(self):
+        self.max_size = settings.EVAL_CACHE_SIZE
+        self.max_answer_length = settings.EVAL_CACHE_MAX_ANSWER_LENGTH
+        self.ttl_seconds = settings.EVAL_CACHE_TTL_SECONDS
+        self.rubric_version = settings.EVAL_RUBRIC_VERSION
+        self.refresh_seconds = settings.EVAL_RUBRIC_REFRESH_SECONDS
+        self._version_read_at: Optional[float] = None
+
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self.stats = {"memory_hits": 0, "mongo_hits": 0, "misses": 0}
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Lowercase, collapse whitespace and drop surrounding punctuation"""
+        text = re.sub(r"\s+", " ", text.strip().lower())
+        return text.strip(" .,;:!?\"'`")
+
+    def key(self, question: str, answer: str, difficulty: str, rubric_version: str) -> str:
+        raw = "\x1f".join([self.normalize(question), self.normalize(answer), difficulty, rubric_version])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def current_version(self) -> str:
+        """The rubric version every worker grades under, re-read from MongoDB once it is refresh_seconds old"""
+        now = time.monotonic()
+        if self._version_read_at is not None and now - self._version_read_at < self.refresh_seconds:
+            return self.rubric_version
+
+        database = get_db()
+        if database is None:
+            return self.rubric_version
+        try:
+            doc = await database.app_settings.find_one({"_id": RUBRIC_SETTING})
+        except Exception as e:
+            # Keep grading under the last version seen
+            print(f"Error reading rubric version: {e}")
+            return self.rubric_version
+        self._version_read_at = now
+
+        version = settings.EVAL_RUBRIC_VERSION
+        if doc and doc.get("configured_version") == settings.EVAL_RUBRIC_VERSION:
+            version = doc["version"]
+        if version != self.rubric_version:
+            self.rubric_version = version
+            self._entries.clear()
+        return version
+
+    def cacheable(self, answer: str) -> bool:
+        # Long free-form answers practically never repeat
+        return len(answer.strip()) <= self.max_answer_length
+
+    async def get(self, question: str, answer: str, difficulty: str) -> Optional[Dict]:
+        if not self.cacheable(answer):
+            return None
+        key = self.key(question, answer, difficulty, await self.current_version())
+
+        entry = self._entries.get(key)
+        if entry and (datetime.utcnow() - entry["created_at"]).total_seconds() < self.ttl_seconds:
+            self._entries.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            return copy.deepcopy(entry["evaluation"])
+
+        database = get_db()
+        if database is not None:
+            try:
+                doc = await database.evaluation_cache.find_one({"_id": key})
+            except Exception as e:
+                print(f"Error reading evaluation cache: {e}")
+                doc = None
+            if doc:
+                self._remember(key, doc["evaluation"], doc["created_at"])
+                self.stats["mongo_hits"] += 1
+                return copy.deepcopy(doc["evaluation"])
+
+        self.stats["misses"] += 1
+        return None
+
+    async def set(self, question: str, answer: str, difficulty: str, evaluation: Dict):
+        if not self.cacheable(answer):
+            return
+        rubric_version = await self.current_version()
+        key = self.key(question, answer, difficulty, rubric_version)
+        created_at = datetime.utcnow()
+        self._remember(key, copy.deepcopy(evaluation), created_at)
+
+        database = get_db()
+        if database is None:
+            return
+        try:
+            await database.evaluation_cache.replace_one(
+                {"_id": key},
+                {
+                    "rubric_version": rubric_version,
+                    "difficulty": difficulty,
+                    "evaluation": evaluation,
+                    "created_at": created_at
+                },
+                upsert=True
+            )
+        except Exception as e:
+            print(f"Error writing evaluation cache: {e}")
+
+    async def invalidate(self, rubric_version: Optional[str] = None) -> int:
+        """Switch every worker to a new rubric version (if given) and drop every entry graded under another one
+
+        Other workers pick the new version up within refresh_seconds.
+        """
+        database = get_db()
+        if database is None:
+            return 0
+        if rubric_version:
+            await database.app_settings.replace_one(
+                {"_id": RUBRIC_SETTING},
+                {"version": rubric_version, "configured_version": settings.EVAL_RUBRIC_VERSION, "updated_at": datetime.utcnow()},
+                upsert=True
+            )
+            self._version_read_at = None
+        self._entries.clear()
+
+        result = await database.evaluation_cache.delete_many({"rubric_version": {"$ne": await self.current_version()}})
+        return result.deleted_count
+
+    def hit_ratio(self) -> float:
+        hits = self.stats["memory_hits"] + self.stats["mongo_hits"]
+        total = hits + self.stats["misses"]
+        return hits / total if total else 0.0
+
+    def _remember(self, key: str, evaluation: Dict, created_at: datetime):
+        self._entries[key] = {"evaluation": evaluation, "created_at": created_at}
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
@@ -1,14 +1,119 @@
 # backend/app/services/groq_service.py
-from groq import Groq
+from groq import APIStatusError, AsyncGroq, DefaultAsyncHttpxClient, RateLimitError
 from app.config import settings
 import json
-from typing import List, Dict
+import re
+from typing import Any, List, Dict, Optional, Callable, Awaitable, Tuple
 import asyncio
+from collections import deque
+import time
+import httpx
+from contextlib import asynccontextmanager
+from app.services import metrics
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.services.rate_limit_scheduler import RateLimitScheduler, estimate_tokens
+from app.services.evaluation_cache import EvaluationCache
+from app.services.local_scorer import LocalScorer
+
+# Receives each chunk of text as it is streamed from the model; called with replace=True,
+# the text replaces everything sent so far, e.g. when a hedged call other than the one streaming wins
+DeltaCallback = Callable[..., Awaitable[None]]
+
+# One try at an operation on the given model, returning its parsed result or raising if unusable
+Attempt = Callable[[str, Optional[DeltaCallback]], Awaitable[Any]]
+
+
+class JsonFieldStreamer:
+    """Pulls the value of one string field out of a JSON object while it is still being streamed"""
+    
+    _escapes = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f"}
+    
+    def __init__(self, field: str):
+        self._pattern = re.compile(r'"%s"\s*:\s*"' % re.escape(field))
+        self._buffer = ""
+        self._pos: Optional[int] = None
+        self._done = False
+    
+    def feed(self, text: str) -> str:
+        """Add streamed text and return whatever new part of the field value it completed"""
+        self._buffer += text
+        if self._done:
+            return ""
+        if self._pos is None:
+            match = self._pattern.search(self._buffer)
+            if not match:
+                return ""
+            self._pos = match.end()
+        
+        buf = self._buffer
+        out = []
+        i = self._pos
+        while i < len(buf):
+            ch = buf[i]
+            if ch == '"':
+                self._done = True
+                break
+            if ch == "\\":
+                # Wait for the rest of a split escape sequence
+                if i + 1 >= len(buf):
+                    break
+                esc = buf[i + 1]
+                if esc == "u":
+                    if i + 6 > len(buf):
+                        break
+                    try:
+                        out.append(chr(int(buf[i + 2:i + 6], 16)))
+                    except ValueError:
+                        out.append(buf[i:i + 6])
+                    i += 6
+                    continue
+                out.append(self._escapes.get(esc, esc))
+                i += 2
+                continue
+            out.append(ch)
+            i += 1
+        self._pos = i
+        return "".join(out)
+
+
+def _counts_against_groq(error: Exception) -> bool:
+    """Our own malformed requests say nothing about Groq's health"""
+    return not (isinstance(error, APIStatusError) and error.status_code < 500 and error.status_code != 429)
+
 
 class GroqService:
     def __init__(self):
-        self.client = Groq(api_key=settings.GROQ_API_KEY)
+        # One keep-alive connection pool shared by every completion
+        self.client = AsyncGroq(
+            api_key=settings.GROQ_API_KEY,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=settings.GROQ_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.GROQ_MAX_KEEPALIVE_CONNECTIONS
+                )
+            )
+        )
         self.model = "llama-3.3-70b-versatile"
+        self.fallback_model = settings.GROQ_FALLBACK_MODEL
+        # One circuit per model, so a struggling primary falls straight through to the fallback model
+        self.breakers = {
+            model: CircuitBreaker(f"groq:{model}", settings.GROQ_SLOW_CALL_SECONDS, is_failure=_counts_against_groq)
+            for model in filter(None, {self.model, self.fallback_model})
+        }
+        # Groq's limits are per model too
+        self.schedulers = {model: RateLimitScheduler(f"groq:{model}") for model in self.breakers}
+        # Recent primary-model latencies per operation, to hedge at their p95
+        self.latencies: Dict[str, deque] = {}
+        self.tier_stats: Dict[str, Dict[str, int]] = {}
+        
+        # Bounds in-flight completions, the rest wait here instead of in a thread pool
+        self._semaphore = asyncio.Semaphore(settings.GROQ_MAX_CONCURRENCY)
+        self.queue_depth = 0
+        self.in_flight = 0
+        
+        self.evaluation_cache = EvaluationCache()
+        self.local_scorer = LocalScorer()
+        self.local_stats = {"trusted": 0, "escalated": 0}
         
         # Scoring configuration
         self.max_scores = {
@@ -17,7 +122,206 @@ class GroqService:
             "hard": 5
         }
     
+    async def aclose(self):
+        await self.client.close()
+    
+    def stats(self) -> Dict:
+        return {
+            "queue_depth": self.queue_depth,
+            "in_flight": self.in_flight,
+            "max_concurrency": settings.GROQ_MAX_CONCURRENCY,
+            "hedge_after": {operation: self._hedge_after(operation) for operation in settings.GROQ_HEDGE_AFTER},
+            "tiers": self.tier_stats,
+            "rate_limits": {model: scheduler.snapshot() for model, scheduler in self.schedulers.items()}
+        }
+    
+    @asynccontextmanager
+    async def _slot(self, operation: str, difficulty: str, model: str):
+        """Wait for a free concurrency slot, timing the wait and the call made while holding it"""
+        queued_at = time.perf_counter()
+        self.queue_depth += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queue_depth -= 1
+        metrics.llm_queue_wait_seconds.labels(operation, difficulty).observe(time.perf_counter() - queued_at)
+        
+        self.in_flight += 1
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            yield
+            outcome = "ok"
+        except asyncio.CancelledError:
+            # Lost a hedged race
+            outcome = "cancelled"
+            raise
+        finally:
+            metrics.llm_call_seconds.labels(operation, difficulty, model, outcome).observe(time.perf_counter() - started)
+            self.in_flight -= 1
+            self._semaphore.release()
+    
+    async def _create(self, model: str, **kwargs) -> Tuple[Any, bool]:
+        """Send the completion request, keeping the model's scheduler in step with Groq's rate-limit headers
+        
+        Returns the parsed response and whether the headers set the scheduler's token level.
+        """
+        scheduler = self.schedulers[model]
+        try:
+            raw = await self.client.chat.completions.with_raw_response.create(model=model, **kwargs)
+        except RateLimitError as e:
+            retry_after = e.response.headers.get("retry-after")
+            scheduler.pause(float(retry_after) if retry_after and retry_after.replace(".", "", 1).isdigit() else 1.0)
+            raise
+        synced = scheduler.observe_headers(raw.headers)
+        return await raw.parse(), synced
+    
+    async def _complete(self, operation: str, difficulty: str, model: str, **kwargs):
+        """Run a chat completion once quota at the current priority and a concurrency slot are free"""
+        breaker = self.breakers[model]
+        # Don't queue for quota or a slot just to be refused
+        breaker.check()
+        estimate = estimate_tokens(kwargs["messages"], kwargs.get("max_tokens"))
+        await self.schedulers[model].acquire(estimate)
+        async with self._slot(operation, difficulty, model), breaker.call():
+            completion, synced = await self._create(model, **kwargs)
+        metrics.record_usage(operation, difficulty, completion.usage)
+        if not synced:
+            self.schedulers[model].settle(estimate, completion.usage.total_tokens if completion.usage else None)
+        return completion
+    
+    async def _stream(self, operation: str, difficulty: str, on_delta: DeltaCallback, model: str, **kwargs) -> str:
+        """Stream a chat completion, passing each chunk to on_delta, and return the full text"""
+        breaker = self.breakers[model]
+        breaker.check()
+        estimate = estimate_tokens(kwargs["messages"], kwargs.get("max_tokens"))
+        await self.schedulers[model].acquire(estimate)
+        async with self._slot(operation, difficulty, model), breaker.call():
+            stream, synced = await self._create(model, stream=True, **kwargs)
+            parts = []
+            # Closed however the read ends, so a hedge that loses the race doesn't leave its response open
+            async with stream:
+                async for chunk in stream:
+                    # Groq reports usage on the last chunk
+                    if chunk.x_groq is not None and chunk.x_groq.usage is not None:
+                        metrics.record_usage(operation, difficulty, chunk.x_groq.usage)
+                        if not synced:
+                            self.schedulers[model].settle(estimate, chunk.x_groq.usage.total_tokens)
+                    if not chunk.choices or not chunk.choices[0].delta.content:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    parts.append(delta)
+                    await on_delta(delta)
+            return "".join(parts)
     
+    def _hedge_after(self, operation: str) -> float:
+        """Seconds to give the primary model: the operation's budget, or its recent p95 if that is lower"""
+        budget = settings.GROQ_HEDGE_AFTER.get(operation, 5.0)
+        samples = self.latencies.get(operation)
+        if not samples or len(samples) < 20:
+            return budget
+        ordered = sorted(samples)
+        return min(budget, ordered[int(0.95 * (len(ordered) - 1))])
+    
+    def _record_tier(self, operation: str, tier: str):
+        counts = self.tier_stats.setdefault(operation, {})
+        counts[tier] = counts.get(tier, 0) + 1
+        metrics.llm_tiers.labels(operation, tier).inc()
+    
+    async def _hedged(
+        self,
+        operation: str,
+        attempt: Attempt,
+        tried: List[str],
+        on_delta: Optional[DeltaCallback] = None
+    ) -> Tuple[Any, str]:
+        """Run attempt on the primary model, racing the fallback model against it once it passes its budget
+        
+        The first usable result wins and the other call is cancelled. tried
+        collects the tiers launched. Raises the last error if every tier
+        failed, or TimeoutError past the operation's deadline, for the caller
+        to fall back locally. Only one tier streams to on_delta; if another
+        wins, its text replaces what was streamed, and if none does the
+        streamed text is cleared.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.GROQ_DEADLINE.get(operation, 30.0)
+        hedge_at = loop.time() + self._hedge_after(operation)
+        tiers = [("primary", self.model)]
+        if self.fallback_model and self.fallback_model != self.model:
+            tiers.append(("fallback_model", self.fallback_model))
+        
+        # Only the first tier to stream may write to on_delta, so racing streams don't interleave
+        streaming: List[str] = []
+        # Every tier's text so far, to replace the streamed text if another tier wins
+        texts: Dict[str, List[str]] = {}
+        
+        def forward_for(tier: str) -> Optional[DeltaCallback]:
+            if on_delta is None:
+                return None
+            
+            async def forward(delta: str):
+                texts.setdefault(tier, []).append(delta)
+                if not streaming:
+                    streaming.append(tier)
+                if streaming[0] == tier:
+                    await on_delta(delta)
+            
+            return forward
+        
+        running: Dict[asyncio.Task, str] = {}
+        
+        def launch():
+            tier, model = tiers[len(tried)]
+            tried.append(tier)
+            task = asyncio.create_task(attempt(model, forward_for(tier)))
+            running[task] = tier
+            if tier == "primary":
+                started = loop.time()
+                samples = self.latencies.setdefault(operation, deque(maxlen=200))
+                
+                def record(done: asyncio.Task):
+                    # A primary cancelled by a faster hedge took at least this long
+                    if done.cancelled() or done.exception() is None:
+                        samples.append(loop.time() - started)
+                
+                task.add_done_callback(record)
+        
+        launch()
+        error: Optional[BaseException] = None
+        try:
+            while running or len(tried) < len(tiers):
+                if not running:
+                    # Everything launched so far failed, hedge right away
+                    launch()
+                now = loop.time()
+                if now >= deadline:
+                    raise TimeoutError(f"{operation} took longer than {settings.GROQ_DEADLINE.get(operation, 30.0)}s")
+                timeout = deadline - now
+                if len(tried) < len(tiers):
+                    timeout = min(timeout, max(0.0, hedge_at - now))
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    tier = running.pop(task)
+                    if task.exception() is None:
+                        self._record_tier(operation, tier)
+                        if streaming and streaming[0] != tier:
+                            await on_delta("".join(texts.get(tier, [])), replace=True)
+                        return task.result(), tier
+                    error = task.exception()
+                    if not isinstance(error, CircuitOpenError):
+                        print(f"Error from {tier} model during {operation}: {error}")
+                if running and len(tried) < len(tiers) and loop.time() >= hedge_at:
+                    launch()
+            raise error
+        except Exception:
+            if streaming:
+                # Whatever the caller falls back to, it isn't the partial text the socket was shown
+                await on_delta("", replace=True)
+            raise
+        finally:
+            for task in running:
+                task.cancel()
     
     async def generate_interview_question(
         self, 
@@ -31,7 +335,9 @@ class GroqService:
             difficulty_prompt = """EASY LEVEL:
 - Ask direct factual questions with answers in ONE WORD or SHORT PHRASE (max 5–10 words).
 - Must be answerable within 20 seconds.
-- Examples: "What hook manages state in React?", "Which method sends POST requests in Express?", "What command installs npm packages?"."""
+- Examples: "What hook manages state in React?", "Which method sends POST requests in Express?", "What command installs npm packages?".
+- Also list every short answer that should get full marks in "accepted_answers"."""
+            answer_key = '\n    "accepted_answers": ["answer", "equivalent answer"],'
             time_limit = 20
 
         elif difficulty == "medium":
@@ -40,6 +346,7 @@ class GroqService:
 - Focus on explaining a concept or simple action in React/Node.
 - Must be answerable within 60 seconds.
 - Example: "Explain the difference between useEffect and useLayoutEffect." """
+            answer_key = ""
             time_limit = 60
 
         else:  # hard
@@ -48,6 +355,7 @@ class GroqService:
 - Focus on concepts, reasoning, or small scenarios in React/Node.
 - Must be answerable within 120 seconds.
 - Example: "Describe how React state updates asynchronously and how to handle it properly." """
+            answer_key = ""
             time_limit = 120
 
         prompt = f"""You are an expert technical interviewer.
@@ -61,22 +369,19 @@ Output format:
 {{
     "question": "The interview question",
     "expected_topics": ["topic1", "topic2"],
-    "hints": ["hint1", "hint2"],
+    "hints": ["hint1", "hint2"],{answer_key}
     "time_limit": {time_limit}
 }}"""
 
-        try:
-            loop = asyncio.get_event_loop()
-            completion = await loop.run_in_executor(
-                None,
-                lambda: self.client.chat.completions.create(
-                    messages=[
-                        {"role": "system", "content": "You are an expert interviewer. Always respond with VALID JSON ONLY."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    model=self.model,
-                    temperature=0.6,
-                )
+        async def attempt(model: str, on_delta: Optional[DeltaCallback]) -> Dict:
+            completion = await self._complete(
+                "question", difficulty,
+                messages=[
+                    {"role": "system", "content": "You are an expert interviewer. Always respond with VALID JSON ONLY."},
+                    {"role": "user", "content": prompt}
+                ],
+                model=model,
+                temperature=0.6,
             )
             
             content = completion.choices[0].message.content
@@ -86,12 +391,24 @@ Output format:
                 json_str = content[start_idx:end_idx]
                 result = json.loads(json_str)
                 result['time_limit'] = time_limit
+                answers = result.get('accepted_answers') or []
+                if isinstance(answers, str):
+                    answers = [answers]
+                result['accepted_answers'] = [str(a) for a in answers if isinstance(a, (str, int, float))] if difficulty == "easy" else []
                 return result
             else:
                 return json.loads(content)
+        
+        tried: List[str] = []
+        try:
+            result, tier = await self._hedged("question", attempt, tried)
+            result['tier'] = {"used": tier, "tried": tried}
+            return result
 
         except Exception as e:
             print(f"Error generating question: {e}")
+            metrics.llm_fallbacks.labels("question", difficulty).inc()
+            self._record_tier("question", "local")
             # Fallback short, clear, answerable questions
             fallback_questions = {
                 "easy": [
@@ -110,6 +427,11 @@ Output format:
                     "How would you prevent memory leaks in a Node.js application?"
                 ]
             }
+            fallback_answers = {
+                "What React hook manages component state?": ["useState", "useReducer"],
+                "Which HTTP method updates existing data in REST?": ["PUT", "PATCH"],
+                "What command creates a new Node.js project?": ["npm init", "npm init -y", "yarn init"]
+            }
             import random
             selected = random.choice(fallback_questions.get(difficulty, fallback_questions["easy"]))
             
@@ -117,7 +439,10 @@ Output format:
                 "question": selected,
                 "expected_topics": [topic],
                 "hints": [],
-                "time_limit": time_limit
+                "accepted_answers": fallback_answers.get(selected, []),
+                "time_limit": time_limit,
+                "fallback": True,
+                "tier": {"used": "local", "tried": tried + ["local"]}
             }
 
     async def evaluate_answer(
@@ -125,31 +450,27 @@ Output format:
         question: str, 
         answer: str, 
         expected_topics: List[str],
-        difficulty: str = "medium"
+        difficulty: str = "medium",
+        accepted_answers: Optional[List[str]] = None,
+        on_delta: Optional[DeltaCallback] = None
     ) -> Dict:
-        """Evaluate candidate's answer using proper scoring"""
+        """Evaluate candidate's answer using proper scoring, streaming the feedback text to on_delta if given"""
         
         max_score = self.max_scores.get(difficulty, 3)
         
-        # Handle empty or non-answers
-        if not answer or answer.strip() == "" or answer.strip() == "[No answer provided - Time expired]":
-            return {
-                "score": 0,
-                "feedback": "No answer provided.",
-                "strengths": [],
-                "improvements": ["No response given"],
-                "topics_covered": []
-            }
+        # Answers the local cascade is sure about never reach the LLM
+        local = self.local_evaluation(question, answer, expected_topics, difficulty, accepted_answers)
+        if local["confidence"] >= settings.LOCAL_SCORER_CONFIDENCE:
+            if on_delta:
+                await on_delta(local["feedback"])
+            return local
         
-        # Check if answer is just a number or very short
-        if answer.strip().isdigit() or len(answer.strip()) < 3:
-            return {
-                "score": 0,
-                "feedback": "Invalid or incomplete answer.",
-                "strengths": [],
-                "improvements": ["Please provide a proper technical answer"],
-                "topics_covered": []
-            }
+        # Same question and answer graded under the current rubric before
+        cached = await self.evaluation_cache.get(question, answer, difficulty)
+        if cached is not None:
+            if on_delta:
+                await on_delta(cached.get("feedback", ""))
+            return {**cached, "tier": {"used": "cache", "tried": []}}
         
         prompt = f"""You are an expert technical interviewer evaluating a {difficulty} question.
 
@@ -177,21 +498,25 @@ Return ONLY valid JSON in this exact format:
     "topics_covered": ["topic actually covered in answer"]
 }}"""
 
-        try:
-            loop = asyncio.get_event_loop()
-            completion = await loop.run_in_executor(
-                None,
-                lambda: self.client.chat.completions.create(
-                    messages=[
-                        {"role": "system", "content": f"You are an expert technical interviewer. Score answers fairly based on merit, not arbitrary numbers. Maximum score for this {difficulty} question is {max_score}."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    model=self.model,
-                    temperature=0.3,
-                )
-            )
-            
-            content = completion.choices[0].message.content
+        messages = [
+            {"role": "system", "content": f"You are an expert technical interviewer. Score answers fairly based on merit, not arbitrary numbers. Maximum score for this {difficulty} question is {max_score}."},
+            {"role": "user", "content": prompt}
+        ]
+        
+        async def attempt(model: str, on_delta: Optional[DeltaCallback]) -> Dict:
+            if on_delta:
+                # Only the feedback text is worth showing while the JSON is still arriving
+                feedback_stream = JsonFieldStreamer("feedback")
+                
+                async def forward_feedback(delta: str):
+                    feedback = feedback_stream.feed(delta)
+                    if feedback:
+                        await on_delta(feedback)
+                
+                content = await self._stream("evaluation", difficulty, forward_feedback, messages=messages, model=model, temperature=0.3)
+            else:
+                completion = await self._complete("evaluation", difficulty, messages=messages, model=model, temperature=0.3)
+                content = completion.choices[0].message.content
             start_idx = content.find('{')
             end_idx = content.rfind('}') + 1
             if start_idx != -1 and end_idx > start_idx:
@@ -200,44 +525,48 @@ Return ONLY valid JSON in this exact format:
                 
                 # Ensure score is within bounds
                 result['score'] = max(0, min(max_score, result.get('score', 0)))
-                
                 return result
             else:
                 return json.loads(content)
+        
+        tried: List[str] = []
+        try:
+            result, tier = await self._hedged("evaluation", attempt, tried, on_delta)
+            if tier == "primary":
+                # The cheaper model's grades are good enough to unblock a candidate, not to reuse
+                await self.evaluation_cache.set(question, answer, difficulty, result)
+            return {**result, "tier": {"used": tier, "tried": tried}}
                 
         except Exception as e:
             print(f"Error evaluating answer: {e}")
-            # Basic evaluation based on answer quality
-            answer_length = len(answer.split())
-            
-            if difficulty == "easy":
-                # Easy questions expect short answers
-                if answer_length <= 5:
-                    score = 1
-                else:
-                    score = 0.5
-            elif difficulty == "medium":
-                if answer_length >= 10:
-                    score = 2
-                elif answer_length >= 5:
-                    score = 1
-                else:
-                    score = 0.5
-            else:  # hard
-                if answer_length >= 20:
-                    score = 3
-                elif answer_length >= 10:
-                    score = 2
-                else:
-                    score = 1
-            
-            return {
-                "score": min(score, max_score),
-                "feedback": "Answer evaluated based on content length and complexity.",
-                "strengths": ["Provided a response"],
-                "improvements": ["Could provide more technical detail"],
-                "topics_covered": []
-            }
+            metrics.llm_fallbacks.labels("evaluation", difficulty).inc()
+            self._record_tier("evaluation", "local")
+            # Fall back to the local estimate, unsure as it is
+            return {**local, "tier": {"used": "local", "tried": tried + ["local"]}}
+    
+    def local_evaluation(
+        self,
+        question: str,
+        answer: Optional[str],
+        expected_topics: List[str],
+        difficulty: str,
+        accepted_answers: Optional[List[str]] = None
+    ) -> Dict:
+        """Local cascade result, counting whether it clears the confidence threshold"""
+        local = self.local_scorer.evaluate(
+            question, answer, expected_topics, difficulty, self.max_scores.get(difficulty, 3), accepted_answers
+        )
+        self.local_stats["trusted" if local["confidence"] >= settings.LOCAL_SCORER_CONFIDENCE else "escalated"] += 1
+        return local
+    
+    def valid_evaluation(self, evaluation, difficulty: str) -> bool:
+        """Whether a model-produced evaluation has a numeric score within the question's bounds"""
+        if not isinstance(evaluation, dict) or not isinstance(evaluation.get("feedback", ""), str):
+            return False
+        score = evaluation.get("score")
+        if isinstance(score, bool) or not isinstance(score, (int, float)):
+            return False
+        return 0 <= score <= self.max_scores.get(difficulty, 3)
     
     def _get_scoring_criteria(self, difficulty: str, max_score: int) -> str:
         """Get scoring criteria based on difficulty"""
@@ -262,9 +591,10 @@ Return ONLY valid JSON in this exact format:
         self, 
         candidate_name: str,
         questions_and_answers: List[Dict],
-        total_score: float
+        total_score: float,
+        on_delta: Optional[DeltaCallback] = None
     ) -> str:
-        """Generate final interview summary"""
+        """Generate final interview summary, streaming it to on_delta if given"""
         
         # Calculate score breakdown
         easy_score = sum(qa.get('score', 0) for qa in questions_and_answers[:2])
@@ -291,37 +621,179 @@ Question Performance:
 
 Provide a 2-3 sentence summary evaluating their technical knowledge, problem-solving skills, and areas for improvement."""
 
-        try:
-            loop = asyncio.get_event_loop()
-            completion = await loop.run_in_executor(
-                None,
-                lambda: self.client.chat.completions.create(
-                    messages=[
-                        {"role": "system", "content": "You are an expert technical interviewer providing constructive feedback."},
-                        {"role": "user", "content": prompt}
-                    ],
-                                    model=self.model,
-                    temperature=0.5,
-                    max_tokens=200
-                )
-            )
+        messages = [
+            {"role": "system", "content": "You are an expert technical interviewer providing constructive feedback."},
+            {"role": "user", "content": prompt}
+        ]
+        
+        async def attempt(model: str, on_delta: Optional[DeltaCallback]) -> str:
+            if on_delta:
+                return await self._stream("summary", "all", on_delta, messages=messages, model=model, temperature=0.5, max_tokens=200)
             
+            completion = await self._complete("summary", "all", messages=messages, model=model, temperature=0.5, max_tokens=200)
             return completion.choices[0].message.content
+        
+        try:
+            summary, _ = await self._hedged("summary", attempt, [], on_delta)
+            return summary
             
         except Exception as e:
             print(f"Error generating summary: {e}")
-            percentage = (total_score / 20) * 100
-            if percentage >= 80:
-                performance = "excellent"
-                recommendation = "strong candidate for senior positions"
-            elif percentage >= 60:
-                performance = "good"
-                recommendation = "suitable for mid-level positions"
-            elif percentage >= 40:
-                performance = "satisfactory"
-                recommendation = "may need additional training"
+            metrics.llm_fallbacks.labels("summary", "all").inc()
+            self._record_tier("summary", "local")
+            return self.template_summary(candidate_name, total_score)
+    
+    def template_summary(self, candidate_name: str, total_score: float) -> str:
+        """Fixed-wording summary from the total score alone, for when no model can write one"""
+        percentage = (total_score / 20) * 100
+        if percentage >= 80:
+            performance = "excellent"
+            recommendation = "strong candidate for senior positions"
+        elif percentage >= 60:
+            performance = "good"
+            recommendation = "suitable for mid-level positions"
+        elif percentage >= 40:
+            performance = "satisfactory"
+            recommendation = "may need additional training"
+        else:
+            performance = "needs improvement"
+            recommendation = "requires significant skill development"
+            
+        return f"{candidate_name} completed the technical interview with a score of {total_score}/20 ({percentage:.0f}%), showing {performance} performance. The candidate is {recommendation}."
+
+    async def grade_interview(
+        self,
+        candidate_name: str,
+        questions: List[Dict],
+        on_delta: Optional[DeltaCallback] = None
+    ) -> Dict:
+        """Grade every answer and write the summary in one call, regrading separately any score that fails validation"""
+        evaluations: List[Optional[Dict]] = []
+        for q in questions:
+            local = self.local_evaluation(q["text"], q.get("answer"), q.get("expected_topics", []), q["difficulty"], q.get("accepted_answers"))
+            evaluations.append(local if local["confidence"] >= settings.LOCAL_SCORER_CONFIDENCE else None)
+        pending = [i for i, evaluation in enumerate(evaluations) if evaluation is None]
+        
+        # Whether the socket is showing summary text from the batch call
+        shown = False
+        
+        async def forward(delta: str, replace: bool = False):
+            nonlocal shown
+            shown = bool(delta) if replace else shown or bool(delta)
+            await on_delta(delta, replace=replace)
+        
+        graded, summary = {}, None
+        try:
+            graded, summary = await self._grade_batch(candidate_name, questions, pending, forward if on_delta else None)
+        except Exception as e:
+            print(f"Error batch grading interview: {e}")
+            metrics.llm_fallbacks.labels("batch_grading", "all").inc()
+        
+        invalid = []
+        for i in pending:
+            if self.valid_evaluation(graded.get(i), questions[i]["difficulty"]):
+                evaluations[i] = graded[i]
             else:
-                performance = "needs improvement"
-                recommendation = "requires significant skill development"
+                invalid.append(i)
+        
+        if invalid:
+            regraded = await asyncio.gather(*[
+                self.evaluate_answer(
+                    questions[i]["text"], questions[i]["answer"], questions[i]["expected_topics"],
+                    questions[i]["difficulty"], questions[i].get("accepted_answers")
+                )
+                for i in invalid
+            ])
+            for i, evaluation in zip(invalid, regraded):
+                evaluations[i] = evaluation
+        
+        total_score = sum(evaluation["score"] for evaluation in evaluations)
+        if not isinstance(summary, str) or not summary.strip():
+            scored = [{**q, "score": evaluation["score"]} for q, evaluation in zip(questions, evaluations)]
+            if shown:
+                # The batch call streamed part of a summary it never delivered, start the socket over
+                await on_delta("", replace=True)
+            summary = await self.generate_candidate_summary(candidate_name, scored, total_score, on_delta=on_delta)
+        
+        return {
+            "evaluations": evaluations,
+            "summary": summary,
+            "total_score": total_score,
+            "regraded": len(invalid)
+        }
+    
+    async def _grade_batch(
+        self,
+        candidate_name: str,
+        questions: List[Dict],
+        indices: List[int],
+        on_delta: Optional[DeltaCallback] = None
+    ):
+        """One structured call returning ({question index: evaluation}, summary)"""
+        qa_text = "\n\n".join(
+            f"Q{i + 1} ({q['difficulty']}, max {self.max_scores.get(q['difficulty'], 3)} marks): {q['text']}\n"
+            f"Expected topics: {', '.join(q.get('expected_topics', []))}\n"
+            f"Answer: {q.get('answer') or '[No answer]'}"
+            for i, q in enumerate(questions)
+        )
+        criteria = "\n".join(
+            f"{difficulty.upper()} (max {max_score}):\n{self._get_scoring_criteria(difficulty, max_score)}"
+            for difficulty, max_score in self.max_scores.items()
+        )
+        to_grade = ", ".join(f"Q{i + 1}" for i in indices) or "none"
+        
+        prompt = f"""You are grading a complete technical interview for {candidate_name}.
+
+{qa_text}
+
+SCORING RULES, score each question STRICTLY between 0 and its maximum:
+{criteria}
+
+Grade these questions: {to_grade}. Then write a brief professional summary (3-4 sentences) of the candidate's
+strengths, weaknesses and a hiring recommendation, based on all answers above.
+
+Return ONLY valid JSON in this exact format:
+{{
+    "evaluations": [
+        {{"question": <question number>, "score": <0-max>, "feedback": "Brief specific feedback about their answer"}}
+    ],
+    "summary": "The summary"
+}}"""
+        
+        messages = [
+            {"role": "system", "content": "You are an expert technical interviewer. Score answers fairly based on merit and never exceed a question's maximum."},
+            {"role": "user", "content": prompt}
+        ]
+        
+        async def attempt(model: str, on_delta: Optional[DeltaCallback]):
+            if on_delta:
+                # The summary comes last in the JSON, stream it as it arrives
+                summary_stream = JsonFieldStreamer("summary")
                 
-            return f"{candidate_name} completed the technical interview with a score of {total_score}/20 ({percentage:.0f}%), showing {performance} performance. The candidate is {recommendation}."
\ No newline at end of file
+                async def forward_summary(delta: str):
+                    summary_text = summary_stream.feed(delta)
+                    if summary_text:
+                        await on_delta(summary_text)
+                
+                content = await self._stream("batch_grading", "all", forward_summary, messages=messages, model=model, temperature=0.3, max_tokens=1500)
+            else:
+                completion = await self._complete("batch_grading", "all", messages=messages, model=model, temperature=0.3, max_tokens=1500)
+                content = completion.choices[0].message.content
+            return json.loads(content[content.find('{'):content.rfind('}') + 1])
+        
+        tried: List[str] = []
+        result, tier = await self._hedged("batch_grading", attempt, tried, on_delta)
+        graded = {}
+        for evaluation in result.get("evaluations", []):
+            if isinstance(evaluation, dict) and isinstance(evaluation.get("question"), int):
+                index = evaluation["question"] - 1
+                if index in indices:
+                    graded[index] = {
+                        "score": evaluation.get("score"),
+                        "feedback": evaluation.get("feedback", ""),
+                        "strengths": [],
+                        "improvements": [],
+                        "topics_covered": [],
+                        "tier": {"used": tier, "tried": tried}
+                    }
+        return graded, result.get("summary")
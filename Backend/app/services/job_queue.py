@@ -0,0 +1,109 @@
+# backend/app/services/job_queue.py
+import asyncio
+import uuid
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+JobFunc = Callable[..., Awaitable[Any]]
+FailureCallback = Callable[[str, Exception], Awaitable[None]]
+
+
+@dataclass
+class Job:
+    id: str
+    func: JobFunc
+    args: Tuple = ()
+    attempt: int = 0
+    on_failure: Optional[FailureCallback] = None
+
+
+class JobQueue:
+    """In-process background job queue with a fixed set of workers and retries with exponential backoff"""
+
+    def __init__(self, name: str, workers: int = 2, max_attempts: int = 3, backoff: float = 1.0):
+        self.name = name
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+
+        self._queue: "asyncio.Queue[Job]" = asyncio.Queue()
+        self._tasks = []
+        self._retry_tasks = set()
+        # Ids of jobs queued, running or waiting to retry
+        self._active = set()
+        self.stats = {"submitted": 0, "succeeded": 0, "retried": 0, "deferred": 0, "failed": 0, "running": 0}
+
+    async def start(self):
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in [*self._tasks, *self._retry_tasks]:
+            task.cancel()
+        await asyncio.gather(*self._tasks, *self._retry_tasks, return_exceptions=True)
+        self._tasks = []
+        self._retry_tasks = set()
+
+    def submit(self, func: JobFunc, *args, job_id: Optional[str] = None, on_failure: Optional[FailureCallback] = None) -> str:
+        """Queue func(*args) and return its job id; on_failure runs once every attempt has failed"""
+        job = Job(id=job_id or str(uuid.uuid4()), func=func, args=args, on_failure=on_failure)
+        self._queue.put_nowait(job)
+        self._active.add(job.id)
+        self.stats["submitted"] += 1
+        return job.id
+
+    def active_ids(self) -> List[str]:
+        """Ids of the jobs this queue still has to finish"""
+        return list(self._active)
+
+    def snapshot(self) -> Dict[str, int]:
+        return {**self.stats, "queued": self._queue.qsize(), "retrying": len(self._retry_tasks)}
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            self.stats["running"] += 1
+            try:
+                await job.func(*job.args)
+                self._active.discard(job.id)
+                self.stats["succeeded"] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                await self._handle_failure(job, e)
+            finally:
+                self.stats["running"] -= 1
+                self._queue.task_done()
+
+    async def _handle_failure(self, job: Job, error: Exception):
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            # The service said when to come back (e.g. an open circuit), that doesn't use up an attempt
+            self.stats["deferred"] += 1
+            self._schedule(job, retry_after)
+            return
+        
+        job.attempt += 1
+        if job.attempt < self.max_attempts:
+            print(f"{self.name} job {job.id} failed (attempt {job.attempt}), retrying: {error}")
+            self.stats["retried"] += 1
+            self._schedule(job, self.backoff * 2 ** (job.attempt - 1))
+            return
+
+        print(f"{self.name} job {job.id} failed after {job.attempt} attempts: {error}")
+        self.stats["failed"] += 1
+        self._active.discard(job.id)
+        if job.on_failure:
+            try:
+                await job.on_failure(job.id, error)
+            except Exception as e:
+                print(f"Error in {self.name} failure handler: {e}")
+
+    def _schedule(self, job: Job, delay: float):
+        # Wait off the worker so other jobs keep flowing
+        task = asyncio.create_task(self._requeue(job, delay))
+        self._retry_tasks.add(task)
+        task.add_done_callback(self._retry_tasks.discard)
+
+    async def _requeue(self, job: Job, delay: float):
+        await asyncio.sleep(delay)
+        self._queue.put_nowait(job)
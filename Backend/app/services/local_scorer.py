@@ -0,0 +1,209 @@
+# backend/app/services/local_scorer.py
+import re
+from typing import Dict, Iterable, List, Optional, Set
+
+# Interchangeable spellings of the same idea, mapped onto one canonical token
+SYNONYMS = {
+    "javascript": ["js", "ecmascript", "es6"],
+    "typescript": ["ts"],
+    "database": ["db", "datastore"],
+    "function": ["func", "fn"],
+    "asynchronous": ["async", "nonblocking", "non-blocking"],
+    "synchronous": ["sync", "blocking"],
+    "authentication": ["auth", "login", "authn"],
+    "authorization": ["authz", "permission", "permissions"],
+    "component": ["components", "widget"],
+    "property": ["prop", "props", "attribute"],
+    "variable": ["var", "variables"],
+    "parameter": ["param", "params", "argument", "arg", "args"],
+    "request": ["req"],
+    "response": ["res", "reply"],
+    "middleware": ["middlewares", "interceptor"],
+    "dependency": ["deps", "dependencies"],
+    "document": ["doc"],
+    "object": ["obj"],
+    "reference": ["ref", "refs"],
+    "render": ["rendering", "rerender", "re-render", "paint"],
+    "memoization": ["memoize", "memo"],
+    "promise": ["promises", "thenable"],
+    "callback": ["cb", "callbacks"],
+    "package": ["module", "library", "lib"],
+    "server": ["backend"],
+    "client": ["frontend", "browser"],
+}
+
+STOPWORDS = {
+    "a", "an", "the", "is", "are", "was", "be", "to", "of", "in", "on", "for", "and", "or", "it", "its",
+    "that", "this", "with", "by", "as", "at", "we", "you", "can", "use", "used", "using", "which", "what",
+    "how", "i", "think", "would", "will", "do", "does", "from", "into", "so", "then", "also",
+}
+
+# Words that turn an answer naming the key into a denial or a guess between options
+NEGATIONS = {"not", "no", "never", "isnt", "dont", "doesnt", "cant", "cannot", "wont", "without", "neither", "nor"}
+HEDGES = {"or", "either", "maybe", "perhaps", "probably", "possibly", "guess", "might"}
+
+# What may frame the key in a near-exact match, e.g. "the useState hook"
+FRAMING = {"hook", "function", "method", "keyword", "operator", "command", "property", "statement", "call", "api"}
+
+GIVE_UP = {"i dont know", "i do not know", "dont know", "no idea", "not sure", "idk", "pass", "skip", "no answer"}
+
+# Roughly how many words a complete answer takes at each difficulty
+EXPECTED_WORDS = {"easy": 3, "medium": 15, "hard": 35}
+
+_CANONICAL = {variant: canonical for canonical, variants in SYNONYMS.items() for variant in variants}
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.\-]*")
+
+
+def stem(word: str) -> str:
+    """Crude suffix stripping, enough to match "rendering" with "renders" and "caching" with "cached\""""
+    for suffix, replacement in (("ations", "ate"), ("ation", "ate"), ("ments", ""), ("ment", ""), ("ies", "y"),
+                                ("ing", ""), ("ers", ""), ("ed", ""), ("er", ""), ("es", ""), ("ly", ""), ("s", "")):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)] + replacement
+    return word
+
+
+def terms(text: str) -> List[str]:
+    """Canonical stemmed tokens of the text, stopwords dropped"""
+    result = []
+    for token in _TOKEN.findall(text.lower()):
+        token = token.strip(".-")
+        if not token or token in STOPWORDS:
+            continue
+        token = _CANONICAL.get(token, token)
+        result.append(_CANONICAL.get(stem(token), stem(token)))
+    return result
+
+
+def normalize(text: str) -> str:
+    return " ".join(re.sub(r"[^a-z0-9+#.\s]", "", text.lower()).split()).strip(".")
+
+
+_FRAMING_TERMS = set(terms(" ".join(FRAMING)))
+
+
+class LocalScorer:
+    """Cheap scoring cascade run before the LLM: fixed rules, the answer key, then topic coverage
+
+    Every evaluation carries a confidence. Callers only trust it over the LLM
+    above their threshold; below that it serves as an estimate when the LLM is
+    unavailable.
+    """
+
+    def __init__(self):
+        self.stats = {"rule": 0, "answer_key": 0, "coverage": 0}
+
+    def evaluate(
+        self,
+        question: str,
+        answer: Optional[str],
+        expected_topics: Iterable[str],
+        difficulty: str,
+        max_score: float,
+        accepted_answers: Optional[Iterable[str]] = None
+    ) -> Dict:
+        expected_topics = list(expected_topics or [])
+        rule = self._rules(question, answer)
+        if rule is not None:
+            self.stats["rule"] += 1
+            return rule
+
+        answer_terms = terms(answer)
+        answer_set = set(answer_terms)
+        covered = self._covered_topics(expected_topics, answer_set)
+        topics = [t for t in expected_topics if t]
+        coverage = len(covered) / len(topics) if topics else 0.0
+
+        if difficulty == "easy" and accepted_answers:
+            keyed = self._answer_key(answer, answer_terms, accepted_answers)
+            if keyed is not None:
+                self.stats["answer_key"] += 1
+                return self._result(keyed["score"] * max_score, keyed["confidence"], keyed["feedback"], covered)
+
+        self.stats["coverage"] += 1
+        words = len(answer.split())
+        if difficulty != "easy" and not covered and words < 6:
+            # Likely worth little, but a terse answer can be right ("const cannot be reassigned"), so the LLM still decides
+            return self._result(0, 0.6, "The answer is too brief and doesn't address the expected topics.", covered)
+
+        # Estimate only: keywords can't tell a right explanation from a wrong one that uses the same words
+        length_factor = min(1.0, words / EXPECTED_WORDS.get(difficulty, 15))
+        estimate = max_score * (0.6 * coverage + 0.4 * length_factor)
+        confidence = 0.5 if topics else 0.3
+        feedback = (
+            f"Covers {len(covered)} of {len(topics)} expected topics." if topics
+            else "Answer evaluated based on content length and complexity."
+        )
+        return self._result(round(estimate * 2) / 2, confidence, feedback, covered)
+
+    @staticmethod
+    def _rules(question: str, answer: Optional[str]) -> Optional[Dict]:
+        """Answers that are certainly worth nothing"""
+        # Handle empty or non-answers
+        if not answer or answer.strip() == "" or answer.strip() == "[No answer provided - Time expired]":
+            return LocalScorer._result(0, 1.0, "No answer provided.", [], source="rule", improvements=["No response given"])
+
+        # Check if answer is just a number or very short
+        if answer.strip().isdigit() or len(answer.strip()) < 3:
+            return LocalScorer._result(
+                0, 1.0, "Invalid or incomplete answer.", [], source="rule",
+                improvements=["Please provide a proper technical answer"]
+            )
+
+        if normalize(answer) in GIVE_UP:
+            return LocalScorer._result(0, 1.0, "No answer provided.", [], source="rule", improvements=["No response given"])
+
+        # The question pasted back as the answer
+        answer_set, question_set = set(terms(answer)), set(terms(question))
+        if answer_set and answer_set <= question_set and len(answer_set) >= 0.8 * len(question_set):
+            return LocalScorer._result(
+                0, 0.95, "The answer repeats the question.", [], source="rule",
+                improvements=["Answer the question in your own words"]
+            )
+        return None
+
+    @staticmethod
+    def _covered_topics(expected_topics: Iterable[str], answer_set: Set[str]) -> List[str]:
+        """Topics whose terms mostly appear in the answer"""
+        covered = []
+        for topic in expected_topics:
+            topic_terms = set(terms(topic or ""))
+            if topic_terms and len(topic_terms & answer_set) / len(topic_terms) >= 0.5:
+                covered.append(topic)
+        return covered
+
+    @staticmethod
+    def _answer_key(answer: str, answer_terms: List[str], accepted_answers: Iterable[str]) -> Optional[Dict]:
+        """Full marks only for the key itself, as typed or with a framing word, never denied or offered among others"""
+        normalized = normalize(answer)
+        compact = normalized.replace(" ", "")
+        words = set(normalized.split())
+        answer_set = set(answer_terms)
+        # "useState, useEffect" names several candidates
+        several = bool(re.search(r"[,;/|]", answer))
+        for accepted in accepted_answers:
+            accepted_norm = normalize(accepted or "")
+            if not accepted_norm:
+                continue
+            if normalized == accepted_norm or compact == accepted_norm.replace(" ", ""):
+                return {"score": 1.0, "confidence": 0.95, "feedback": "Correct."}
+            qualifiers = (NEGATIONS | HEDGES) - set(accepted_norm.split())
+            if several or words & qualifiers:
+                continue
+            accepted_terms = set(terms(accepted))
+            extra = answer_set - accepted_terms
+            if accepted_terms and accepted_terms <= answer_set and extra <= _FRAMING_TERMS and len(extra) <= 1:
+                return {"score": 1.0, "confidence": 0.9, "feedback": "Correct."}
+        return None
+
+    @staticmethod
+    def _result(score: float, confidence: float, feedback: str, covered: List[str], source: str = "local", improvements: Optional[List[str]] = None) -> Dict:
+        return {
+            "score": score,
+            "feedback": feedback,
+            "strengths": [f"Mentions {topic}" for topic in covered],
+            "improvements": improvements if improvements is not None else ([] if score else ["Could provide more technical detail"]),
+            "topics_covered": covered,
+            "confidence": confidence,
+            "source": source
+        }
@@ -0,0 +1,83 @@
+# backend/app/services/metrics.py
+import os
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+
+# Each worker process keeps its own values; with several workers PROMETHEUS_MULTIPROC_DIR
+# must name an empty directory before they start, where they share them for /metrics
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+if not MULTIPROC_DIR and int(os.environ.get("WEB_CONCURRENCY", "1") or 1) > 1:
+    print("Warning: PROMETHEUS_MULTIPROC_DIR isn't set, /metrics will only report the worker that answers it")
+
+# LLM calls run from well under a second (easy grading) to tens of seconds (batch grading)
+LLM_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 3, 5, 8, 13, 20, 30, 60)
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+llm_call_seconds = Histogram(
+    "llm_call_seconds",
+    "Wall time of a Groq completion once it holds a concurrency slot",
+    ["operation", "difficulty", "model", "outcome"],
+    buckets=LLM_BUCKETS
+)
+llm_queue_wait_seconds = Histogram(
+    "llm_queue_wait_seconds",
+    "Time a Groq completion waited for a concurrency slot",
+    ["operation", "difficulty"],
+    buckets=REQUEST_BUCKETS
+)
+llm_rate_limit_wait_seconds = Histogram(
+    "llm_rate_limit_wait_seconds",
+    "Time a Groq completion waited for rate-limit quota, by priority class",
+    ["model", "priority"],
+    buckets=LLM_BUCKETS
+)
+llm_tokens = Counter(
+    "llm_tokens",
+    "Tokens reported by Groq, by kind: prompt or completion",
+    ["operation", "difficulty", "kind"]
+)
+llm_tiers = Counter(
+    "llm_tiers",
+    "Which tier produced the result: primary, fallback_model or local",
+    ["operation", "tier"]
+)
+llm_fallbacks = Counter(
+    "llm_fallbacks",
+    "Results produced locally because every model call failed or ran past its deadline",
+    ["operation", "difficulty"]
+)
+circuit_state = Gauge(
+    "circuit_state",
+    "Circuit breaker state per external service: 0 closed, 1 half-open, 2 open",
+    ["name"],
+    multiprocess_mode="livemax"  # the most open any running worker has it
+)
+http_request_seconds = Histogram(
+    "http_request_seconds",
+    "HTTP request latency per route",
+    ["method", "route", "status"],
+    buckets=REQUEST_BUCKETS
+)
+
+
+def record_usage(operation: str, difficulty: str, usage):
+    """Count the prompt and completion tokens of a Groq usage object, if the response carried one"""
+    if usage is None:
+        return
+    llm_tokens.labels(operation, difficulty, "prompt").inc(getattr(usage, "prompt_tokens", 0) or 0)
+    llm_tokens.labels(operation, difficulty, "completion").inc(getattr(usage, "completion_tokens", 0) or 0)
+
+
+def latest() -> bytes:
+    """The exposition for /metrics, summed across every worker when they share PROMETHEUS_MULTIPROC_DIR"""
+    if not MULTIPROC_DIR:
+        return generate_latest()
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=MULTIPROC_DIR)
+    return generate_latest(registry)
+
+
+def mark_process_dead():
+    """Drop this worker's live gauges from the shared directory as it shuts down"""
+    if MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid(), MULTIPROC_DIR)
@@ -0,0 +1,159 @@
+# backend/app/services/question_pool.py
+import asyncio
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional
+
+from app.config import settings
+from app.database.connection import get_db
+from app.services.groq_service import GroqService
+from app.services.rate_limit_scheduler import llm_priority
+
+DIFFICULTIES = ("easy", "medium", "hard")
+
+
+class QuestionPool:
+    """Pre-generated interview questions per difficulty, stored in MongoDB and mirrored in memory"""
+
+    def __init__(self, groq_service: GroqService, topic: str = "fullstack"):
+        self.groq_service = groq_service
+        self.topic = topic
+        self.low_watermark = settings.QUESTION_POOL_LOW_WATERMARK
+        self.high_watermark = settings.QUESTION_POOL_HIGH_WATERMARK
+        self.refill_interval = settings.QUESTION_POOL_REFILL_INTERVAL
+
+        self._pools: Dict[str, Deque[Dict]] = {d: deque() for d in DIFFICULTIES}
+        self._refill_event = asyncio.Event()
+        self._refill_task: Optional[asyncio.Task] = None
+        self.stats = {"hits": 0, "misses": 0, "generated": 0}
+
+    async def start(self):
+        """Load the persisted pool and start the background refill loop"""
+        for difficulty in DIFFICULTIES:
+            await self._sync(difficulty)
+        self._refill_task = asyncio.create_task(self._refill_loop())
+        self._refill_event.set()
+
+    async def stop(self):
+        if self._refill_task:
+            self._refill_task.cancel()
+            try:
+                await self._refill_task
+            except asyncio.CancelledError:
+                pass
+            self._refill_task = None
+
+    def sizes(self) -> Dict[str, int]:
+        return {d: len(pool) for d, pool in self._pools.items()}
+
+    async def get_question(self, difficulty: str, previous_questions: List[str] = []) -> Dict:
+        """Pop a pooled question not yet asked in this session, generating inline only if none is available"""
+        database = get_db()
+        exclude = set(previous_questions)
+
+        if database is not None:
+            while True:
+                pool = self._pools[difficulty]
+                doc = next((d for d in pool if d["question"] not in exclude), None)
+                if doc is None:
+                    break
+                pool.remove(doc)
+                # Another worker may have taken it since our last sync
+                result = await database.question_pool.delete_one({"_id": doc["_id"]})
+                if result.deleted_count:
+                    self._on_hit(difficulty)
+                    return self._to_question_data(doc)
+
+            # Memory mirror is empty or stale, check for questions added by other workers
+            doc = await database.question_pool.find_one_and_delete(
+                {"difficulty": difficulty, "question": {"$nin": list(exclude)}},
+                sort=[("created_at", 1)]
+            )
+            if doc:
+                self._on_hit(difficulty)
+                return self._to_question_data(doc)
+
+        self.stats["misses"] += 1
+        self._refill_event.set()
+        return await self.groq_service.generate_interview_question(difficulty, self.topic, previous_questions)
+
+    def _on_hit(self, difficulty: str):
+        self.stats["hits"] += 1
+        if len(self._pools[difficulty]) < self.low_watermark:
+            self._refill_event.set()
+
+    @staticmethod
+    def _to_question_data(doc: Dict) -> Dict:
+        return {
+            "question": doc["question"],
+            "expected_topics": doc.get("expected_topics", []),
+            "hints": doc.get("hints", []),
+            "accepted_answers": doc.get("accepted_answers", []),
+            "time_limit": doc["time_limit"],
+            "tier": doc.get("tier")
+        }
+
+    async def _refill_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._refill_event.wait(), timeout=self.refill_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._refill_event.clear()
+
+            for difficulty in DIFFICULTIES:
+                try:
+                    await self._refill(difficulty)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    print(f"Error refilling {difficulty} question pool: {e}")
+
+    async def _sync(self, difficulty: str):
+        """Reload the in-memory mirror from MongoDB"""
+        database = get_db()
+        if database is None:
+            return
+        cursor = database.question_pool.find({"difficulty": difficulty}).sort("created_at", 1).limit(self.high_watermark * 2)
+        self._pools[difficulty] = deque([doc async for doc in cursor])
+
+    async def _refill(self, difficulty: str):
+        database = get_db()
+        if database is None:
+            return
+
+        await self._sync(difficulty)
+        pool = self._pools[difficulty]
+        if len(pool) >= self.low_watermark:
+            return
+
+        # Bound the attempts so repeated duplicates can't spin forever
+        attempts = (self.high_watermark - len(pool)) * 2
+        while len(pool) < self.high_watermark and attempts > 0:
+            attempts -= 1
+            known = {doc["question"] for doc in pool}
+            recent = [doc["question"] for doc in list(pool)[-3:]]
+
+            # Only spend rate-limit quota live interviews leave over
+            with llm_priority("batch"):
+                data = await self.groq_service.generate_interview_question(difficulty, self.topic, recent)
+            if data.get("fallback"):
+                # Groq is unavailable, don't fill the pool with canned questions
+                break
+            if data["question"] in known:
+                continue
+
+            doc = {
+                "difficulty": difficulty,
+                "question": data["question"],
+                "expected_topics": data.get("expected_topics", []),
+                "hints": data.get("hints", []),
+                "accepted_answers": data.get("accepted_answers", []),
+                "time_limit": data["time_limit"],
+                "tier": data.get("tier"),
+                "created_at": datetime.utcnow()
+            }
+            result = await database.question_pool.insert_one(doc)
+            doc["_id"] = result.inserted_id
+            pool.append(doc)
+            self.stats["generated"] += 1
@@ -0,0 +1,230 @@
+# backend/app/services/rate_limit_scheduler.py
+import asyncio
+import heapq
+import itertools
+import os
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Mapping, Optional
+
+from app.config import settings
+from app.services import metrics
+
+# Highest priority first: a candidate waiting on a question or grade, the end-of-interview summary, background fills
+PRIORITIES = ("live", "summary", "batch")
+
+_priority: ContextVar[str] = ContextVar("llm_priority", default="live")
+
+
+@contextmanager
+def llm_priority(priority: str):
+    """Schedule the LLM calls made inside the block, including by tasks it spawns, at this priority"""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> str:
+    return _priority.get()
+
+
+def estimate_tokens(messages: List[Dict], max_tokens: Optional[int] = None) -> int:
+    """Rough prompt size at four characters a token, plus the completion budget"""
+    prompt = sum(len(message.get("content") or "") for message in messages) // 4
+    return prompt + (max_tokens or settings.GROQ_COMPLETION_TOKEN_ESTIMATE)
+
+
+def _seconds(value: str) -> Optional[float]:
+    """Parse Groq's reset durations like "7.66s", "2m59.56s" or "120ms\""""
+    total, matched = 0.0, False
+    for amount, unit in re.findall(r"([\d.]+)(ms|h|m|s)", value or ""):
+        matched = True
+        total += float(amount) * {"ms": 0.001, "s": 1, "m": 60, "h": 3600}[unit]
+    return total if matched else None
+
+
+class TokenBucket:
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self._refilled_at = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / 60
+
+    def refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def wait_for(self, amount: float, floor: float) -> float:
+        """Seconds until amount can be taken while leaving floor in the bucket"""
+        # Never ask for more than the bucket can hold, or the wait would never end
+        amount = min(amount, self.capacity - floor)
+        short = amount + floor - self.level
+        return short / self.rate if short > 0 else 0.0
+
+    def set_capacity(self, per_minute: float):
+        if per_minute > 0 and per_minute != self.capacity:
+            self.level = min(self.level, per_minute)
+            self.capacity = float(per_minute)
+
+
+class RateLimitScheduler:
+    """Hands out one model's requests-per-minute and tokens-per-minute quota in priority order
+
+    Callers acquire a request and their estimated tokens before calling the
+    model. When the buckets run short they queue by priority. Lower
+    priorities must leave a reserve in each bucket, so background work only
+    uses quota live traffic isn't using. The token bucket follows the
+    x-ratelimit headers Groq returns, which also account for other workers on
+    the same key, or is settled against actual usage when they are missing.
+    Groq's headers only count requests per day, so requests are unlimited
+    unless GROQ_REQUESTS_PER_MINUTE sets the key's limit, which is split
+    evenly between the WEB_CONCURRENCY workers; a 429 pauses either way.
+    """
+
+    def __init__(self, name: str, requests_per_minute: Optional[int] = None, tokens_per_minute: Optional[int] = None):
+        self.name = name
+        requests_per_minute = requests_per_minute or settings.GROQ_REQUESTS_PER_MINUTE
+        workers = max(1, int(os.environ.get("WEB_CONCURRENCY", "1") or 1))
+        self.requests: Optional[TokenBucket] = TokenBucket(requests_per_minute / workers) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute or settings.GROQ_TOKENS_PER_MINUTE)
+        # Share of each bucket a priority must leave untouched
+        self.reserve = {
+            "live": 0.0,
+            "summary": settings.GROQ_BACKGROUND_RESERVE,
+            "batch": min(0.9, 2 * settings.GROQ_BACKGROUND_RESERVE)
+        }
+        self._paused_until = 0.0
+        self._waiters: List[tuple] = []
+        self._sequence = itertools.count()
+        self._changed = asyncio.Event()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self.stats = {
+            priority: {"granted": 0, "waited": 0, "wait_seconds": 0.0} for priority in PRIORITIES
+        }
+        self.stats["rate_limited"] = 0
+
+    async def acquire(self, tokens: int, priority: Optional[str] = None):
+        """Wait until the request and its tokens fit within the limits at this priority"""
+        priority = priority if priority in PRIORITIES else current_priority()
+        started = time.monotonic()
+        if not self._waiters and self._wait_time(priority, tokens) <= 0:
+            self._take(priority, tokens)
+        else:
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (PRIORITIES.index(priority), next(self._sequence), priority, tokens, future))
+            self._changed.set()
+            if self._dispatcher is None or self._dispatcher.done():
+                self._dispatcher = asyncio.create_task(self._dispatch())
+            # Abandoned waiters are skipped by the dispatcher
+            await future
+            self.stats[priority]["waited"] += 1
+
+        waited = time.monotonic() - started
+        self.stats[priority]["wait_seconds"] += waited
+        metrics.llm_rate_limit_wait_seconds.labels(self.name, priority).observe(waited)
+
+    def settle(self, estimated: int, actual: Optional[int]):
+        """Correct the token bucket once the response reports what the call really used
+
+        Only for calls whose response carried no remaining-tokens header; one
+        that did has already set the level, usage included.
+        """
+        if actual is not None:
+            self.tokens.level -= actual - estimated
+
+    def observe_headers(self, headers: Mapping[str, str]) -> bool:
+        """Follow the x-ratelimit headers, which see every worker's usage of the key
+
+        Returns whether they set the token level, in which case the call
+        needs no settling.
+        """
+        now = time.monotonic()
+        self.tokens.refill(now)
+        limit_tokens = headers.get("x-ratelimit-limit-tokens")
+        if limit_tokens and limit_tokens.isdigit():
+            self.tokens.set_capacity(int(limit_tokens))
+        synced = False
+        remaining_tokens = headers.get("x-ratelimit-remaining-tokens")
+        if remaining_tokens and remaining_tokens.isdigit():
+            self.tokens.level = min(self.tokens.capacity, float(remaining_tokens))
+            synced = True
+        # Groq's request headers count per day, they only ever lower what this minute allows
+        remaining_requests = headers.get("x-ratelimit-remaining-requests")
+        if remaining_requests and remaining_requests.isdigit():
+            if self.requests is not None:
+                self.requests.refill(now)
+                self.requests.level = min(self.requests.level, float(remaining_requests))
+            if int(remaining_requests) == 0:
+                self.pause(_seconds(headers.get("x-ratelimit-reset-requests")) or 60.0)
+        return synced
+
+    def pause(self, seconds: float):
+        """Hold every call back, e.g. after a 429 with retry-after"""
+        self.stats["rate_limited"] += 1
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._changed.set()
+
+    def snapshot(self) -> Dict:
+        now = time.monotonic()
+        if self.requests is not None:
+            self.requests.refill(now)
+        self.tokens.refill(now)
+        waiting = {priority: 0 for priority in PRIORITIES}
+        for _, _, priority, _, future in self._waiters:
+            if not future.done():
+                waiting[priority] += 1
+        return {
+            # None while requests are only limited by 429s
+            "requests_available": round(self.requests.level, 1) if self.requests is not None else None,
+            "requests_per_minute": self.requests.capacity if self.requests is not None else None,
+            "tokens_available": round(self.tokens.level),
+            "tokens_per_minute": self.tokens.capacity,
+            "paused_for": round(max(0.0, self._paused_until - now), 1),
+            "waiting": waiting,
+            **self.stats
+        }
+
+    def _wait_time(self, priority: str, tokens: int) -> float:
+        now = time.monotonic()
+        if now < self._paused_until:
+            return self._paused_until - now
+        self.tokens.refill(now)
+        reserve = self.reserve[priority]
+        wait = self.tokens.wait_for(tokens, self.tokens.capacity * reserve)
+        if self.requests is not None:
+            self.requests.refill(now)
+            wait = max(wait, self.requests.wait_for(1, self.requests.capacity * reserve))
+        return wait
+
+    def _take(self, priority: str, tokens: int):
+        if self.requests is not None:
+            self.requests.level -= 1
+        self.tokens.level -= tokens
+        self.stats[priority]["granted"] += 1
+
+    async def _dispatch(self):
+        """Release queued calls strictly by priority as the buckets refill"""
+        while self._waiters:
+            _, _, priority, tokens, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            wait = self._wait_time(priority, tokens)
+            if wait <= 0:
+                heapq.heappop(self._waiters)
+                self._take(priority, tokens)
+                future.set_result(None)
+                continue
+            # Sleep until the head fits, or something more urgent arrives
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=wait)
+            except asyncio.TimeoutError:
+                pass
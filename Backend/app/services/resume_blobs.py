@@ -0,0 +1,62 @@
+# backend/app/services/resume_blobs.py
+from datetime import datetime
+from typing import Dict, Optional
+
+from app.database.connection import get_db
+from app.services.resume_parser import PARSER_VERSION
+
+
+class ResumeBlobStore:
+    """Resume files deduplicated by content hash, remembering their Cloudinary upload and parser output"""
+
+    def __init__(self):
+        self.stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def is_current(blob: Optional[Dict]) -> bool:
+        """Whether the stored parse can be served as is"""
+        return bool(blob and blob.get("parsed") and blob.get("parser_version") == PARSER_VERSION)
+
+    async def lookup(self, digest: str) -> Optional[Dict]:
+        """Return the stored blob for these bytes, which only counts as a hit if its parse is current"""
+        database = get_db()
+        blob = await database.resume_blobs.find_one_and_update(
+            {"_id": digest},
+            {"$inc": {"hits": 1}, "$set": {"last_seen_at": datetime.utcnow()}}
+        )
+        self.stats["hits" if self.is_current(blob) else "misses"] += 1
+        return blob
+
+    async def record(self, digest: str, size: int, content_type: str, parsed: Dict, upload_id: str):
+        database = get_db()
+        await database.resume_blobs.update_one(
+            {"_id": digest},
+            {
+                "$set": {
+                    "size": size,
+                    "content_type": content_type,
+                    "parsed": parsed,
+                    "parser_version": PARSER_VERSION,
+                    "upload_id": upload_id,
+                    "last_seen_at": datetime.utcnow()
+                },
+                "$setOnInsert": {"hits": 0, "created_at": datetime.utcnow()}
+            },
+            upsert=True
+        )
+
+    async def attach_url(self, digest: str, resume_url: str):
+        database = get_db()
+        # Upsert: the upload can finish before the parse has been recorded
+        await database.resume_blobs.update_one(
+            {"_id": digest},
+            {
+                "$set": {"resume_url": resume_url},
+                "$setOnInsert": {"hits": 0, "created_at": datetime.utcnow()}
+            },
+            upsert=True
+        )
+
+    def hit_rate(self) -> float:
+        total = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / total if total else 0.0
@@ -2,21 +2,102 @@
 import PyPDF2
 from docx import Document
 import re
-from typing import Dict, Optional
+from typing import Dict, Optional, Set, Union
 import io
+import asyncio
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from app.config import settings
+
+# Bump when parse_resume output changes so stored parses of the same file are redone
+PARSER_VERSION = "1"
+
+# Parser instance reused by every job a pool worker runs
+_worker_parser = None
+
+
+def _parse_in_worker(file_content: Union[bytes, str], file_type: str, max_pages: int) -> Dict[str, Optional[str]]:
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = ResumeParser()
+    return _worker_parser.parse_resume_sync(file_content, file_type, max_pages)
+
 
 class ResumeParser:
-    def __init__(self):
+    def __init__(self, max_workers: Optional[int] = None):
         self.email_pattern = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
         self.phone_pattern = re.compile(r'[\+]?[(]?[0-9]{3}[)]?[-\s\.]?[(]?[0-9]{3}[)]?[-\s\.]?[0-9]{4,6}')
         self.name_indicators = ['name', 'Name', 'NAME']
+        
+        self.max_workers = max_workers or settings.RESUME_PARSER_WORKERS
+        self.max_pages = settings.RESUME_MAX_PAGES
+        self.timeout = settings.RESUME_PARSE_TIMEOUT
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._active: Set[Future] = set()
+        self.counters = {"submitted": 0, "completed": 0, "failed": 0, "timeouts": 0, "cancelled": 0}
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn, not fork: the parent has Mongo and HTTP client threads running
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
     
-    async def parse_resume(self, file_content: bytes, file_type: str) -> Dict[str, Optional[str]]:
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+    
+    def stats(self) -> Dict[str, float]:
+        running = sum(1 for future in self._active if future.running())
+        return {
+            "workers": self.max_workers,
+            "running": running,
+            "queued": len(self._active) - running,
+            "utilization": running / self.max_workers,
+            **self.counters
+        }
+    
+    async def parse_resume(self, file_content: Union[bytes, str], file_type: str) -> Dict[str, Optional[str]]:
+        """Extract information from resume in a worker process, off the event loop
+
+        file_content is either the raw bytes or a path to them on disk.
+        """
+        future = self._get_executor().submit(_parse_in_worker, file_content, file_type, self.max_pages)
+        self._active.add(future)
+        future.add_done_callback(self._active.discard)
+        self.counters["submitted"] += 1
+        
+        try:
+            # Cancelling this await (timeout or client disconnect) cancels the job if it hasn't started
+            result = await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self.counters["timeouts"] += 1
+            raise TimeoutError(f"Resume parsing took longer than {self.timeout}s")
+        except asyncio.CancelledError:
+            self.counters["cancelled"] += 1
+            raise
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed), start a fresh pool for the next upload
+            self.counters["failed"] += 1
+            self.shutdown()
+            raise
+        except Exception:
+            self.counters["failed"] += 1
+            raise
+        
+        self.counters["completed"] += 1
+        return result
+    
+    def parse_resume_sync(self, file_content: Union[bytes, str], file_type: str, max_pages: Optional[int] = None) -> Dict[str, Optional[str]]:
         """Extract information from resume"""
         text = ""
         
         if file_type == "application/pdf":
-            text = self._extract_pdf_text(file_content)
+            text = self._extract_pdf_text(file_content, max_pages)
         elif "wordprocessingml" in file_type or file_type.endswith("docx"):
             text = self._extract_docx_text(file_content)
         else:
@@ -29,17 +110,20 @@ class ResumeParser:
             "full_text": text
         }
     
-    def _extract_pdf_text(self, content: bytes) -> str:
-        """Extract text from PDF"""
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(content))
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text
+    @staticmethod
+    def _as_stream(content: Union[bytes, str]):
+        # Paths are opened lazily by the readers themselves
+        return content if isinstance(content, str) else io.BytesIO(content)
+    
+    def _extract_pdf_text(self, content: Union[bytes, str], max_pages: Optional[int] = None) -> str:
+        """Extract text from PDF, reading at most max_pages pages"""
+        pdf_reader = PyPDF2.PdfReader(self._as_stream(content))
+        pages = pdf_reader.pages if max_pages is None else pdf_reader.pages[:max_pages]
+        return "".join(page.extract_text() + "\n" for page in pages)
     
-    def _extract_docx_text(self, content: bytes) -> str:
+    def _extract_docx_text(self, content: Union[bytes, str]) -> str:
         """Extract text from DOCX"""
-        doc = Document(io.BytesIO(content))
+        doc = Document(self._as_stream(content))
         return "\n".join([paragraph.text for paragraph in doc.paragraphs])
     
     def _extract_email(self, text: str) -> Optional[str]:
@@ -0,0 +1,306 @@
+# backend/app/services/session_cache.py
+import asyncio
+import copy
+import os
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId, json_util
+from pymongo import ReturnDocument
+
+from app.config import settings
+
+
+# Candidates past these are written by the summary job, which may run on another worker
+FINISHED_STATUSES = ("scoring", "completed")
+
+# MongoDB round trips made through the cache by the current request, see count_round_trips()
+_request_round_trips: ContextVar[Optional[List[int]]] = ContextVar("session_round_trips", default=None)
+
+
+@contextmanager
+def count_round_trips():
+    """Count the session and candidate round trips made inside the block, including by tasks it spawns"""
+    counter = [0]
+    token = _request_round_trips.set(counter)
+    try:
+        yield counter
+    finally:
+        _request_round_trips.reset(token)
+
+
+class MemorySessionStore:
+    """Documents in an in-process LRU with a TTL, copied on the way in and out so callers can't alias them
+
+    Each worker has its own copy and doesn't see the others' writes, so this
+    is meant for a single worker; run several workers with Redis. A copy that
+    another worker has moved on is still caught when an answer is routed, by
+    its question_id or a failed claim.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, doc = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return copy.deepcopy(doc)
+
+    async def set(self, key: str, doc: Dict):
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, copy.deepcopy(doc))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str):
+        self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class NullSessionStore:
+    """Caches nothing, so every read goes to MongoDB; for several workers without Redis"""
+
+    async def get(self, key: str) -> Optional[Dict]:
+        return None
+
+    async def set(self, key: str, doc: Dict):
+        pass
+
+    async def delete(self, key: str):
+        pass
+
+    def __len__(self) -> int:
+        return 0
+
+
+class RedisSessionStore:
+    """Documents as extended JSON in Redis with a TTL, shared by every worker"""
+
+    def __init__(self, client, ttl_seconds: int, prefix: str = "session-cache:"):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[Dict]:
+        raw = await self.client.get(self.prefix + key)
+        return json_util.loads(raw) if raw else None
+
+    async def set(self, key: str, doc: Dict):
+        await self.client.set(self.prefix + key, json_util.dumps(doc), ex=self.ttl_seconds)
+
+    async def delete(self, key: str):
+        await self.client.delete(self.prefix + key)
+
+
+def _resolve(doc: Dict, path: str) -> Tuple[Any, Any]:
+    """Container and key a dotted Mongo path like "questions.3.answer" points at"""
+    parts = path.split(".")
+    target = doc
+    for part in parts[:-1]:
+        target = target[int(part)] if isinstance(target, list) else target.setdefault(part, {})
+    last = parts[-1]
+    return target, int(last) if isinstance(target, list) else last
+
+
+def apply_update(doc: Dict, update: Dict) -> bool:
+    """Replay a $set/$unset/$push/$inc update on a cached document; False if it can't be mirrored"""
+    if set(update) - {"$set", "$unset", "$push", "$inc"}:
+        return False
+    try:
+        for path, value in update.get("$set", {}).items():
+            target, key = _resolve(doc, path)
+            target[key] = copy.deepcopy(value)
+        for path in update.get("$unset", {}):
+            target, key = _resolve(doc, path)
+            if isinstance(target, dict):
+                target.pop(key, None)
+        for path, value in update.get("$push", {}).items():
+            target, key = _resolve(doc, path)
+            target.setdefault(key, []).append(copy.deepcopy(value))
+        for path, value in update.get("$inc", {}).items():
+            target, key = _resolve(doc, path)
+            target[key] = target.get(key, 0) + value
+    except (IndexError, KeyError, TypeError, ValueError):
+        return False
+    return True
+
+
+class SessionCache:
+    """Write-through cache of in-progress sessions and their candidates; MongoDB stays the source of truth"""
+
+    def __init__(self, store=None):
+        self.store = store or self._store_from_settings()
+        self.stats = {
+            "session_hits": 0, "session_misses": 0,
+            "candidate_hits": 0, "candidate_misses": 0,
+            "invalidations": 0, "round_trips": 0,
+            "answers": 0, "answer_round_trips": 0
+        }
+        # One lock per cached document so concurrent writers in this process don't lose each other's updates
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+    @staticmethod
+    def _store_from_settings():
+        if settings.SESSION_CACHE_BACKEND == "redis":
+            import redis.asyncio as redis
+
+            if not settings.REDIS_URL:
+                raise RuntimeError("SESSION_CACHE_BACKEND=redis requires REDIS_URL")
+            return RedisSessionStore(redis.from_url(settings.REDIS_URL), settings.SESSION_CACHE_TTL_SECONDS)
+        if settings.SESSION_CACHE_BACKEND == "none":
+            return NullSessionStore()
+        # uvicorn and gunicorn both take their worker count from WEB_CONCURRENCY
+        if int(os.environ.get("WEB_CONCURRENCY", "1") or 1) > 1:
+            print("Warning: SESSION_CACHE_BACKEND=memory isn't shared between workers, caching no sessions; use redis to cache with several")
+            return NullSessionStore()
+        return MemorySessionStore(settings.SESSION_CACHE_SIZE, settings.SESSION_CACHE_TTL_SECONDS)
+
+    async def get_session(self, database, session_id: str) -> Optional[Dict]:
+        return await self._get(database.sessions, "session", session_id)
+
+    async def get_candidate(self, database, candidate_id: str) -> Optional[Dict]:
+        return await self._get(database.candidates, "candidate", candidate_id)
+
+    async def put_session(self, session: Dict):
+        """Cache a session read or created elsewhere; completed sessions are left to MongoDB"""
+        if not self._cacheable(session):
+            return
+        await self._safe(self.store.set(f"session:{session['_id']}", session))
+
+    async def reload_session(self, database, session_id: str) -> Optional[Dict]:
+        """Read the session from MongoDB, for when another worker may have changed it"""
+        await self.evict_session(session_id)
+        return await self.get_session(database, session_id)
+
+    async def transition_session(self, database, session_id: str, condition: Dict, update: Dict) -> Optional[Dict]:
+        """Apply the update only if the session still matches condition, returning the new document or None"""
+        key = f"session:{session_id}"
+        async with self._lock(key):
+            self._count()
+            try:
+                session = await database.sessions.find_one_and_update(
+                    {"_id": ObjectId(session_id), **condition},
+                    update,
+                    return_document=ReturnDocument.AFTER
+                )
+            except Exception:
+                await self._invalidate(key)
+                raise
+            if session is None:
+                # Another attempt moved the session on first
+                await self._invalidate(key)
+            elif session.get("is_completed"):
+                await self._safe(self.store.delete(key))
+            else:
+                # MongoDB's copy replaces ours outright
+                await self._safe(self.store.set(key, session))
+        return session
+
+    async def update_candidate(self, database, candidate_id: str, update: Dict) -> bool:
+        return await self._update(database.candidates, "candidate", candidate_id, update)
+
+    async def evict_session(self, session_id: str):
+        await self._safe(self.store.delete(f"session:{session_id}"))
+
+    async def evict_candidate(self, candidate_id: str):
+        await self._safe(self.store.delete(f"candidate:{candidate_id}"))
+
+    def record_answer(self, round_trips: int):
+        self.stats["answers"] += 1
+        self.stats["answer_round_trips"] += round_trips
+
+    def round_trips_per_answer(self) -> float:
+        answers = self.stats["answers"]
+        return self.stats["answer_round_trips"] / answers if answers else 0.0
+
+    def hit_ratios(self) -> Dict[str, float]:
+        ratios = {}
+        for kind in ("session", "candidate"):
+            hits, misses = self.stats[f"{kind}_hits"], self.stats[f"{kind}_misses"]
+            ratios[kind] = hits / (hits + misses) if hits + misses else 0.0
+        return ratios
+
+    async def _get(self, collection, kind: str, doc_id: str) -> Optional[Dict]:
+        key = f"{kind}:{doc_id}"
+        doc = await self._safe(self.store.get(key))
+        if doc is not None:
+            self.stats[f"{kind}_hits"] += 1
+            return doc
+
+        self.stats[f"{kind}_misses"] += 1
+        self._count()
+        doc = await collection.find_one({"_id": ObjectId(doc_id)})
+        if doc is not None and self._cacheable(doc):
+            await self._safe(self.store.set(key, doc))
+        return doc
+
+    async def _update(self, collection, kind: str, doc_id: str, update: Dict) -> bool:
+        """Write to MongoDB, then mirror the update on the cached copy, or drop it if that isn't possible"""
+        key = f"{kind}:{doc_id}"
+        async with self._lock(key):
+            self._count()
+            try:
+                result = await collection.update_one({"_id": ObjectId(doc_id)}, update)
+            except Exception:
+                # Unknown whether the write landed
+                await self._invalidate(key)
+                raise
+            if not result.matched_count:
+                # The document is gone, so is the cached copy
+                await self._invalidate(key)
+                return False
+
+            doc = await self._safe(self.store.get(key))
+            if doc is None:
+                return True
+            if not apply_update(doc, update):
+                await self._invalidate(key)
+            elif self._cacheable(doc):
+                await self._safe(self.store.set(key, doc))
+            else:
+                await self._safe(self.store.delete(key))
+        return True
+
+    @staticmethod
+    def _cacheable(doc: Dict) -> bool:
+        """Only in-progress interviews are cached"""
+        return not doc.get("is_completed") and doc.get("status") not in FINISHED_STATUSES
+
+    def _lock(self, key: str) -> asyncio.Lock:
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    def _count(self):
+        self.stats["round_trips"] += 1
+        counter = _request_round_trips.get()
+        if counter is not None:
+            counter[0] += 1
+
+    async def _invalidate(self, key: str):
+        self.stats["invalidations"] += 1
+        await self._safe(self.store.delete(key))
+
+    @staticmethod
+    async def _safe(awaitable):
+        # A cache outage only costs a MongoDB read
+        try:
+            return await awaitable
+        except Exception as e:
+            print(f"Error accessing session cache: {e}")
+            return None
@@ -0,0 +1,183 @@
+# backend/app/services/upload_spool.py
+import asyncio
+import glob
+import hashlib
+import io
+import os
+import tempfile
+import time
+import uuid
+from typing import BinaryIO, List, Optional, Union
+
+from fastapi import UploadFile
+
+from app.config import settings
+
+
+# Spool files are named so a sweep can find the ones a dead worker left behind
+SPOOL_PREFIX = "resume_"
+
+
+class UploadTooLargeError(Exception):
+    pass
+
+
+def stale_spool_files(older_than: float) -> List[str]:
+    """Spool files in the temp directory untouched for older_than seconds"""
+    cutoff = time.time() - older_than
+    paths = []
+    for path in glob.glob(os.path.join(tempfile.gettempdir(), f"{SPOOL_PREFIX}*")):
+        try:
+            if os.path.getmtime(path) < cutoff:
+                paths.append(path)
+        except FileNotFoundError:
+            pass
+    return paths
+
+
+class ResumeUpload:
+    """An uploaded resume kept in memory while small and spooled to a temp file on disk past a threshold"""
+
+    def __init__(self, filename: str, content_type: str, max_size: Optional[int] = None, spool_threshold: Optional[int] = None):
+        self.filename = filename
+        self.content_type = content_type
+        self.max_size = max_size or settings.RESUME_MAX_BYTES
+        # 0 sends everything to disk, for uploads that may wait a long time in a queue
+        self.spool_threshold = settings.RESUME_SPOOL_THRESHOLD if spool_threshold is None else spool_threshold
+        self.size = 0
+        self._refs = 1
+        self._hasher = hashlib.sha256()
+        self.sha256: Optional[str] = None
+
+        self._buffer: Optional[io.BytesIO] = io.BytesIO()
+        self._data: Optional[Union[bytes, memoryview]] = None
+        self._file = None
+
+    @classmethod
+    async def from_upload(cls, upload: UploadFile, max_size: Optional[int] = None, spool_threshold: Optional[int] = None) -> "ResumeUpload":
+        """Take over the file Starlette already spooled the upload into rather than copying it into another
+
+        The request body limit stops oversized uploads while they arrive,
+        max_size is checked again on the file itself.
+        """
+        spool = cls(upload.filename or "resume", upload.content_type, max_size, spool_threshold)
+        try:
+            # Reads of a file rolled to disk block, keep them off the event loop
+            await asyncio.to_thread(spool._adopt, upload.file)
+        except BaseException:
+            spool.close()
+            raise
+        return spool
+
+    def _adopt(self, source: BinaryIO):
+        source.seek(0, os.SEEK_END)
+        size = source.tell()
+        if size > self.max_size:
+            raise UploadTooLargeError(f"Resume exceeds the {self.max_size // (1024 * 1024)} MB limit")
+        source.seek(0)
+
+        # Starlette keeps small uploads in memory and rolls larger ones to an anonymous temp file
+        rolled = getattr(source, "_rolled", False)
+        if rolled and self._link(source):
+            # Already on disk under our name, only read through to hash it
+            while chunk := source.read(settings.RESUME_UPLOAD_CHUNK_SIZE):
+                self._hasher.update(chunk)
+            self.size = size
+        elif not rolled and size <= self.spool_threshold:
+            # Starlette's buffer goes with the request, so this one read is the only copy
+            self._data = source.read()
+            self._hasher.update(self._data)
+            self.size = size
+            self._buffer = None
+        else:
+            while chunk := source.read(settings.RESUME_UPLOAD_CHUNK_SIZE):
+                self.write(chunk)
+        self.finish()
+
+    def _link(self, source: BinaryIO) -> bool:
+        """Name Starlette's anonymous temp file by hard-linking it into the temp dir, so it outlives the request"""
+        _, ext = os.path.splitext(self.filename)
+        path = os.path.join(tempfile.gettempdir(), f"{SPOOL_PREFIX}{uuid.uuid4().hex}{ext}")
+        try:
+            source.flush()
+            os.link(f"/proc/self/fd/{source.fileno()}", path)
+        except OSError:
+            # No /proc outside Linux, and not every filesystem links an unlinked file; copy it instead
+            return False
+        self._file = open(path, "rb")
+        self._buffer = None
+        return True
+
+    @classmethod
+    def from_spool(cls, path: str, filename: str, content_type: str, sha256: str) -> "ResumeUpload":
+        """Reopen a spool file written by an earlier process, e.g. to retry its upload after a restart"""
+        spool = cls(filename, content_type)
+        spool._buffer = None
+        spool._file = open(path, "rb")
+        spool.size = os.path.getsize(path)
+        spool.sha256 = sha256
+        return spool
+
+    def write(self, chunk: bytes):
+        self.size += len(chunk)
+        if self.size > self.max_size:
+            raise UploadTooLargeError(f"Resume exceeds the {self.max_size // (1024 * 1024)} MB limit")
+
+        if self._file is None and self.size > self.spool_threshold:
+            _, ext = os.path.splitext(self.filename)
+            self._file = tempfile.NamedTemporaryFile(prefix=SPOOL_PREFIX, suffix=ext, delete=False)
+            self._file.write(self._buffer.getbuffer())
+            self._buffer = None
+
+        (self._file or self._buffer).write(chunk)
+        self._hasher.update(chunk)
+
+    def finish(self):
+        self.sha256 = self._hasher.hexdigest()
+        if self._file is not None:
+            self._file.flush()
+        elif self._buffer is not None:
+            # A view of the buffer rather than a copy of it
+            self._data = self._buffer.getbuffer()
+            self._buffer = None
+
+    @property
+    def path(self) -> Optional[str]:
+        return self._file.name if self._file is not None else None
+
+    def source(self) -> Union[bytes, str]:
+        """What the parser reads: the temp file path when spooled, so worker processes don't get a pickled copy"""
+        if self.path:
+            return self.path
+        # The parser's process pool pickles its arguments, which takes bytes
+        return self._data.tobytes() if isinstance(self._data, memoryview) else self._data
+
+    def open(self) -> BinaryIO:
+        """A fresh read handle over the same bytes; BytesIO shares the buffer until written to"""
+        if self._file is not None:
+            return open(self._file.name, "rb")
+        return io.BytesIO(self._data)
+
+    def retain(self) -> "ResumeUpload":
+        """Take another reference for a consumer that outlives the request, e.g. a background upload"""
+        self._refs += 1
+        return self
+
+    def release(self):
+        """Drop a reference, deleting the spooled data once nobody holds one"""
+        self._refs -= 1
+        if self._refs <= 0:
+            self.close()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            try:
+                os.unlink(self._file.name)
+            except FileNotFoundError:
+                pass
+            self._file = None
+        if isinstance(self._data, memoryview):
+            self._data.release()
+        self._buffer = None
+        self._data = None
@@ -0,0 +1,511 @@
+# backend/benchmarks/load_test.py
+"""End-to-end load test of one API worker
+
+Starts the app under uvicorn in a child process with Groq, Cloudinary and
+MongoDB replaced by local stand-ins, then runs simulated candidates through
+the whole flow: upload-resume, create-or-check-candidate, start-interview, a
+WebSocket on the session, six submit-answer calls and the summary_ready frame.
+
+    python -m benchmarks.load_test --candidates 200 --concurrency 50
+    python -m benchmarks.load_test --groq-latency lognormal:1.2,0.5 --cloudinary-latency uniform:0.5,2
+    python -m benchmarks.load_test --groq-rpm 30 --groq-tpm 12000    # Groq's free-tier limits
+    python -m benchmarks.load_test --url http://localhost:8000    # an already running server, stand-ins not applied
+
+Latencies are "fixed:S", "uniform:LOW,HIGH" or "lognormal:MEDIAN,SIGMA" in
+seconds. Each run is appended to benchmarks/results/load_test.jsonl with the
+git commit, and compared with the last run that used the same options.
+The stand-ins need mongomock-motor (pip install mongomock-motor).
+"""
+import argparse
+import asyncio
+import io
+import json
+import math
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+RESULTS_FILE = Path(__file__).parent / "results" / "load_test.jsonl"
+
+# What the simulated candidates type, by difficulty
+ANSWERS = {
+    "easy": ["useState", "npm init", "the PATCH method", "I am not sure"],
+    "medium": [
+        "Middleware functions run in order on each request and can modify req and res or end the cycle by calling next.",
+        "The virtual DOM lets React diff a lightweight tree and only patch the parts of the real DOM that changed.",
+        "closures",
+    ],
+    "hard": [
+        "State updates are batched and applied asynchronously, so reading state right after setState returns the old "
+        "value; use the functional updater form when the next state depends on the previous one, and useEffect to "
+        "react to the committed value.",
+        "Clear timers and intervals, remove event listeners, close database connections and avoid unbounded caches or "
+        "global arrays; heap snapshots in Chrome DevTools help find what is retaining memory.",
+        "",
+    ],
+}
+
+
+def latency_sampler(spec: str) -> Callable[[], float]:
+    """Parse a latency distribution like "lognormal:0.8,0.4" into a function drawing seconds from it"""
+    kind, _, args = spec.partition(":")
+    params = [float(p) for p in args.split(",") if p]
+    if kind == "fixed" and len(params) == 1:
+        return lambda: params[0]
+    if kind == "uniform" and len(params) == 2:
+        return lambda: random.uniform(params[0], params[1])
+    if kind == "lognormal" and len(params) == 2:
+        return lambda: random.lognormvariate(math.log(params[0]), params[1])
+    raise argparse.ArgumentTypeError(f"invalid latency distribution: {spec}")
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))]
+
+
+# --- Server side: the app with local stand-ins ---------------------------------
+
+class FakeRawResponse:
+    def __init__(self, headers: Dict[str, str], parsed):
+        self.headers = headers
+        self._parsed = parsed
+
+    async def parse(self):
+        return self._parsed
+
+
+class FakeGroqCompletions:
+    """Answers chat.completions.create after a sampled delay with JSON shaped like each prompt expects
+
+    with_raw_response.create also returns x-ratelimit headers like Groq's:
+    requests against a day's worth of requests_per_minute, tokens against
+    tokens_per_minute over a sliding minute.
+    """
+
+    def __init__(self, latency: Callable[[], float], requests_per_minute: int, tokens_per_minute: int):
+        self.latency = latency
+        self.requests_per_day = requests_per_minute * 1440
+        self.tokens_per_minute = tokens_per_minute
+        self.questions = 0
+        self.requests = 0
+        self._used: List[tuple] = []
+
+    @property
+    def with_raw_response(self):
+        return self
+
+    def _headers(self, tokens: int) -> Dict[str, str]:
+        now = time.monotonic()
+        self._used = [(at, used) for at, used in self._used if at > now - 60] + [(now, tokens)]
+        self.requests += 1
+        return {
+            "x-ratelimit-limit-requests": str(self.requests_per_day),
+            "x-ratelimit-remaining-requests": str(max(0, self.requests_per_day - self.requests)),
+            "x-ratelimit-limit-tokens": str(self.tokens_per_minute),
+            "x-ratelimit-remaining-tokens": str(max(0, self.tokens_per_minute - sum(used for _, used in self._used)))
+        }
+
+    async def create(self, stream: bool = False, **kwargs):
+        response, tokens = await self._create(stream, **kwargs)
+        return FakeRawResponse(self._headers(tokens), response)
+
+    async def _create(self, stream: bool = False, **kwargs):
+        from groq.types.chat import ChatCompletion, ChatCompletionChunk
+
+        delay = self.latency()
+        prompt = kwargs["messages"][-1]["content"]
+        content = self._content(prompt)
+        usage = {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4, "total_tokens": (len(prompt) + len(content)) // 4}
+
+        if not stream:
+            await asyncio.sleep(delay)
+            return ChatCompletion.model_validate({
+                "id": "fake", "created": int(time.time()), "model": kwargs.get("model", "fake"), "object": "chat.completion",
+                "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+                "usage": usage
+            }), usage["total_tokens"]
+
+        pieces = [content[i:i + 24] for i in range(0, len(content), 24)] or [""]
+
+        async def chunks():
+            # Time to first token, then the rest spread over the remaining time
+            await asyncio.sleep(delay * 0.3)
+            for i, piece in enumerate(pieces):
+                last = i == len(pieces) - 1
+                yield ChatCompletionChunk.model_validate({
+                    "id": "fake", "created": int(time.time()), "model": kwargs.get("model", "fake"), "object": "chat.completion.chunk",
+                    "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": "stop" if last else None}],
+                    "x_groq": {"id": "fake", "usage": usage} if last else {"id": "fake"}
+                })
+                await asyncio.sleep(delay * 0.7 / len(pieces))
+
+        return chunks(), usage["total_tokens"]
+
+    def _content(self, prompt: str) -> str:
+        if "interview question" in prompt:
+            self.questions += 1
+            difficulty = re.search(r"Generate ONE (\w+)", prompt).group(1).lower()
+            return json.dumps({
+                "question": f"Synthetic {difficulty} question #{self.questions} about React state?",
+                "expected_topics": ["state", "render"],
+                "hints": [],
+                "accepted_answers": ["useState", "npm init", "PATCH"] if difficulty == "easy" else [],
+                "time_limit": 20
+            })
+        if "grading a complete technical interview" in prompt:
+            numbers = [int(n) for n in re.findall(r"Q(\d+)", prompt.split("Grade these questions:")[1].split(".")[0])]
+            maxima = [int(m) for m in re.findall(r"max (\d+) marks\)", prompt)]
+            return json.dumps({
+                "evaluations": [
+                    {"question": n, "score": random.randint(0, maxima[n - 1]), "feedback": "Reasonable answer."}
+                    for n in numbers
+                ],
+                "summary": "The candidate showed solid fundamentals with some gaps in depth. Recommended for a follow-up round."
+            })
+        match = re.search(r"worth maximum (\d+) marks", prompt)
+        if match:
+            return json.dumps({
+                "score": random.randint(0, int(match.group(1))),
+                "feedback": "The answer covers the main idea but misses some detail.",
+                "strengths": ["Understands the core concept"],
+                "improvements": ["Give a concrete example"],
+                "topics_covered": ["state"]
+            })
+        return "The candidate showed solid fundamentals with some gaps in depth. Recommended for a follow-up round."
+
+
+def serve(args):
+    """Run the app on args.port with the stand-ins in place of external services"""
+    for name in ("GROQ_API_KEY", "CLOUDINARY_CLOUD_NAME", "CLOUDINARY_API_KEY", "CLOUDINARY_API_SECRET"):
+        os.environ.setdefault(name, "load-test")
+    os.environ.setdefault("MONGODB_URL", "mongodb://load-test")
+    os.environ.setdefault("DATABASE_NAME", "load_test")
+    os.environ["GROQ_REQUESTS_PER_MINUTE"] = str(args.groq_rpm)
+    os.environ["GROQ_TOKENS_PER_MINUTE"] = str(args.groq_tpm)
+
+    import uvicorn
+    from mongomock_motor import AsyncMongoMockClient
+
+    import app.main as main
+    from app.database import connection
+    from app.routers import interview
+
+    async def connect_in_memory():
+        connection.db.client = AsyncMongoMockClient()
+        connection.db.database = connection.db.client[os.environ["DATABASE_NAME"]]
+        await connection.create_indexes()
+
+    cloudinary_latency = latency_sampler(args.cloudinary_latency)
+
+    async def fake_upload(file_content, filename: str) -> Dict[str, str]:
+        await asyncio.sleep(cloudinary_latency())
+        public_id = f"resumes/{filename.split('.')[0]}_{int(time.time())}"
+        return {"url": f"https://res.cloudinary.test/raw/upload/{public_id}", "public_id": public_id}
+
+    main.connect_to_mongo = connect_in_memory
+    interview.groq_service.client.chat.completions = FakeGroqCompletions(latency_sampler(args.groq_latency), args.groq_rpm, args.groq_tpm)
+    interview.cloudinary_service.upload_resume = fake_upload
+    uvicorn.run(main.app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+# --- Client side: simulated candidates ------------------------------------------
+
+FIRST_NAMES = ["Asha", "Ben", "Chen", "Dana", "Elif", "Farid", "Grace", "Hugo", "Ines", "Jonas"]
+LAST_NAMES = ["Kumar", "Lopez", "Mensah", "Novak", "Okafor", "Park", "Quinn", "Rossi", "Sato", "Tanaka"]
+
+
+def candidate_name(index: int) -> str:
+    return f"{FIRST_NAMES[index % 10]} {LAST_NAMES[index // 10 % 10]}"
+
+
+def resume_docx(index: int) -> bytes:
+    from docx import Document
+
+    document = Document()
+    document.add_paragraph(candidate_name(index))
+    document.add_paragraph(f"Email: candidate{index}.{os.getpid()}@loadtest.example")
+    document.add_paragraph(f"Phone: +1 555 {index % 1000:03d} {index % 10000:04d}")
+    document.add_paragraph("Full-stack developer, five years of React and Node.js. " * 20)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+class Recorder:
+    def __init__(self):
+        self.timings: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.round_trips: List[int] = []
+        self.ws_frames = 0
+
+    async def timed(self, name: str, awaitable):
+        started = time.perf_counter()
+        try:
+            result = await awaitable
+        except Exception:
+            self.errors[name] = self.errors.get(name, 0) + 1
+            raise
+        self.timings.setdefault(name, []).append(time.perf_counter() - started)
+        return result
+
+    def request(self, name: str, response):
+        if response.status_code >= 400:
+            self.errors[name] = self.errors.get(name, 0) + 1
+            response.raise_for_status()
+        return response.json()
+
+
+async def candidate(client, ws_url: str, index: int, recorder: Recorder, args):
+    import websockets
+
+    docx_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+    response = await recorder.timed("upload-resume", client.post(
+        "/api/interview/upload-resume", files={"file": (f"resume{index}.docx", resume_docx(index), docx_type)}
+    ))
+    parsed = recorder.request("upload-resume", response)["parsedData"]
+
+    # Whatever the parser missed, the candidate types in
+    details = {
+        **{k: v for k, v in parsed.items() if v},
+        "name": parsed["name"] or candidate_name(index),
+        "email": parsed["email"] or f"candidate{index}.{os.getpid()}@loadtest.example",
+        "phone": parsed["phone"] or "+1 555 000 0000"
+    }
+    response = await recorder.timed("create-or-check-candidate", client.post(
+        "/api/interview/create-or-check-candidate", json=details
+    ))
+    candidate_id = recorder.request("create-or-check-candidate", response)["candidateId"]
+
+    params = {"grading_mode": args.grading_mode} if args.grading_mode else None
+    response = await recorder.timed("start-interview", client.post(f"/api/interview/start-interview/{candidate_id}", params=params))
+    started = recorder.request("start-interview", response)
+    session_id, question = started["session_id"], started["question"]
+
+    summary_ready = asyncio.get_running_loop().create_future()
+    async with websockets.connect(f"{ws_url}/ws/{session_id}") as ws:
+        async def read_frames():
+            async for raw in ws:
+                recorder.ws_frames += 1
+                if json.loads(raw).get("type") == "summary_ready" and not summary_ready.done():
+                    summary_ready.set_result(time.perf_counter())
+
+        reader = asyncio.create_task(read_frames())
+        try:
+            result = {}
+            for _ in range(6):
+                answer = random.choice(ANSWERS[question["difficulty"]])
+                await ws.send(json.dumps({"type": "answer_update", "data": {"answer": answer}}))
+                if args.think_time:
+                    await asyncio.sleep(random.uniform(0, args.think_time))
+                response = await recorder.timed("submit-answer", client.post(
+                    f"/api/interview/submit-answer/{session_id}", json={"answer": answer}
+                ))
+                result = recorder.request("submit-answer", response)
+                if "X-Session-Round-Trips" in response.headers:
+                    recorder.round_trips.append(int(response.headers["X-Session-Round-Trips"]))
+                question = result.get("next_question") or question
+
+            completed_at = time.perf_counter()
+            try:
+                ready_at = await asyncio.wait_for(summary_ready, args.summary_timeout)
+                recorder.timings.setdefault("summary_ready", []).append(ready_at - completed_at)
+            except asyncio.TimeoutError:
+                recorder.errors["summary_ready"] = recorder.errors.get("summary_ready", 0) + 1
+        finally:
+            reader.cancel()
+
+
+async def drive(base_url: str, args) -> Dict:
+    import httpx
+
+    recorder = Recorder()
+    ws_url = "ws" + base_url[len("http"):]
+    limit = asyncio.Semaphore(args.concurrency)
+    failed = 0
+
+    async def one(client, index):
+        nonlocal failed
+        async with limit:
+            try:
+                await candidate(client, ws_url, index, recorder, args)
+            except Exception as e:
+                failed += 1
+                print(f"Error in simulated candidate {index}: {e!r}", file=sys.stderr)
+
+    connections = httpx.Limits(max_connections=args.concurrency * 2, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.request_timeout, limits=connections) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*[one(client, i) for i in range(args.candidates)])
+        elapsed = time.perf_counter() - started
+        health = (await client.get("/health")).json()
+
+    requests = sum(len(v) for k, v in recorder.timings.items() if k != "summary_ready")
+    return {
+        "candidates": args.candidates,
+        "completed": args.candidates - failed,
+        "failed": failed,
+        "elapsed_seconds": round(elapsed, 3),
+        "interviews_per_second": round((args.candidates - failed) / elapsed, 3),
+        "requests_per_second": round(requests / elapsed, 3),
+        "websocket_frames": recorder.ws_frames,
+        "round_trips_per_answer": round(sum(recorder.round_trips) / len(recorder.round_trips), 3) if recorder.round_trips else None,
+        "endpoints": {
+            name: {
+                "count": len(values),
+                "errors": recorder.errors.get(name, 0),
+                "p50_ms": round(percentile(values, 50) * 1000, 1),
+                "p95_ms": round(percentile(values, 95) * 1000, 1),
+                "p99_ms": round(percentile(values, 99) * 1000, 1),
+                "max_ms": round(max(values) * 1000, 1)
+            }
+            for name, values in recorder.timings.items()
+        },
+        "server": {key: health.get(key) for key in ("groq", "resume_parser", "session_cache", "local_scorer")}
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def wait_until_up(base_url: str, server: subprocess.Popen, timeout: float = 60):
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise RuntimeError(f"load-test server exited with {server.returncode}")
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError("load-test server did not come up")
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, cwd=Path(__file__).parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def options_key(args) -> Dict:
+    return {
+        "candidates": args.candidates, "concurrency": args.concurrency, "think_time": args.think_time,
+        "grading_mode": args.grading_mode, "groq_latency": args.groq_latency,
+        "cloudinary_latency": args.cloudinary_latency, "groq_rpm": args.groq_rpm, "groq_tpm": args.groq_tpm,
+        "url": args.url
+    }
+
+
+def previous_run(options: Dict) -> Optional[Dict]:
+    if not RESULTS_FILE.exists():
+        return None
+    previous = None
+    with open(RESULTS_FILE, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                run = json.loads(line)
+                if run.get("options") == options:
+                    previous = run
+    return previous
+
+
+def print_report(results: Dict, previous: Optional[Dict]):
+    def delta(now, before):
+        if before in (None, 0) or now is None:
+            return ""
+        return f" ({(now - before) / before:+.0%})"
+
+    before = (previous or {}).get("results", {})
+    print(f"{results['completed']}/{results['candidates']} interviews in {results['elapsed_seconds']}s, "
+          f"{results['interviews_per_second']} interviews/s{delta(results['interviews_per_second'], before.get('interviews_per_second'))}, "
+          f"{results['requests_per_second']} requests/s")
+    if previous:
+        print(f"compared with {previous.get('commit') or 'unknown commit'} at {previous['timestamp']}")
+    print(f"{'endpoint':<26} {'count':>6} {'errors':>6} {'p50 ms':>14} {'p95 ms':>14} {'p99 ms':>14}")
+    for name, row in results["endpoints"].items():
+        old = before.get("endpoints", {}).get(name, {})
+        cells = [f"{row[p]:.1f}{delta(row[p], old.get(p))}" for p in ("p50_ms", "p95_ms", "p99_ms")]
+        print(f"{name:<26} {row['count']:>6} {row['errors']:>6} {cells[0]:>14} {cells[1]:>14} {cells[2]:>14}")
+    if results["round_trips_per_answer"] is not None:
+        print(f"MongoDB round trips per answer: {results['round_trips_per_answer']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", nargs="?", default="run", choices=["run", "serve"], help=argparse.SUPPRESS)
+    parser.add_argument("--candidates", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=25, help="interviews in progress at once")
+    parser.add_argument("--think-time", type=float, default=0.0, help="up to this many seconds before each answer")
+    parser.add_argument("--grading-mode", choices=["per_question", "deferred"])
+    parser.add_argument("--groq-latency", default="lognormal:0.8,0.4")
+    parser.add_argument("--cloudinary-latency", default="uniform:0.3,1.5")
+    # Well above what a run needs by default, so only the app itself is measured
+    parser.add_argument("--groq-rpm", type=int, default=100000, help="Groq requests per minute the app schedules within")
+    parser.add_argument("--groq-tpm", type=int, default=100000000, help="Groq tokens per minute, also reported by the stand-in")
+    parser.add_argument("--summary-timeout", type=float, default=60.0, help="seconds to wait for summary_ready")
+    parser.add_argument("--request-timeout", type=float, default=120.0)
+    parser.add_argument("--url", help="drive this server instead of starting one with stand-ins")
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--json", dest="json_out", help="also write this run's results to this file")
+    parser.add_argument("--no-save", action="store_true", help="don't append the run to the results history")
+    args = parser.parse_args()
+    for spec in (args.groq_latency, args.cloudinary_latency):
+        latency_sampler(spec)
+
+    if args.command == "serve":
+        serve(args)
+        return
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        port = free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        server = subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.load_test", "serve", "--port", str(port),
+             "--groq-latency", args.groq_latency, "--cloudinary-latency", args.cloudinary_latency,
+             "--groq-rpm", str(args.groq_rpm), "--groq-tpm", str(args.groq_tpm)],
+            cwd=Path(__file__).resolve().parent.parent
+        )
+    try:
+        if server is not None:
+            asyncio.run(wait_until_up(base_url, server))
+        results = asyncio.run(drive(base_url.rstrip("/"), args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    options = options_key(args)
+    print_report(results, previous_run(options))
+    run = {"timestamp": datetime.utcnow().isoformat(), "commit": git_commit(), "options": options, "results": results}
+    if not args.no_save:
+        RESULTS_FILE.parent.mkdir(exist_ok=True)
+        with open(RESULTS_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps(run) + "\n")
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(run, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
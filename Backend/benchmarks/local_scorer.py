@@ -0,0 +1,113 @@
+# backend/benchmarks/local_scorer.py
+"""Offline benchmark of the local scorer against LLM grades
+
+Replays answers the LLM already graded through LocalScorer and reports, per
+confidence threshold, how many LLM calls the cascade would have saved and how
+often its trusted scores agree with the LLM.
+
+    python -m benchmarks.local_scorer                      # graded answers from MongoDB sessions
+    python -m benchmarks.local_scorer --jsonl graded.jsonl # or from a file
+
+Each JSONL line holds question, answer, expected_topics, difficulty, score and
+optionally accepted_answers.
+"""
+import argparse
+import json
+from typing import Dict, Iterator, List
+
+from app.services.local_scorer import LocalScorer
+
+MAX_SCORES = {"easy": 2, "medium": 3, "hard": 5}
+
+
+def from_jsonl(path: str) -> Iterator[Dict]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def from_mongo(limit: int) -> Iterator[Dict]:
+    from pymongo import MongoClient
+
+    from app.config import settings
+
+    client = MongoClient(settings.MONGODB_URL)
+    sessions = client[settings.DATABASE_NAME].sessions.find(
+        {"questions.score": {"$ne": None}}, {"questions": 1}
+    ).limit(limit)
+    for session in sessions:
+        for question in session.get("questions", []):
+            # Only grades the LLM produced are ground truth
+            if question.get("score") is None or question.get("graded_by", "llm") != "llm":
+                continue
+            yield {
+                "question": question["text"],
+                "answer": question.get("answer"),
+                "expected_topics": question.get("expected_topics", []),
+                "accepted_answers": question.get("accepted_answers", []),
+                "difficulty": question["difficulty"],
+                "score": question["score"]
+            }
+
+
+def run(samples: List[Dict], thresholds: List[float]) -> List[Dict]:
+    scorer = LocalScorer()
+    scored = []
+    for sample in samples:
+        local = scorer.evaluate(
+            sample["question"],
+            sample.get("answer"),
+            sample.get("expected_topics", []),
+            sample["difficulty"],
+            MAX_SCORES.get(sample["difficulty"], 3),
+            sample.get("accepted_answers")
+        )
+        scored.append((local, sample))
+
+    report = []
+    for threshold in thresholds:
+        trusted = [(local, sample) for local, sample in scored if local["confidence"] >= threshold]
+        errors = [abs(local["score"] - sample["score"]) for local, sample in trusted]
+        report.append({
+            "threshold": threshold,
+            "answers": len(scored),
+            "llm_calls_saved": len(trusted),
+            "llm_call_reduction": len(trusted) / len(scored) if scored else 0.0,
+            "exact_agreement": sum(e == 0 for e in errors) / len(errors) if errors else None,
+            "within_one_mark": sum(e <= 1 for e in errors) / len(errors) if errors else None,
+            "mean_abs_error": sum(errors) / len(errors) if errors else None
+        })
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jsonl", help="graded answers file; defaults to reading MongoDB sessions")
+    parser.add_argument("--limit", type=int, default=1000, help="sessions to read from MongoDB")
+    parser.add_argument("--thresholds", default="0.5,0.6,0.7,0.8,0.9,0.95")
+    parser.add_argument("--json", dest="json_out", help="also write the report to this file")
+    args = parser.parse_args()
+
+    samples = list(from_jsonl(args.jsonl) if args.jsonl else from_mongo(args.limit))
+    report = run(samples, [float(t) for t in args.thresholds.split(",")])
+
+    def pct(value):
+        return "-" if value is None else f"{value:6.1%}"
+
+    print(f"{len(samples)} LLM-graded answers")
+    print(f"{'threshold':>9}  {'saved':>6}  {'reduction':>9}  {'exact':>7}  {'within 1':>8}  {'MAE':>5}")
+    for row in report:
+        mae = "-" if row["mean_abs_error"] is None else f"{row['mean_abs_error']:.2f}"
+        print(
+            f"{row['threshold']:>9.2f}  {row['llm_calls_saved']:>6}  {pct(row['llm_call_reduction']):>9}  "
+            f"{pct(row['exact_agreement']):>7}  {pct(row['within_one_mark']):>8}  {mae:>5}"
+        )
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# backend/tests/conftest.py
+import asyncio
+import itertools
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+# Settings are read at import time, tests never reach the real services
+for name in ("GROQ_API_KEY", "CLOUDINARY_CLOUD_NAME", "CLOUDINARY_API_KEY", "CLOUDINARY_API_SECRET"):
+    os.environ.setdefault(name, "test")
+os.environ.setdefault("MONGODB_URL", "mongodb://test")
+os.environ.setdefault("DATABASE_NAME", "test")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+class InterviewEnv:
+    """The interview router on an in-memory MongoDB, with Groq and the question pool replaced by stubs"""
+
+    def __init__(self, interview, database):
+        self.interview = interview
+        self.database = database
+        self.evaluations = []
+        self.summaries = []
+        self.evaluation_delay = 0.0
+        self._questions = itertools.count(1)
+
+    async def get_question(self, difficulty, previous_questions=None):
+        number = next(self._questions)
+        return {"question": f"{difficulty} question {number}", "expected_topics": ["topic"], "hints": [], "time_limit": 60}
+
+    async def evaluate_answer(self, question, answer, expected_topics, difficulty="medium", **kwargs):
+        self.evaluations.append((question, answer))
+        if self.evaluation_delay:
+            await asyncio.sleep(self.evaluation_delay)
+        return {"score": 1, "feedback": "ok", "strengths": [], "improvements": [], "topics_covered": []}
+
+    async def create_candidate(self) -> str:
+        result = await self.database.candidates.insert_one(
+            {"name": "Test Candidate", "email": f"candidate{next(self._questions)}@example.com", "phone": "555 0100", "status": "ready"}
+        )
+        return str(result.inserted_id)
+
+    async def session(self, session_id: str):
+        from bson import ObjectId
+        return await self.database.sessions.find_one({"_id": ObjectId(session_id)})
+
+
+@pytest.fixture
+def interview_env(monkeypatch):
+    from app.database import connection
+    from app.routers import interview
+    from app.services.session_cache import SessionCache
+    from app.services.single_flight import SingleFlight
+
+    client = AsyncMongoMockClient()
+    monkeypatch.setattr(connection.db, "client", client)
+    monkeypatch.setattr(connection.db, "database", client["test"])
+    env = InterviewEnv(interview, client["test"])
+
+    # Each test starts with cold caches, as a fresh worker would
+    monkeypatch.setattr(interview, "session_cache", SessionCache())
+    monkeypatch.setattr(interview, "answer_flights", SingleFlight())
+    monkeypatch.setattr(interview.question_pool, "get_question", env.get_question)
+    monkeypatch.setattr(interview.groq_service, "evaluate_answer", env.evaluate_answer)
+    # Summaries are the job queue's business, only record that one was queued
+    monkeypatch.setattr(interview.summary_queue, "submit", lambda func, *args, **kwargs: env.summaries.append(args))
+    return env
@@ -0,0 +1,71 @@
+# backend/tests/test_broker.py
+import asyncio
+
+import fakeredis
+from fakeredis.aioredis import FakeRedis
+
+from app.services.broker import RedisBroker
+
+
+def _broker(server):
+    broker = RedisBroker(FakeRedis(server=server), channel="test-fanout", batch_interval=0.001, max_reconnect_delay=0.2)
+    received = []
+    broker.bind(lambda topic, text, coalesce_key: received.append((topic, text, coalesce_key)))
+    return broker, received
+
+
+async def _until(condition, timeout: float = 5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+def test_fan_out_reaches_every_worker_including_the_publisher():
+    async def scenario():
+        server = fakeredis.FakeServer()
+        (first, first_received), (second, second_received) = _broker(server), _broker(server)
+        await first.start()
+        await second.start()
+        try:
+            first.publish("session:1", "a", None)
+            first.publish("dashboard", "b", "candidate:1")
+            second.publish("session:2", "c", None)
+            await _until(lambda: len(first_received) == 3 and len(second_received) == 3)
+        finally:
+            await first.stop()
+            await second.stop()
+
+        assert sorted(first_received) == sorted(second_received)
+        assert ("dashboard", "b", "candidate:1") in first_received
+        # The two messages published together went out as one batch
+        assert first.counters["batches"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_reader_survives_redis_outage_and_resubscribes():
+    async def scenario():
+        server = fakeredis.FakeServer()
+        broker, received = _broker(server)
+        await broker.start()
+        try:
+            broker.publish("session:1", "before", None)
+            await _until(lambda: len(received) == 1)
+
+            # Redis goes away: the open connection drops and reconnecting fails for a while
+            server.connected = False
+            await broker._pubsub.connection.disconnect()
+            await _until(lambda: broker.counters["errors"] >= 2)
+            server.connected = True
+            await _until(lambda: broker.counters["resubscribes"] >= 1)
+
+            broker.publish("session:1", "after", None)
+            await _until(lambda: len(received) == 2)
+            assert all(not task.done() for task in broker._tasks)
+        finally:
+            await broker.stop()
+
+        assert [text for _, text, _ in received] == ["before", "after"]
+
+    asyncio.run(scenario())
@@ -0,0 +1,207 @@
+# backend/tests/test_bulk_ingest.py
+import asyncio
+import io
+import json
+import os
+import zipfile
+from datetime import datetime
+from types import SimpleNamespace
+
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from app.services.upload_spool import stale_spool_files
+
+PDF = "application/pdf"
+
+
+def _upload(filename: str, content: bytes, content_type: str) -> UploadFile:
+    return UploadFile(io.BytesIO(content), filename=filename, headers=Headers({"content-type": content_type}))
+
+
+def _stub_bulk_write(monkeypatch, database):
+    """mongomock's bulk_write refuses the sort UpdateOne passes it, apply the upserts one at a time instead"""
+    async def bulk_write(collection, operations, ordered=True):
+        upserted_ids = {}
+        for index, operation in enumerate(operations):
+            result = await collection.update_one(operation._filter, operation._doc, upsert=operation._upsert)
+            if result.upserted_id is not None:
+                upserted_ids[index] = result.upserted_id
+        return SimpleNamespace(upserted_ids=upserted_ids)
+
+    monkeypatch.setattr(type(database.candidates), "bulk_write", bulk_write)
+
+
+def _stub_bulk_parser(monkeypatch, interview, emails):
+    """Parse each resume to the email its bytes map to; read from the spool file the parser is handed"""
+    async def parse_resume(source, content_type):
+        with open(source, "rb") as spooled:
+            email = emails[spooled.read()]
+        return {"name": "Bulk Candidate", "email": email, "phone": "555 0101", "full_text": ""}
+
+    monkeypatch.setattr(interview.bulk_resume_parser, "parse_resume", parse_resume)
+
+
+def _queued(monkeypatch, interview) -> list:
+    queued = []
+
+    def submit(func, upload_id, upload, **kwargs):
+        queued.append(upload_id)
+        upload.release()
+
+    monkeypatch.setattr(interview.upload_queue, "submit", submit)
+    return queued
+
+
+async def _existing_candidate(database, email: str):
+    await database.candidates.insert_one({"name": "Earlier Drive", "email": email, "status": "ready", "created_at": datetime.utcnow()})
+
+
+def test_bulk_resumes_wait_on_disk(interview_env):
+    async def scenario():
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w") as zipped:
+            zipped.writestr("drive/b.pdf", b"%PDF small")
+        archive.seek(0)
+        files = [_upload("a.pdf", b"%PDF tiny", PDF), _upload("drive.zip", archive.read(), "application/zip")]
+
+        sources = [item async for item in interview_env.interview._bulk_sources(files)]
+        assert [name for name, _ in sources] == ["a.pdf", "drive.zip/drive/b.pdf"]
+        for _, upload in sources:
+            # Small as they are, none is held in memory while queued
+            assert upload.path and os.path.exists(upload.path)
+            upload.release()
+            assert not os.path.exists(upload.path or "")
+
+    asyncio.run(scenario())
+
+
+def test_bulk_parses_use_their_own_pool(interview_env, monkeypatch):
+    async def scenario():
+        interview = interview_env.interview
+        used = []
+
+        def parser(name):
+            async def parse_resume(content, content_type):
+                used.append(name)
+                return {"name": "Bulk Candidate", "email": "bulk@example.com", "phone": "555 0101", "full_text": ""}
+            return parse_resume
+
+        monkeypatch.setattr(interview.resume_parser, "parse_resume", parser("interactive"))
+        monkeypatch.setattr(interview.bulk_resume_parser, "parse_resume", parser("bulk"))
+        monkeypatch.setattr(interview.upload_queue, "submit", lambda *args, **kwargs: None)
+
+        (name, upload), = [item async for item in interview._bulk_sources([_upload("a.pdf", b"%PDF bulk", PDF)])]
+        result = await interview._bulk_parse(interview_env.database, name, upload)
+        assert result["email"] == "bulk@example.com"
+        assert used == ["bulk"]
+        assert interview.bulk_resume_parser is not interview.resume_parser
+        # Deferred until the batch knows the candidate is kept, the line holds the resume
+        assert result["upload"] is upload
+        upload.release()
+
+    asyncio.run(scenario())
+
+
+def test_bulk_candidates_are_upserted_on_email(interview_env, monkeypatch):
+    async def scenario():
+        interview, database = interview_env.interview, interview_env.database
+        _stub_bulk_write(monkeypatch, database)
+        await _existing_candidate(database, "known@example.com")
+
+        def line(email):
+            candidate = {"name": "Bulk Candidate", "email": email, "resume_url": "", "resume_upload_id": "", "status": "ready"}
+            return {"file": f"{email}.pdf", "email": email, "candidate": candidate}
+
+        results = [line("new@example.com"), line("known@example.com")]
+        await interview._bulk_create_candidates(database, results)
+
+        assert [result["status"] for result in results] == ["created", "exists"]
+        assert all(result["candidateId"] and "candidate" not in result for result in results)
+        # The existing candidate is left as it was
+        known = await database.candidates.find_one({"email": "known@example.com"})
+        assert known["name"] == "Earlier Drive" and str(known["_id"]) == results[1]["candidateId"]
+        assert await database.candidates.count_documents({}) == 2
+
+    asyncio.run(scenario())
+
+
+def test_bulk_ingest_streams_a_line_per_resume(interview_env, monkeypatch):
+    async def scenario():
+        interview, database = interview_env.interview, interview_env.database
+        _stub_bulk_write(monkeypatch, database)
+        _stub_bulk_parser(monkeypatch, interview, {
+            b"%PDF new": "new@example.com",
+            b"%PDF known": "known@example.com",
+            b"%PDF new again": "new@example.com",
+            b"%PDF anonymous": ""
+        })
+        queued = _queued(monkeypatch, interview)
+        await _existing_candidate(database, "known@example.com")
+        spooled = set(stale_spool_files(-1))
+
+        files = [
+            _upload("new.pdf", b"%PDF new", PDF),
+            _upload("known.pdf", b"%PDF known", PDF),
+            _upload("again.pdf", b"%PDF new again", PDF),
+            _upload("anonymous.pdf", b"%PDF anonymous", PDF),
+            _upload("notes.txt", b"plain text", "text/plain")
+        ]
+        body = "".join([chunk async for chunk in interview._bulk_ingest(database, files)])
+
+        # One JSON object per line, the counts last
+        assert body.endswith("\n")
+        *rows, summary = [json.loads(line) for line in body.splitlines()]
+        lines = {row["file"]: row for row in rows}
+        assert {name: row["status"] for name, row in lines.items()} == {
+            "new.pdf": "created",
+            "known.pdf": "exists",
+            "again.pdf": "duplicate",
+            "anonymous.pdf": "missing_email",
+            "notes.txt": "error"
+        }
+        assert lines["again.pdf"]["duplicateOf"] == "new.pdf"
+        assert summary == {
+            "done": True,
+            "files": 5,
+            "statuses": {"created": 1, "exists": 1, "duplicate": 1, "missing_email": 1, "error": 1}
+        }
+
+        # Only resumes something points at are uploaded
+        assert lines["known.pdf"]["resumeUploadId"] is None and lines["again.pdf"]["resumeUploadId"] is None
+        assert sorted(queued) == sorted([lines["new.pdf"]["resumeUploadId"], lines["anonymous.pdf"]["resumeUploadId"]])
+        created = await database.candidates.find_one({"email": "new@example.com"})
+        assert created["resume_upload_id"] == lines["new.pdf"]["resumeUploadId"]
+        assert await database.resume_uploads.count_documents({}) == 2
+        assert set(stale_spool_files(-1)) == spooled
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_bulk_ingest_leaves_no_spool_files(interview_env, monkeypatch):
+    async def scenario():
+        interview, database = interview_env.interview, interview_env.database
+        parsing = asyncio.Event()
+
+        async def parse_resume(source, content_type):
+            parsing.set()
+            await asyncio.Event().wait()
+
+        monkeypatch.setattr(interview.bulk_resume_parser, "parse_resume", parse_resume)
+        spooled = set(stale_spool_files(-1))
+
+        # More resumes than the workers and their queue hold, so the producer is left waiting with one
+        files = [_upload(f"{i}.pdf", f"%PDF cancelled {i}".encode(), PDF) for i in range(12)]
+        stream = interview._bulk_ingest(database, files)
+        first_line = asyncio.create_task(stream.__anext__())
+        await parsing.wait()
+        await asyncio.sleep(0.05)
+        assert set(stale_spool_files(-1)) != spooled
+
+        # The client went away
+        first_line.cancel()
+        await asyncio.gather(first_line, return_exceptions=True)
+        await stream.aclose()
+        assert set(stale_spool_files(-1)) == spooled
+
+    asyncio.run(scenario())
@@ -0,0 +1,42 @@
+# backend/tests/test_evaluation_cache.py
+import asyncio
+
+from app.config import settings
+from app.services.evaluation_cache import EvaluationCache
+
+QUESTION, ANSWER = "Which hook adds state?", "useState"
+EVALUATION = {"score": 2, "feedback": "Correct."}
+
+
+def _worker() -> EvaluationCache:
+    cache = EvaluationCache()
+    # Re-read the shared rubric version on every call
+    cache.refresh_seconds = 0
+    return cache
+
+
+def test_rubric_switch_reaches_every_worker(interview_env):
+    async def scenario():
+        a, b = _worker(), _worker()
+        await b.set(QUESTION, ANSWER, "easy", EVALUATION)
+        assert await b.get(QUESTION, ANSWER, "easy") == EVALUATION
+
+        deleted = await a.invalidate("2")
+        assert deleted == 1
+        # b neither serves the old grade from memory nor files new ones under the old version
+        assert await b.get(QUESTION, ANSWER, "easy") is None
+        assert b.rubric_version == "2"
+        await b.set(QUESTION, ANSWER, "easy", EVALUATION)
+        assert await a.invalidate() == 0
+        assert await a.get(QUESTION, ANSWER, "easy") == EVALUATION
+
+    asyncio.run(scenario())
+
+
+def test_configured_rubric_change_overrides_a_stored_one(interview_env, monkeypatch):
+    async def scenario():
+        await _worker().invalidate("2")
+        monkeypatch.setattr(settings, "EVAL_RUBRIC_VERSION", "3")
+        assert await _worker().current_version() == "3"
+
+    asyncio.run(scenario())
@@ -0,0 +1,125 @@
+# backend/tests/test_groq_streaming.py
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.config import settings
+
+
+def _recorder() -> tuple:
+    frames = []
+
+    async def on_delta(delta: str, replace: bool = False):
+        frames.append((delta, replace))
+
+    return frames, on_delta
+
+
+class _StalledStream:
+    """A streamed completion that sends one chunk and then nothing more"""
+
+    def __init__(self):
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.closed = True
+
+    def __aiter__(self):
+        return self._chunks()
+
+    async def _chunks(self):
+        yield SimpleNamespace(x_groq=None, choices=[SimpleNamespace(delta=SimpleNamespace(content="Partial"))])
+        await asyncio.Event().wait()
+
+
+def test_fallback_win_replaces_the_primarys_streamed_text(interview_env, monkeypatch):
+    async def scenario():
+        service = interview_env.interview.groq_service
+        monkeypatch.setitem(settings.GROQ_HEDGE_AFTER, "evaluation", 0.05)
+        frames, on_delta = _recorder()
+
+        async def attempt(model, on_delta):
+            if model == service.model:
+                await on_delta("The primary stalls")
+                await asyncio.Event().wait()
+            await on_delta("The fallback ")
+            await on_delta("answers")
+            return {"feedback": "The fallback answers"}
+
+        result, tier = await service._hedged("evaluation", attempt, [], on_delta)
+        assert tier == "fallback_model" and result["feedback"] == "The fallback answers"
+        assert frames == [("The primary stalls", False), ("The fallback answers", True)]
+
+    asyncio.run(scenario())
+
+
+def test_streamed_text_is_cleared_when_every_tier_fails(interview_env):
+    async def scenario():
+        service = interview_env.interview.groq_service
+        frames, on_delta = _recorder()
+
+        async def attempt(model, on_delta):
+            await on_delta(f"{model} starts")
+            raise ValueError("unparseable")
+
+        with pytest.raises(ValueError):
+            await service._hedged("evaluation", attempt, [], on_delta)
+        assert frames == [(f"{service.model} starts", False), ("", True)]
+
+    asyncio.run(scenario())
+
+
+def test_a_cancelled_stream_is_closed(interview_env, monkeypatch):
+    async def scenario():
+        service = interview_env.interview.groq_service
+        stream = _StalledStream()
+        frames, on_delta = _recorder()
+
+        async def create(model, **kwargs):
+            return stream, True
+
+        monkeypatch.setattr(service, "_create", create)
+        # As when a hedge wins the race
+        reading = asyncio.create_task(service._stream(
+            "evaluation", "medium", on_delta, service.model, messages=[{"role": "user", "content": "Explain closures"}]
+        ))
+        while not frames:
+            await asyncio.sleep(0.01)
+        reading.cancel()
+        await asyncio.gather(reading, return_exceptions=True)
+        assert stream.closed
+
+    asyncio.run(scenario())
+
+
+def test_fallback_summary_starts_over_after_a_partial_batch_summary(interview_env, monkeypatch):
+    async def scenario():
+        service = interview_env.interview.groq_service
+        frames, on_delta = _recorder()
+
+        async def grade_batch(candidate_name, questions, indices, on_delta):
+            await on_delta("The candidate showed")
+            # Every grade and the summary came back unusable
+            return {}, None
+
+        async def generate_candidate_summary(candidate_name, questions, total_score, on_delta=None):
+            await on_delta("Fallback summary")
+            return "Fallback summary"
+
+        async def evaluate_answer(question, answer, expected_topics, difficulty, accepted_answers=None):
+            return {"score": 1, "feedback": "ok"}
+
+        monkeypatch.setattr(service, "_grade_batch", grade_batch)
+        monkeypatch.setattr(service, "evaluate_answer", evaluate_answer)
+        monkeypatch.setattr(service, "generate_candidate_summary", generate_candidate_summary)
+        questions = [{"text": "Explain event delegation", "answer": "It depends", "expected_topics": ["bubbling"], "difficulty": "hard"}]
+
+        grading = await service.grade_interview("Test Candidate", questions, on_delta=on_delta)
+        assert grading["summary"] == "Fallback summary"
+        assert frames == [("The candidate showed", False), ("", True), ("Fallback summary", False)]
+
+    asyncio.run(scenario())
@@ -0,0 +1,39 @@
+# backend/tests/test_local_scorer.py
+from app.config import settings
+from app.services.local_scorer import LocalScorer
+
+
+def _trusted(evaluation) -> bool:
+    return evaluation["confidence"] >= settings.LOCAL_SCORER_CONFIDENCE
+
+
+def test_brief_answer_is_left_to_the_llm():
+    evaluation = LocalScorer().evaluate(
+        "What is the difference between let and const?", "const cannot be reassigned",
+        ["block scope", "hoisting"], "medium", 3
+    )
+    assert evaluation["score"] == 0
+    assert not _trusted(evaluation)
+
+
+def _keyed(answer: str):
+    return LocalScorer().evaluate("Which hook adds state to a function component?", answer, ["state"], "easy", 2, ["useState"])
+
+
+def test_answer_key_accepts_the_key_with_framing():
+    for answer in ("useState", "use state", "the useState hook"):
+        evaluation = _keyed(answer)
+        assert evaluation["score"] == 2 and _trusted(evaluation), answer
+
+
+def test_answer_key_rejects_negation_and_alternatives():
+    for answer in ("definitely not useState", "useState or useEffect", "useState, useEffect", "maybe useState", "useState useEffect"):
+        assert not _trusted(_keyed(answer)), answer
+
+
+def test_synonyms_keep_distinct_concepts_apart():
+    scorer = LocalScorer()
+    evaluation = scorer.evaluate("How do you add a package with npm?", "npm add lodash", ["install"], "easy", 2, ["npm install"])
+    assert not _trusted(evaluation)
+    assert evaluation["topics_covered"] == []
+    assert scorer.evaluate("What does useMemo do?", "caches the value", ["memoization"], "medium", 3)["topics_covered"] == []
@@ -0,0 +1,53 @@
+# backend/tests/test_metrics.py
+import asyncio
+import os
+import subprocess
+import sys
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.middleware import RequestLatencyMiddleware
+from app.services import metrics
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _latency_sum(route: str) -> float:
+    return REGISTRY.get_sample_value(
+        "http_request_seconds_sum", {"method": "GET", "route": route, "status": "200"}
+    ) or 0.0
+
+
+def test_streamed_responses_are_timed_to_their_last_chunk():
+    app = FastAPI()
+    app.add_middleware(RequestLatencyMiddleware)
+
+    @app.get("/stream/{batch_id}")
+    async def stream(batch_id: str):
+        async def lines():
+            for i in range(3):
+                await asyncio.sleep(0.05)
+                yield f'{{"row": {i}}}\n'
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    before = _latency_sum("/stream/{batch_id}")
+    with TestClient(app) as client:
+        assert client.get("/stream/b1").text.count("\n") == 3
+    # The rows trickled out over ~150ms after the headers went
+    assert _latency_sum("/stream/{batch_id}") - before >= 0.15
+
+
+def test_metrics_are_summed_across_worker_processes(tmp_path, monkeypatch):
+    # Each worker counts in its own process, as uvicorn --workers would run them
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path), "WEB_CONCURRENCY": "2"}
+    for _ in range(2):
+        subprocess.run(
+            [sys.executable, "-c", "from app.services import metrics; metrics.llm_fallbacks.labels('summary', 'all').inc()"],
+            cwd=BACKEND, env=env, check=True
+        )
+
+    monkeypatch.setattr(metrics, "MULTIPROC_DIR", str(tmp_path))
+    assert 'llm_fallbacks_total{difficulty="all",operation="summary"} 2.0' in metrics.latest().decode()
@@ -0,0 +1,54 @@
+# backend/tests/test_rate_limit_scheduler.py
+import asyncio
+from types import SimpleNamespace
+
+from app.services.rate_limit_scheduler import RateLimitScheduler
+
+
+def test_requests_are_unlimited_unless_configured():
+    async def scenario():
+        scheduler = RateLimitScheduler("test", tokens_per_minute=100000)
+        assert scheduler.requests is None
+        # Far past any free-tier request limit, nothing waits
+        for _ in range(100):
+            await asyncio.wait_for(scheduler.acquire(10, "batch"), timeout=0.5)
+        assert scheduler.snapshot()["requests_per_minute"] is None
+
+        # A 429 still holds everything back
+        scheduler.pause(60)
+        assert scheduler._wait_time("live", 10) > 59
+
+    asyncio.run(scenario())
+
+
+def test_configured_requests_are_split_between_workers(monkeypatch):
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    scheduler = RateLimitScheduler("test", requests_per_minute=30)
+    assert scheduler.requests.capacity == 10
+
+
+def test_calls_synced_from_headers_are_not_settled_again(interview_env, monkeypatch):
+    async def scenario():
+        service = interview_env.interview.groq_service
+        scheduler = RateLimitScheduler("test", tokens_per_minute=12000)
+        monkeypatch.setitem(service.schedulers, service.model, scheduler)
+        remaining = {"x-ratelimit-remaining-tokens": "5000"}
+
+        async def create(model, **kwargs):
+            synced = scheduler.observe_headers(remaining)
+            return SimpleNamespace(usage=SimpleNamespace(prompt_tokens=800, completion_tokens=100, total_tokens=900)), synced
+
+        monkeypatch.setattr(service, "_create", create)
+        messages = [{"role": "user", "content": "x" * 400}]
+
+        # Groq's count already includes this call; settling would take its overrun off twice
+        await service._complete("evaluation", "medium", service.model, messages=messages, max_tokens=100)
+        assert abs(scheduler.tokens.level - 5000) < 5
+
+        # Without the header the estimate of 200 is corrected to the 900 used
+        remaining.clear()
+        level = scheduler.tokens.level
+        await service._complete("evaluation", "medium", service.model, messages=messages, max_tokens=100)
+        assert abs(scheduler.tokens.level - (level - 900)) < 5
+
+    asyncio.run(scenario())
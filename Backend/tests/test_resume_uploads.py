@@ -0,0 +1,117 @@
+# backend/tests/test_resume_uploads.py
+import asyncio
+import os
+import socket
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+from app.config import settings
+from app.services.upload_spool import SPOOL_PREFIX
+
+PDF = "application/pdf"
+
+
+def _spool_file(age: float = 0) -> str:
+    spool = tempfile.NamedTemporaryFile(prefix=SPOOL_PREFIX, suffix=".pdf", delete=False)
+    spool.write(b"%PDF spooled")
+    spool.close()
+    if age:
+        os.utime(spool.name, (time.time() - age, time.time() - age))
+    return spool.name
+
+
+async def _pending_upload(database, spool_path=None, host=None, age: float = 0) -> ObjectId:
+    seen = datetime.utcnow() - timedelta(seconds=age)
+    result = await database.resume_uploads.insert_one({
+        "filename": "resume.pdf", "content_type": PDF, "sha256": "abc", "status": "pending", "url": None,
+        "spool_path": spool_path, "host": host or socket.gethostname(), "created_at": seen, "updated_at": seen
+    })
+    return result.inserted_id
+
+
+def _queued(monkeypatch, interview) -> list:
+    queued = []
+    monkeypatch.setattr(interview.upload_queue, "submit", lambda func, upload_id, upload, **kwargs: queued.append((upload_id, upload)))
+    return queued
+
+
+def test_sweep_requeues_a_lost_upload_from_its_spool_file(interview_env, monkeypatch):
+    async def scenario():
+        interview, database = interview_env.interview, interview_env.database
+        queued = _queued(monkeypatch, interview)
+        stale = settings.RESUME_UPLOAD_STALE_AFTER + 1
+        path = _spool_file(age=stale)
+        upload_id = await _pending_upload(database, path, age=stale)
+
+        await interview.recover_resume_uploads()
+        await interview.recover_resume_uploads()
+
+        # Taken once, and its spool file is kept for the retry
+        assert [queued_id for queued_id, _ in queued] == [str(upload_id)]
+        upload = queued[0][1]
+        with upload.open() as stream:
+            assert stream.read() == b"%PDF spooled"
+        upload.release()
+        assert not os.path.exists(path)
+
+    asyncio.run(scenario())
+
+
+def test_sweep_fails_an_upload_whose_bytes_are_gone(interview_env, monkeypatch):
+    async def scenario():
+        interview, database = interview_env.interview, interview_env.database
+        queued = _queued(monkeypatch, interview)
+        stale = settings.RESUME_UPLOAD_STALE_AFTER + 1
+        in_memory = await _pending_upload(database, age=stale)
+        elsewhere = await _pending_upload(database, "/tmp/resume_elsewhere.pdf", host="other-host", age=stale)
+        long_gone = await _pending_upload(database, "/tmp/resume_gone.pdf", host="other-host", age=3 * stale)
+
+        await interview.recover_resume_uploads()
+
+        assert queued == []
+        statuses = {doc["_id"]: doc["status"] async for doc in database.resume_uploads.find()}
+        # Another host's upload is left to that host's sweep for a while
+        assert statuses == {in_memory: "failed", elsewhere: "pending", long_gone: "failed"}
+
+    asyncio.run(scenario())
+
+
+def test_sweep_keeps_queued_uploads_and_deletes_orphaned_spool_files(interview_env, monkeypatch):
+    async def scenario():
+        interview, database = interview_env.interview, interview_env.database
+        _queued(monkeypatch, interview)
+        stale = settings.RESUME_UPLOAD_STALE_AFTER + 1
+        queued_path, orphan_path, fresh_path = _spool_file(age=stale), _spool_file(age=stale), _spool_file()
+        upload_id = await _pending_upload(database, queued_path, age=stale)
+        monkeypatch.setattr(interview.upload_queue, "active_ids", lambda: [str(upload_id)])
+
+        await interview.recover_resume_uploads()
+
+        upload = await database.resume_uploads.find_one({"_id": upload_id})
+        assert upload["status"] == "pending"
+        assert os.path.exists(queued_path) and os.path.exists(fresh_path)
+        assert not os.path.exists(orphan_path)
+        for path in (queued_path, fresh_path):
+            os.unlink(path)
+
+    asyncio.run(scenario())
+
+
+def test_malformed_upload_ids_are_client_errors(interview_env):
+    async def scenario():
+        interview = interview_env.interview
+        for call, status in (
+            (interview.get_resume_upload("not-an-id"), 404),
+            (interview.create_or_check_candidate({"email": "new@example.com", "resumeUploadId": "not-an-id"}), 400),
+        ):
+            with pytest.raises(HTTPException) as raised:
+                await call
+            assert raised.value.status_code == status
+        assert await interview._resolved_resume_url(interview_env.database, "not-an-id") == ""
+
+    asyncio.run(scenario())
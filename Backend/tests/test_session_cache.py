@@ -0,0 +1,135 @@
+# backend/tests/test_session_cache.py
+import asyncio
+
+from fastapi import Response
+
+from app.services.session_cache import MemorySessionStore, NullSessionStore, SessionCache
+
+
+class Workers:
+    """Two API workers, each with its own in-memory session cache, over one database
+
+    The memory backend caches nothing when WEB_CONCURRENCY says there are
+    several workers, but workers started without it (e.g. uvicorn --workers)
+    still each get one; answers must land on the right question then too.
+    """
+
+    def __init__(self, env, monkeypatch):
+        self.env = env
+        self.monkeypatch = monkeypatch
+        self.caches = {"a": env.interview.session_cache, "b": SessionCache()}
+
+    def use(self, worker: str):
+        self.monkeypatch.setattr(self.env.interview, "session_cache", self.caches[worker])
+
+    async def submit(self, worker: str, session_id: str, answer: str, question_id: str = None):
+        self.use(worker)
+        data = {"answer": answer}
+        if question_id:
+            data["question_id"] = question_id
+        return await self.env.interview.submit_answer(session_id, data, Response())
+
+
+def test_stale_cache_routes_answer_to_the_current_question(interview_env, monkeypatch):
+    async def scenario():
+        workers = Workers(interview_env, monkeypatch)
+        started = await interview_env.interview.start_interview(await interview_env.create_candidate())
+        session_id = started["session_id"]
+
+        await workers.submit("a", session_id, "answer 1")
+        # Worker b reads the session fresh and takes the next answer; a's copy is now a question behind
+        await workers.submit("b", session_id, "answer 2")
+        result = await workers.submit("a", session_id, "answer 3")
+
+        session = await interview_env.session(session_id)
+        assert [q.get("answer") for q in session["questions"][:3]] == ["answer 1", "answer 2", "answer 3"]
+        assert session["current_question_index"] == 3
+        assert result["question_number"] == 4
+
+    asyncio.run(scenario())
+
+
+def test_question_id_tells_a_repeat_from_a_new_answer(interview_env, monkeypatch):
+    async def scenario():
+        workers = Workers(interview_env, monkeypatch)
+        started = await interview_env.interview.start_interview(await interview_env.create_candidate())
+        session_id = started["session_id"]
+        first_id = started["question"]["id"]
+
+        second = await workers.submit("a", session_id, "answer 1", first_id)
+        second_id = second["next_question"]["id"]
+        third = await workers.submit("b", session_id, "answer 2", second_id)
+
+        # A retry of the second answer reaching the stale worker is a repeat, not the third answer
+        repeat = await workers.submit("a", session_id, "answer 2", second_id)
+        assert repeat["already_answered"] is True
+        assert repeat["next_question"]["id"] == third["next_question"]["id"]
+
+        # The third question is unknown to a's copy until it reloads
+        await workers.submit("a", session_id, "answer 3", third["next_question"]["id"])
+        session = await interview_env.session(session_id)
+        assert [q.get("answer") for q in session["questions"][:4]] == ["answer 1", "answer 2", "answer 3", None]
+        assert len(interview_env.evaluations) == 3
+
+    asyncio.run(scenario())
+
+
+def test_completed_interview_shows_the_summary_written_elsewhere(interview_env, monkeypatch):
+    async def scenario():
+        workers = Workers(interview_env, monkeypatch)
+        candidate_id = await interview_env.create_candidate()
+        session_id = (await interview_env.interview.start_interview(candidate_id))["session_id"]
+        for number in range(1, 7):
+            await workers.submit("b", session_id, f"answer {number}")
+
+        # Worker a cached the candidate while the interview was running; the summary job ran elsewhere
+        workers.use("a")
+        await workers.caches["a"].get_candidate(interview_env.database, candidate_id)
+        await interview_env.database.candidates.update_one(
+            {"email": {"$exists": True}},
+            {"$set": {"status": "completed", "final_score": 6, "summary": "Solid fundamentals."}}
+        )
+
+        result = await interview_env.interview.start_interview(candidate_id)
+        assert result["interview_completed"] is True
+        assert result["summary"] == "Solid fundamentals."
+        assert result["final_score"] == 6
+        assert result["summary_pending"] is False
+
+    asyncio.run(scenario())
+
+
+def test_finished_candidates_are_not_cached(interview_env):
+    async def scenario():
+        cache = interview_env.interview.session_cache
+        candidate_id = await interview_env.create_candidate()
+        await cache.get_candidate(interview_env.database, candidate_id)
+        assert await cache.store.get(f"candidate:{candidate_id}") is not None
+
+        await cache.update_candidate(interview_env.database, candidate_id, {"$set": {"status": "scoring"}})
+        assert await cache.store.get(f"candidate:{candidate_id}") is None
+        await cache.get_candidate(interview_env.database, candidate_id)
+        assert await cache.store.get(f"candidate:{candidate_id}") is None
+
+    asyncio.run(scenario())
+
+
+def test_memory_backend_falls_back_to_no_caching_with_several_workers(monkeypatch):
+    monkeypatch.setenv("WEB_CONCURRENCY", "1")
+    assert isinstance(SessionCache().store, MemorySessionStore)
+    monkeypatch.setenv("WEB_CONCURRENCY", "4")
+    assert isinstance(SessionCache().store, NullSessionStore)
+
+
+def test_interview_runs_without_a_cache(interview_env, monkeypatch):
+    async def scenario():
+        monkeypatch.setattr(interview_env.interview, "session_cache", SessionCache(NullSessionStore()))
+        session_id = (await interview_env.interview.start_interview(await interview_env.create_candidate()))["session_id"]
+        for number in range(1, 7):
+            await interview_env.interview.submit_answer(session_id, {"answer": f"answer {number}"}, Response())
+
+        session = await interview_env.session(session_id)
+        assert session["is_completed"] is True
+        assert [q["answer"] for q in session["questions"]] == [f"answer {number}" for number in range(1, 7)]
+
+    asyncio.run(scenario())
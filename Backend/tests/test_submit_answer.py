@@ -0,0 +1,222 @@
+# backend/tests/test_submit_answer.py
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException, Response
+
+from app.config import settings
+from app.services.session_cache import SessionCache
+from app.services.single_flight import SingleFlight
+
+
+async def _start(env) -> dict:
+    return await env.interview.start_interview(await env.create_candidate())
+
+
+async def _submit(env, session_id: str, answer: str) -> tuple:
+    response = Response()
+    result = await env.interview.submit_answer(session_id, {"answer": answer}, response)
+    return result, response
+
+
+def test_round_trips_per_answer(interview_env):
+    async def scenario():
+        session_id = (await _start(interview_env))["session_id"]
+        round_trips = []
+        for number in range(1, 7):
+            _, response = await _submit(interview_env, session_id, f"answer {number}")
+            round_trips.append(int(response.headers["X-Session-Round-Trips"]))
+
+        # Claim, push the next question, record and advance; the last answer claims, completes and updates the candidate
+        assert round_trips == [3, 3, 3, 3, 3, 3]
+        cache = interview_env.interview.session_cache
+        assert cache.round_trips_per_answer() == 3
+        # Every read of the in-progress session came from the cache
+        assert cache.stats["session_misses"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_cold_cache_costs_one_more_read(interview_env, monkeypatch):
+    async def scenario():
+        session_id = (await _start(interview_env))["session_id"]
+        monkeypatch.setattr(interview_env.interview, "session_cache", SessionCache())
+        _, response = await _submit(interview_env, session_id, "answer 1")
+        assert response.headers["X-Session-Round-Trips"] == "4"
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_duplicates_on_one_worker_share_one_evaluation(interview_env):
+    async def scenario():
+        session_id = (await _start(interview_env))["session_id"]
+        interview_env.evaluation_delay = 0.05
+
+        first, second = await asyncio.gather(
+            _submit(interview_env, session_id, "answer 1"),
+            _submit(interview_env, session_id, "answer 1")
+        )
+
+        assert first[0] is second[0]
+        assert len(interview_env.evaluations) == 1
+        session = await interview_env.session(session_id)
+        assert session["current_question_index"] == 1
+        assert len(session["questions"]) == 2
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_duplicates_across_workers_evaluate_once(interview_env, monkeypatch):
+    async def scenario():
+        interview = interview_env.interview
+        session_id = (await _start(interview_env))["session_id"]
+        interview_env.evaluation_delay = 0.2
+        monkeypatch.setattr(settings, "ANSWER_CLAIM_POLL_INTERVAL", 0.02)
+
+        async def on_other_worker():
+            # Separate cache and single-flight, as in another process; only MongoDB is shared
+            await asyncio.sleep(0.05)
+            monkeypatch.setattr(interview, "session_cache", SessionCache())
+            monkeypatch.setattr(interview, "answer_flights", SingleFlight())
+            return await _submit(interview_env, session_id, "answer 1")
+
+        (winner, _), (loser, _) = await asyncio.gather(
+            _submit(interview_env, session_id, "answer 1"),
+            on_other_worker()
+        )
+
+        assert len(interview_env.evaluations) == 1
+        assert winner["question_number"] == 2
+        assert loser["already_answered"] is True
+        assert loser["next_question"]["id"] == winner["next_question"]["id"]
+        session = await interview_env.session(session_id)
+        assert session["current_question_index"] == 1
+        assert "claim" not in session["questions"][0]
+
+    asyncio.run(scenario())
+
+
+def test_resubmitting_an_answered_question_is_not_evaluated_again(interview_env):
+    async def scenario():
+        session_id = (await _start(interview_env))["session_id"]
+        first, _ = await _submit(interview_env, session_id, "answer 1")
+
+        # The answer is recorded but the session never advanced, as after a crash between the two,
+        # and the client's retry lands on a worker that never saw the session
+        await interview_env.database.sessions.update_one(
+            {"_id": ObjectId(session_id)}, {"$set": {"current_question_index": 0}}
+        )
+        await interview_env.interview.session_cache.evict_session(session_id)
+        retry, _ = await _submit(interview_env, session_id, "answer 1")
+
+        assert retry["already_answered"] is True
+        assert retry["next_question"]["id"] == first["next_question"]["id"]
+        assert len(interview_env.evaluations) == 1
+        session = await interview_env.session(session_id)
+        assert session["current_question_index"] == 1
+        assert len(session["questions"]) == 2
+
+    asyncio.run(scenario())
+
+
+def test_live_claim_blocks_and_lapsed_claim_is_taken_over(interview_env):
+    async def scenario():
+        interview = interview_env.interview
+        database = interview_env.database
+        session_id = (await _start(interview_env))["session_id"]
+
+        first = await interview._claim_answer(database, session_id, 0)
+        assert first is not None
+        assert await interview._claim_answer(database, session_id, 0) is None
+
+        # The holder went away, its claim expires
+        await database.sessions.update_one(
+            {"_id": ObjectId(session_id)},
+            {"$set": {"questions.0.claim.expires_at": datetime.utcnow() - timedelta(seconds=1)}}
+        )
+        second = await interview._claim_answer(database, session_id, 0)
+        assert second not in (None, first)
+
+        # The old holder's conditional write no longer matches, and changes nothing
+        lost = await interview.session_cache.transition_session(
+            database, session_id, interview._claimed(0, first), {"$set": {"questions.0.answer": "late"}}
+        )
+        assert lost is None
+        kept = await interview.session_cache.transition_session(
+            database, session_id, interview._claimed(0, second), {"$set": {"questions.0.answer": "current"}}
+        )
+        assert kept["questions"][0]["answer"] == "current"
+
+    asyncio.run(scenario())
+
+
+def test_failed_evaluation_releases_the_claim_for_a_resubmit(interview_env, monkeypatch):
+    async def scenario():
+        session_id = (await _start(interview_env))["session_id"]
+        evaluate = interview_env.evaluate_answer
+
+        async def failing(*args, **kwargs):
+            raise RuntimeError("Groq unavailable")
+
+        monkeypatch.setattr(interview_env.interview.groq_service, "evaluate_answer", failing)
+        with pytest.raises(HTTPException) as error:
+            await _submit(interview_env, session_id, "answer 1")
+        assert error.value.status_code == 502
+
+        session = await interview_env.session(session_id)
+        assert "claim" not in session["questions"][0]
+        assert session["questions"][0].get("answer") is None
+
+        monkeypatch.setattr(interview_env.interview.groq_service, "evaluate_answer", evaluate)
+        result, _ = await _submit(interview_env, session_id, "answer 1")
+        assert result["question_number"] == 2
+        # The next question fetched during the failed attempt is reused
+        session = await interview_env.session(session_id)
+        assert len(session["questions"]) == 2
+
+    asyncio.run(scenario())
+
+
+def test_last_answer_completes_once_and_queues_one_summary(interview_env):
+    async def scenario():
+        session_id = (await _start(interview_env))["session_id"]
+        for number in range(1, 6):
+            await _submit(interview_env, session_id, f"answer {number}")
+        interview_env.evaluation_delay = 0.05
+
+        results = await asyncio.gather(*(_submit(interview_env, session_id, "answer 6") for _ in range(3)))
+
+        assert all(result["completed"] for result, _ in results)
+        assert len(interview_env.evaluations) == 6
+        assert len(interview_env.summaries) == 1
+        session = await interview_env.session(session_id)
+        assert session["is_completed"] is True
+        candidate = await interview_env.database.candidates.find_one({"_id": ObjectId(session["candidate_id"])})
+        assert candidate["status"] == "scoring"
+
+        again, _ = await _submit(interview_env, session_id, "answer 6")
+        assert again["completed"] is True
+        assert len(interview_env.summaries) == 1
+
+    asyncio.run(scenario())
+
+
+def test_completed_interview_hides_answer_keys_and_audit_fields(interview_env):
+    async def scenario():
+        candidate_id = await interview_env.create_candidate()
+        session_id = (await interview_env.interview.start_interview(candidate_id))["session_id"]
+        await interview_env.database.sessions.update_one(
+            {"_id": ObjectId(session_id)}, {"$set": {"questions.0.accepted_answers": ["useState"]}}
+        )
+        for number in range(1, 7):
+            await _submit(interview_env, session_id, f"answer {number}")
+
+        result = await interview_env.interview.start_interview(candidate_id)
+        assert result["interview_completed"] is True
+        hidden = {"accepted_answers", "claim", "generation_tier", "evaluation_tier"}
+        assert all(not hidden & set(question) for question in result["questions"])
+        assert [q["answer"] for q in result["questions"]] == [f"answer {number}" for number in range(1, 7)]
+
+    asyncio.run(scenario())
@@ -0,0 +1,89 @@
+# backend/tests/test_summary_jobs.py
+import asyncio
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from fastapi import Response
+
+from app.config import settings
+
+
+async def _finish_interview(env, grading_mode: str = "per_question") -> tuple:
+    """Answer all six questions and return the candidate id and the queued summary job id"""
+    candidate_id = await env.create_candidate()
+    session_id = (await env.interview.start_interview(candidate_id, grading_mode))["session_id"]
+    for number in range(1, 7):
+        await env.interview.submit_answer(session_id, {"answer": f"answer {number}"}, Response())
+    (job_id,) = env.summaries[-1]
+    return candidate_id, job_id
+
+
+def test_failed_summary_falls_back_to_local_grades_and_template(interview_env):
+    async def scenario():
+        candidate_id, job_id = await _finish_interview(interview_env, "deferred")
+        database = interview_env.database
+
+        await interview_env.interview._summary_failed(job_id, RuntimeError("groq down"))
+
+        candidate = await database.candidates.find_one({"_id": ObjectId(candidate_id)})
+        assert candidate["status"] == "completed"
+        assert candidate["summary"].startswith("Test Candidate completed the technical interview")
+        session = await database.sessions.find_one({"candidate_id": candidate_id})
+        assert all(q["score"] is not None for q in session["questions"])
+        assert candidate["final_score"] == sum(q["score"] for q in session["questions"])
+        job = await database.summary_jobs.find_one({"_id": ObjectId(job_id)})
+        assert job["status"] == "failed"
+        assert job["error"] == "groq down"
+
+    asyncio.run(scenario())
+
+
+def test_failed_summary_keeps_per_question_scores(interview_env):
+    async def scenario():
+        candidate_id, job_id = await _finish_interview(interview_env)
+        await interview_env.interview._summary_failed(job_id, RuntimeError("groq down"))
+
+        candidate = await interview_env.database.candidates.find_one({"_id": ObjectId(candidate_id)})
+        # The stub gave every answer 1
+        assert candidate["final_score"] == 6
+        assert candidate["status"] == "completed"
+
+    asyncio.run(scenario())
+
+
+def test_sweep_requeues_a_stale_job_once(interview_env):
+    async def scenario():
+        _, job_id = await _finish_interview(interview_env)
+        database = interview_env.database
+        interview_env.summaries.clear()
+
+        # Too recent to count as abandoned
+        await interview_env.interview.recover_summary_jobs()
+        assert interview_env.summaries == []
+
+        stale = datetime.utcnow() - timedelta(seconds=settings.SUMMARY_STALE_AFTER + 1)
+        await database.summary_jobs.update_one({"_id": ObjectId(job_id)}, {"$set": {"updated_at": stale}})
+        # A second worker sweeping right after finds the job already taken
+        await interview_env.interview.recover_summary_jobs()
+        await interview_env.interview.recover_summary_jobs()
+        assert interview_env.summaries == [(job_id,)]
+
+    asyncio.run(scenario())
+
+
+def test_sweep_keeps_queued_jobs_from_going_stale(interview_env, monkeypatch):
+    async def scenario():
+        _, job_id = await _finish_interview(interview_env)
+        database = interview_env.database
+        interview_env.summaries.clear()
+        monkeypatch.setattr(interview_env.interview.summary_queue, "active_ids", lambda: [job_id])
+
+        stale = datetime.utcnow() - timedelta(seconds=settings.SUMMARY_STALE_AFTER + 1)
+        await database.summary_jobs.update_one({"_id": ObjectId(job_id)}, {"$set": {"updated_at": stale}})
+        await interview_env.interview.recover_summary_jobs()
+
+        assert interview_env.summaries == []
+        job = await database.summary_jobs.find_one({"_id": ObjectId(job_id)})
+        assert job["updated_at"] > stale
+
+    asyncio.run(scenario())
@@ -0,0 +1,91 @@
+# backend/tests/test_upload_spool.py
+import asyncio
+import hashlib
+import os
+import tempfile
+
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+from starlette.datastructures import Headers
+
+from app.middleware import BodySizeLimitMiddleware
+from app.services.upload_spool import ResumeUpload
+
+PDF = "application/pdf"
+
+
+def _starlette_upload(content: bytes, max_size: int = 1024 * 1024) -> UploadFile:
+    """An UploadFile as Starlette builds it, over a SpooledTemporaryFile that rolls to disk past max_size"""
+    spooled = tempfile.SpooledTemporaryFile(max_size=max_size)
+    spooled.write(content)
+    spooled.seek(0)
+    return UploadFile(spooled, filename="resume.pdf", headers=Headers({"content-type": PDF}))
+
+
+def _adopt(upload: UploadFile, **kwargs) -> ResumeUpload:
+    return asyncio.run(ResumeUpload.from_upload(upload, **kwargs))
+
+
+def test_small_upload_is_read_once_into_memory():
+    content = b"%PDF small resume"
+    spool = _adopt(_starlette_upload(content))
+    assert spool.path is None
+    assert spool.source() == content
+    assert spool.sha256 == hashlib.sha256(content).hexdigest()
+    spool.release()
+
+
+def test_rolled_upload_keeps_its_bytes_after_starlette_closes_it():
+    content = b"%PDF " + b"x" * 4096
+    upload = _starlette_upload(content, max_size=1024)
+    spool = _adopt(upload, spool_threshold=1024)
+    asyncio.run(upload.close())
+
+    assert spool.path and os.path.basename(spool.path).startswith("resume_")
+    with spool.open() as stream:
+        assert stream.read() == content
+    assert spool.size == len(content)
+    assert spool.sha256 == hashlib.sha256(content).hexdigest()
+    path = spool.path
+    spool.release()
+    assert not os.path.exists(path)
+
+
+def test_small_upload_goes_to_disk_when_asked():
+    spool = _adopt(_starlette_upload(b"%PDF bulk"), spool_threshold=0)
+    assert spool.path and os.path.exists(spool.path)
+    spool.release()
+
+
+def _limited_client(limit: int) -> TestClient:
+    app = FastAPI()
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        return {"size": len(await file.read())}
+
+    app.add_middleware(BodySizeLimitMiddleware, limits={"/upload": limit})
+    return TestClient(app)
+
+
+def test_body_limit_refuses_a_declared_length():
+    client = _limited_client(1024)
+    assert client.post("/upload", files={"file": ("a.pdf", b"x" * 100, PDF)}).json() == {"size": 100}
+    response = client.post("/upload", files={"file": ("a.pdf", b"x" * 4096, PDF)})
+    assert response.status_code == 413
+
+
+def test_body_limit_cuts_off_a_chunked_body():
+    client = _limited_client(1024)
+    boundary = "limit-test"
+    head = f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="a.pdf"\r\nContent-Type: {PDF}\r\n\r\n'.encode()
+
+    def body():
+        yield head
+        for _ in range(64):
+            yield b"x" * 256
+        yield f"\r\n--{boundary}--\r\n".encode()
+
+    # A generator body goes out chunked, with no Content-Length to check up front
+    response = client.post("/upload", content=body(), headers={"content-type": f"multipart/form-data; boundary={boundary}"})
+    assert response.status_code == 413
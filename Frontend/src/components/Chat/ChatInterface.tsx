@@ -75,6 +75,7 @@ const ChatInterface: React.FC = () => {
           ...currentCandidate,
           final_score: completedInterviewData.finalScore,
           summary: completedInterviewData.summary,
+          summary_pending: completedInterviewData.summaryPending,
           session: {
             questions: completedInterviewData.questions,
             _id: completedInterviewData.sessionId,
@@ -114,6 +115,24 @@ const ChatInterface: React.FC = () => {
     }
   }, [currentCandidate, isActive, candidateDetails]);
 
+  // The summary job may still be running, poll until it has written the score and summary
+  const summaryPending = Boolean(candidateDetails?.summary_pending || candidateDetails?.status === 'scoring');
+  useEffect(() => {
+    if (!summaryPending || !currentCandidate) return;
+    const timer = setInterval(() => {
+      api.getCandidateDetails(currentCandidate.id)
+        .then(response => {
+          if (response.data.status !== 'scoring') {
+            setCandidateDetails(response.data);
+          }
+        })
+        .catch(error => {
+          console.error('Failed to refresh candidate details:', error);
+        });
+    }, 5000);
+    return () => clearInterval(timer);
+  }, [summaryPending, currentCandidate]);
+
   useEffect(() => {
     if (!hasInitialized && isActive && sessionId && currentQuestion) {
       setMessages([
@@ -266,7 +285,7 @@ const ChatInterface: React.FC = () => {
     }]);
 
     try {
-      const result = await dispatch(submitAnswer({ sessionId, answer: submittedAnswer })).unwrap();
+      const result = await dispatch(submitAnswer({ sessionId, answer: submittedAnswer, questionId: currentQuestion?.id })).unwrap();
       
       if (result.already_answered) {
         toast.info('Moving to next question...');
@@ -285,13 +304,16 @@ const ChatInterface: React.FC = () => {
       }
 
       if (result.completed) {
-        const finalScore = result.final_score || result.finalScore || 0;
-        const summary = result.summary || 'Interview completed successfully.';
+        const finalScore = result.final_score ?? result.finalScore;
+        const summary = result.summary || (result.summary_pending
+          ? 'Your summary is still being prepared, your results page will update once it is ready.'
+          : 'Interview completed successfully.');
+        const scoreLine = finalScore == null ? 'Your answers are being scored.' : `Final score: ${finalScore}/20`;
         
         setMessages(prev => [...prev, {
           id: generateMessageId(),
           type: 'bot',
-          content: `Interview completed! Final score: ${finalScore}/20\n\n${summary}`,
+          content: `Interview completed! ${scoreLine}\n\n${summary}`,
           timestamp: new Date()
         }]);
         
@@ -354,9 +376,13 @@ const ChatInterface: React.FC = () => {
             <p className="text-gray-600 mb-2">
               {currentCandidate.name}, you have already completed your interview.
             </p>
-            <p className="text-lg font-semibold">
-              Final Score: {candidateDetails.final_score || 0}/20
-            </p>
+            {summaryPending ? (
+              <p className="text-gray-600">Your answers are still being scored, this page will update when your results are ready.</p>
+            ) : (
+              <p className="text-lg font-semibold">
+                Final Score: {candidateDetails.final_score || 0}/20
+              </p>
+            )}
           </div>
 
           {candidateDetails.summary && (
@@ -1,11 +1,12 @@
 // frontend/src/components/Dashboard/InterviewerDashboard.tsx
 import React, { useEffect, useState } from 'react';
 import { useAppDispatch, useAppSelector } from '../../hooks/redux';
-import { fetchCandidates } from '../../store/slices/candidateSlice';
+import { fetchCandidates, fetchMoreCandidates } from '../../store/slices/candidateSlice';
 import CandidateList from './CandidateList';
 import CandidateDetails from './CandidateDetails';
 import { Card } from '@/components/ui/card';
 import { Input } from '@/components/ui/input';
+import { Button } from '@/components/ui/button';
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from '@/components/ui/select';
 import { Search } from 'lucide-react';
 
@@ -13,17 +14,21 @@ const InterviewerDashboard: React.FC = () => {
   const dispatch = useAppDispatch();
   const candidates = useAppSelector((state) => state.candidate.allCandidates);
   const loading = useAppSelector((state) => state.candidate.loading);
+  const nextCursor = useAppSelector((state) => state.candidate.nextCursor);
   const [selectedCandidate, setSelectedCandidate] = useState<string | null>(null);
   const [searchTerm, setSearchTerm] = useState('');
   const [sortBy, setSortBy] = useState('final_score');
   const [filterStatus, setFilterStatus] = useState('all');
 
+  // The server only pages by score or date; name is sorted locally below
+  const filters = React.useMemo(() => ({
+    status: filterStatus !== 'all' ? filterStatus : undefined,
+    sort_by: sortBy === 'created_at' ? 'created_at' : 'final_score'
+  }), [filterStatus, sortBy]);
+
   useEffect(() => {
-    dispatch(fetchCandidates({ 
-      status: filterStatus !== 'all' ? filterStatus : undefined, 
-      sortBy 
-    }));
-  }, [dispatch, filterStatus, sortBy]);
+    dispatch(fetchCandidates(filters));
+  }, [dispatch, filters]);
 
   // Improved filter with better null/undefined handling
   const filteredCandidates = React.useMemo(() => {
@@ -149,6 +154,16 @@ const InterviewerDashboard: React.FC = () => {
             onSelect={setSelectedCandidate}
             loading={loading}
           />
+          
+          {nextCursor && (
+            <Button
+              variant="outline"
+              className="w-full mt-4"
+              onClick={() => dispatch(fetchMoreCandidates({ filters, cursor: nextCursor }))}
+            >
+              Load more
+            </Button>
+          )}
         </Card>
       </div>
       
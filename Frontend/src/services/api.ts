@@ -55,11 +55,13 @@ export const api = {
   startInterview: (candidateId: string) =>
     apiClient.post(`/interview/start-interview/${candidateId}`),
 
-  submitAnswer: (sessionId: string, answer: string) =>
-    apiClient.post(`/interview/submit-answer/${sessionId}`, { answer }),
+  // question_id tells a repeat of an answered question apart from an answer to the next one
+  submitAnswer: (sessionId: string, answer: string, questionId?: string) =>
+    apiClient.post(`/interview/submit-answer/${sessionId}`, { answer, question_id: questionId }),
 
   // Candidate operations
-  getCandidates: (params?: { status?: string; sortBy?: string }) =>
+  // Paginated: the next page's cursor comes back in the X-Next-Cursor header
+  getCandidates: (params?: { status?: string; sort_by?: string; cursor?: string; limit?: number }) =>
     apiClient.get('/candidates', { params }),
 
   getCandidateDetails: (candidateId: string) =>
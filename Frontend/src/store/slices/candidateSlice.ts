@@ -7,6 +7,7 @@ import type { Candidate } from '../../types';
 interface CandidateState {
   currentCandidate: Candidate | null;
   allCandidates: Candidate[];
+  nextCursor: string | null;
   loading: boolean;
   error: string | null;
   parsedResumeData: any | null; // Store parsed data temporarily
@@ -15,16 +16,27 @@ interface CandidateState {
 const initialState: CandidateState = {
   currentCandidate: null,
   allCandidates: [],
+  nextCursor: null,
   loading: false,
   error: null,
   parsedResumeData: null,
 };
 
+type CandidateFilters = { status?: string; sort_by?: string };
+
 export const fetchCandidates = createAsyncThunk(
   'candidate/fetchAll',
-  async (filters?: { status?: string; sortBy?: string }) => {
+  async (filters?: CandidateFilters) => {
     const response = await api.getCandidates(filters);
-    return response.data;
+    return { candidates: response.data, nextCursor: response.headers['x-next-cursor'] || null };
+  }
+);
+
+export const fetchMoreCandidates = createAsyncThunk(
+  'candidate/fetchMore',
+  async ({ filters, cursor }: { filters?: CandidateFilters; cursor: string }) => {
+    const response = await api.getCandidates({ ...filters, cursor });
+    return { candidates: response.data, nextCursor: response.headers['x-next-cursor'] || null };
   }
 );
 
@@ -78,7 +90,12 @@ const candidateSlice = createSlice({
       })
       .addCase(fetchCandidates.fulfilled, (state, action) => {
         state.loading = false;
-        state.allCandidates = action.payload;
+        state.allCandidates = action.payload.candidates;
+        state.nextCursor = action.payload.nextCursor;
+      })
+      .addCase(fetchMoreCandidates.fulfilled, (state, action) => {
+        state.allCandidates = [...state.allCandidates, ...action.payload.candidates];
+        state.nextCursor = action.payload.nextCursor;
       })
       .addCase(fetchCandidates.rejected, (state, action) => {
         state.loading = false;
@@ -36,8 +36,8 @@ export const startInterview = createAsyncThunk(
 
 export const submitAnswer = createAsyncThunk(
   'session/submitAnswer',
-  async ({ sessionId, answer }: { sessionId: string; answer: string }) => {
-    const response = await api.submitAnswer(sessionId, answer);
+  async ({ sessionId, answer, questionId }: { sessionId: string; answer: string; questionId?: string }) => {
+    const response = await api.submitAnswer(sessionId, answer, questionId);
     return response.data;
   }
 );
@@ -81,6 +81,7 @@ const sessionSlice = createSlice({
             sessionId: action.payload.session_id,
             finalScore: action.payload.final_score,
             summary: action.payload.summary,
+            summaryPending: action.payload.summary_pending,
             questions: action.payload.questions,
             completedAt: action.payload.completed_at,
           };